@@ -27,7 +27,10 @@ from .nddata import *
 from .array import *
 from .array2d import *
 from .series import *
+from .index import *
+from .resample import *
 from glue.lal import (Cache, CacheEntry)
 
-__all__ = ['NDData', 'Array', 'Array2D', 'Series', 'Cache', 'CacheEntry']
+__all__ = ['NDData', 'Array', 'Metadata', 'Array2D', 'Series',
+           'RegularIndex', 'Resampler', 'Cache', 'CacheEntry']
 
@@ -20,11 +20,23 @@ data structure providing metadata
 
 The `Array` structure provides the core array-with-metadata environment
 with the standard array methods wrapped to return instances of itself.
+
+An `Array` may be backed by a :class:`numpy.memmap`, see
+:meth:`Array.memmap`, in which case slices and crops remain views of
+the mapped file, and data are only read from disk as they are used.
+
+The metadata for each `Array` are held in a compact `Metadata` record,
+which is shared between an array and its views, slices, and ufunc
+results, and only copied when one of them is modified.
 """
 
 import numpy
 numpy.set_printoptions(threshold=200)
 import copy
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
 
 from astropy.units import (Unit, Quantity)
 from astropy.io import registry
@@ -37,6 +49,146 @@ __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 __credits__ = "Nickolas Fotopoulos <nvf@gravity.phys.uwm.edu>"
 
 
+# -----------------------------------------------------------------------------
+# Metadata record
+
+#: metadata keys held in the fixed slots of a `Metadata` record
+_FIELDS = ('name', 'unit', 'epoch', 'channel', 'x0', 'dx', 'y0', 'dy')
+_FIELD_INDEX = dict((key, i) for i, key in enumerate(_FIELDS))
+_CHANNEL = _FIELD_INDEX['channel']
+_UNSET = object()
+
+
+class Metadata(MutableMapping):
+    """Compact, dict-like record of the metadata for an `Array`
+
+    The common properties (``name``, ``unit``, ``epoch``, ``channel``,
+    and the axis parameters ``x0``, ``dx``, ``y0``, and ``dy``) are
+    held in fixed slots, with any others kept in an auxiliary `dict`.
+    The `Array` property setters store the axis parameters as plain
+    `float` values in the units of the relevant axis, the
+    `~astropy.units.Quantity` is only built when requested via the
+    relevant property; a `~astropy.units.Quantity` stored directly is
+    kept as given, and converted to the axis units when read.
+
+    A record is shared between an `Array` and its views until one of
+    them is modified, at which point that array takes its own copy, see
+    :attr:`Array.metadata`. A record that has been handed out via
+    :attr:`Array.metadata` may be modified through that reference at
+    any time, so is copied, rather than shared, with any new views.
+    """
+    __slots__ = ('_values', '_extra', '_shared', '_exposed')
+
+    def __init__(self, *args, **kwargs):
+        """Create a new `Metadata` record
+        """
+        self._values = [_UNSET] * len(_FIELDS)
+        self._extra = None
+        self._shared = False
+        self._exposed = False
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        try:
+            value = self._values[_FIELD_INDEX[key]]
+        except KeyError:
+            if self._extra is None:
+                raise KeyError(key)
+            return self._extra[key]
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        try:
+            i = _FIELD_INDEX[key]
+        except KeyError:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+        else:
+            self._values[i] = value
+
+    def __delitem__(self, key):
+        try:
+            i = _FIELD_INDEX[key]
+        except KeyError:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+        else:
+            if self._values[i] is _UNSET:
+                raise KeyError(key)
+            self._values[i] = _UNSET
+
+    def __iter__(self):
+        for key, value in zip(_FIELDS, self._values):
+            if value is not _UNSET:
+                yield key
+        if self._extra:
+            for key in list(self._extra):
+                yield key
+
+    def __len__(self):
+        return (sum(1 for value in self._values if value is not _UNSET) +
+                len(self._extra or ()))
+
+    def has_key(self, key):
+        return key in self
+
+    def iteritems(self):
+        for key in self:
+            yield key, self[key]
+
+    def share(self):
+        """Return this record for sharing with a new view of an `Array`
+
+        Returns
+        -------
+        metadata : `Metadata`
+            this record, marked as shared, or a new copy of it if it has
+            been handed out via :attr:`Array.metadata`, and so may still
+            be modified through that reference
+        """
+        if self._exposed:
+            return self.copy()
+        self._shared = True
+        return self
+
+    def copy(self):
+        """Return a shallow copy of this record
+
+        Returns
+        -------
+        metadata : `Metadata`
+            a new record, owned by no `Array`
+        """
+        new = self.__class__.__new__(self.__class__)
+        new._values = list(self._values)
+        new._extra = dict(self._extra) if self._extra else None
+        new._shared = False
+        new._exposed = False
+        return new
+
+    def __deepcopy__(self, memo):
+        # the names, units, and axis parameters are immutable, so only
+        # the channel, and any other metadata, need to be copied
+        new = self.copy()
+        if new._values[_CHANNEL] is not _UNSET:
+            new._values[_CHANNEL] = copy.deepcopy(new._values[_CHANNEL],
+                                                  memo)
+        if new._extra:
+            new._extra = copy.deepcopy(new._extra, memo)
+        return new
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, dict(self))
+
+
 # -----------------------------------------------------------------------------
 # Core Array
 
@@ -71,9 +223,10 @@ class Array(numpy.ndarray):
     unit
     epoch
     channel
+    filename
     """
     __array_priority_ = 10.1
-    _metadata_type = dict
+    _metadata_type = Metadata
     _metadata_slots = ['name', 'unit', 'epoch', 'channel']
 
     def __new__(cls, data=None, dtype=None, copy=False, subok=True,
@@ -90,11 +243,11 @@ class Array(numpy.ndarray):
                 return data
             elif metadata:
                 new = numpy.array(data, dtype=dtype, copy=copy, subok=True)
-                new.metadata = cls._metadata_type(metadata)
+                new._metadata = cls._metadata_type(metadata)
                 return new
             else:
                 new = data.astype(dtype)
-                new.metadata = data.metadata
+                new._metadata = data._metadata.share()
                 return new
         # otherwise define a new Array from the array-like data
         else:
@@ -105,7 +258,7 @@ class Array(numpy.ndarray):
             else:
                 new = numpy.array(data, dtype=dtype, copy=copy, subok=True)
                 new = new.view(cls)
-            new.metadata = cls._metadata_type()
+            new._metadata = cls._metadata_type()
             for key,val in metadata.iteritems():
                 if val is not None:
                     setattr(new, key, val)
@@ -117,17 +270,65 @@ class Array(numpy.ndarray):
 
     def __array_finalize__(self, obj):
         """Finalize a Array with metadata
+
+        The new array shares the metadata record of its parent, until
+        either is modified.
         """
-        self.metadata = getattr(obj, 'metadata', {}).copy()
+        try:
+            self._metadata = obj._metadata.share()
+        except AttributeError:
+            self._metadata = self._metadata_type()
         self._baseclass = getattr(obj, '_baseclass', type(obj))
 
     def __array_wrap__(self, obj, context=None):
         """Wrap an array as a Array with metadata
         """
         result = obj.view(self.__class__)
-        result.metadata = self.metadata.copy()
+        result._metadata = self._metadata.share()
         return result
 
+    @property
+    def metadata(self):
+        """Metadata record for this `Array`
+
+        If the record is shared with another array, e.g. the array this
+        one is a view of, it is copied before being returned, so that it
+        can be modified freely. Once returned, the record is copied,
+        rather than shared, with any new views of this `Array`.
+
+        :type: `Metadata`
+        """
+        meta = self._mutable_metadata()
+        meta._exposed = True
+        return meta
+
+    @metadata.setter
+    def metadata(self, meta):
+        if not isinstance(meta, Metadata):
+            meta = self._metadata_type(meta)
+        meta._exposed = True
+        self._metadata = meta
+
+    def _mutable_metadata(self):
+        """Return the metadata record for this `Array`, ready to modify
+
+        This is used internally by the property setters, the record is
+        copied if it is shared with another array, but is not marked as
+        handed out.
+        """
+        meta = self._metadata
+        if meta._shared:
+            meta = self._metadata = meta.copy()
+        return meta
+
+    def _axis_value(self, key, unit):
+        """Return the given axis parameter as a `float` in the given unit
+        """
+        value = self._metadata[key]
+        if isinstance(value, Quantity):
+            return value.to(unit).value
+        return value
+
     def __repr__(self):
         """Return a representation of this object
 
@@ -201,9 +402,55 @@ class Array(numpy.ndarray):
         return self.view(numpy.ndarray)
     A = data
 
+    @classmethod
+    def memmap(cls, filename, dtype=numpy.float64, mode='r', offset=0,
+               shape=None, **metadata):
+        """Create a new array backed by a memory-mapped binary file
+
+        Data are read from disk only as they are accessed, so arrays
+        much larger than the available memory can be sliced, cropped,
+        and reduced in blocks.
+
+        Parameters
+        ----------
+        filename : `str`
+            path of binary file containing the raw data
+        dtype : `numpy.dtype`, optional, default: `float64`
+            data type of the file contents
+        mode : `str`, optional, default: ``'r'``
+            mode in which to open the file, see :class:`numpy.memmap`
+        offset : `int`, optional, default: 0
+            number of bytes in the file before the start of the data
+        shape : `tuple`, optional
+            shape of the array, by default the rest of the file is
+            mapped as a one-dimensional array
+        **metadata
+            other metadata properties
+
+        Returns
+        -------
+        array : `Array`
+            a new array, viewing the mapped file
+        """
+        data = numpy.memmap(filename, dtype=dtype, mode=mode, offset=offset,
+                            shape=shape)
+        return cls(data, **metadata)
+
+    @property
+    def filename(self):
+        """Path of the file to which this `Array` is memory-mapped, or
+        `None` if the data are held in memory
+
+        :type: `str`
+        """
+        mmap = _find_memmap(self)
+        if mmap is None:
+            return None
+        return mmap.filename
+
     def copy(self, order='C'):
         new = super(Array, self).copy(order=order)
-        new.metadata = copy.deepcopy(self.metadata)
+        new._metadata = copy.deepcopy(self._metadata)
         return new
     copy.__doc__ = numpy.ndarray.copy.__doc__
 
@@ -223,7 +470,7 @@ class Array(numpy.ndarray):
                  self.dtype,
                  self.flags.fnc,
                  self.data.tostring(),
-                 self.metadata
+                 dict(self._metadata)
                  )
         return state
 
@@ -246,16 +493,24 @@ class Array(numpy.ndarray):
         """
         (shp, typ, isf, raw, meta) = state
         super(Array, self).__setstate__((shp, typ, isf, raw))
-        self.metadata = self._metadata_type(meta)
+        self._metadata = self._metadata_type(meta)
 
     def __reduce__(self):
         """Initialise the pickle operation for this `Array`
 
+        An `Array` viewing a read-only memory-mapped file is pickled as a
+        reference to its location in that file, rather than a copy of
+        the data, so it can be handed cheaply to other processes.
+
         Returns
         -------
         pickler : `tuple`
             A 3-tuple of (reconstruct function, reconstruct args, state)
         """
+        source = _memmap_source(self)
+        if source is not None:
+            return (_memmap_reconstruct, (self.__class__, self.dtype) +
+                    source + (dict(self._metadata),))
         return (_array_reconstruct, (self.__class__, self.dtype),
                 self.__getstate__())
 
@@ -271,13 +526,13 @@ class Array(numpy.ndarray):
         :type: `str`
         """
         try:
-            return self.metadata['name']
+            return self._metadata['name']
         except KeyError:
             return None
 
     @name.setter
     def name(self, val):
-        self.metadata['name'] = str(val)
+        self._mutable_metadata()['name'] = str(val)
 
     @property
     def unit(self):
@@ -286,7 +541,7 @@ class Array(numpy.ndarray):
         :type: :class:`~astropy.units.Unit`
         """
         try:
-            return self.metadata['unit']
+            return self._metadata['unit']
         except KeyError:
             self.unit = ''
             return self.unit
@@ -294,9 +549,9 @@ class Array(numpy.ndarray):
     @unit.setter
     def unit(self, val):
         if val is None or isinstance(val, Unit):
-            self.metadata['unit'] = val
+            self._mutable_metadata()['unit'] = val
         else:
-            self.metadata['unit'] = Unit(val)
+            self._mutable_metadata()['unit'] = Unit(val)
 
     @property
     def epoch(self):
@@ -308,31 +563,31 @@ class Array(numpy.ndarray):
         See `~astropy.time` for details on the `Time` object.
         """
         try:
-            return Time(self.metadata['epoch'], format='gps')
+            return Time(self._metadata['epoch'], format='gps')
         except KeyError:
             return None
 
     @epoch.setter
     def epoch(self, epoch):
         if isinstance(epoch, Time):
-            self.metadata['epoch'] = epoch.gps
+            self._mutable_metadata()['epoch'] = epoch.gps
         elif isinstance(epoch, Quantity):
-            self.metadata['epoch'] = epoch.value
+            self._mutable_metadata()['epoch'] = epoch.value
         else:
-            self.metadata['epoch'] = float(epoch)
+            self._mutable_metadata()['epoch'] = float(epoch)
 
     @property
     def channel(self):
         """Data channel associated with this `Array`.
         """
         try:
-            return self.metadata['channel']
+            return self._metadata['channel']
         except KeyError:
             return None
 
     @channel.setter
     def channel(self, ch):
-        self.metadata['channel'] = Channel(ch)
+        self._mutable_metadata()['channel'] = Channel(ch)
 
     # -------------------------------------------
     # extras
@@ -356,3 +611,64 @@ def _array_reconstruct(Class, dtype):
         dtype to set
     """
     return Class.__new__(Class, [], dtype=dtype)
+
+
+def _find_memmap(array):
+    """Return the outermost `numpy.memmap` viewed by the given array
+
+    Returns
+    -------
+    memmap : `numpy.memmap`
+        the memory-mapped array at the root of the chain of views, or
+        `None` if the given array does not view a mapped file
+    """
+    found = None
+    base = array
+    while isinstance(base, numpy.ndarray):
+        if isinstance(base, numpy.memmap):
+            found = base
+        base = base.base
+    return found
+
+
+def _memmap_source(array):
+    """Return the location of the given array in a read-only mapped file
+
+    Returns
+    -------
+    source : `tuple`
+        ``(filename, offset, shape)`` of the data in the file, or `None`
+        if the array does not contiguously view a read-only mapped file
+    """
+    mmap = _find_memmap(array)
+    if (mmap is None or mmap.mode != 'r' or mmap.filename is None or
+            not array.size or not array.flags.c_contiguous):
+        return None
+    start = array.__array_interface__['data'][0]
+    origin = mmap.__array_interface__['data'][0]
+    return (mmap.filename, mmap.offset + start - origin, array.shape)
+
+
+def _memmap_reconstruct(Class, dtype, filename, offset, shape, metadata):
+    """Reconstruct an `Array` viewing a memory-mapped file after
+    unpickling
+
+    Parameters
+    ----------
+    Class : `type`, `Array` or sub-class
+        class object to create
+    dtype : `type`, `numpy.dtype`
+        dtype of the file contents
+    filename : `str`
+        path of mapped file
+    offset : `int`
+        number of bytes in the file before the start of the data
+    shape : `tuple`
+        shape of the array
+    metadata : `dict`
+        metadata for the array
+    """
+    new = numpy.memmap(filename, dtype=dtype, mode='r', offset=offset,
+                       shape=shape).view(Class)
+    new._metadata = Class._metadata_type(metadata)
+    return new
@@ -28,6 +28,8 @@ __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 
 from .array import Array
 from .series import Series
+from .index import RegularIndex
+from .resample import (rational_ratio, resample_poly)
 from ..segments import Segment
 
 
@@ -50,16 +52,24 @@ class Array2D(Array):
     def __getitem__(self, item):
         new = super(Array2D, self).__getitem__(item)
         if isinstance(item, int):
-            new = Series(new, unit=self.unit, name=self.name, dx=self.dy,
-                         epoch=self.epoch, channel=self.channel, x0=self.y0)
+            # pass the y-axis as values in the y-axis unit, which becomes
+            # the x-axis unit of the new Series
+            axis = dict((key, self._axis_value(ykey, self.yunit)) for
+                        (key, ykey) in (('x0', 'y0'), ('dx', 'dy')) if
+                        ykey in self._metadata)
+            new = Series(new, unit=self.unit, name=self.name,
+                         epoch=self.epoch, channel=self.channel, **axis)
             new.xunit = self.yunit
         elif isinstance(item, tuple):
             new = Quantity(new, unit=self.unit)
         if isinstance(item, slice):
+            if item.start or item.step:
+                dx = self._axis_value('dx', self.xunit)
             if item.start:
-                new.x0 += new.x0 + item.start * self.dx
+                new.x0 = (self._axis_value('x0', self.xunit) +
+                          item.start * dx)
             if item.step:
-                new.dx *= item.step
+                new.dx = dx * item.step
         #else:
         #    new.index = self.index[item.argmax()]
         return new
@@ -71,35 +81,35 @@ class Array2D(Array):
     def x0(self):
         """X-axis value of first sample
         """
-        return self.metadata['x0']
+        unit = self.xunit
+        return Quantity(self._axis_value('x0', unit), unit)
 
     @x0.setter
     def x0(self, value):
         if isinstance(value, Quantity):
-            self.metadata['x0'] = value.to(self.xunit)
-        else:
-            self.metadata['x0'] = Quantity(value, self.xunit)
+            value = value.to(self.xunit).value
+        self._mutable_metadata()['x0'] = float(value)
 
     @x0.deleter
     def x0(self):
-        del self.metadata['x0']
+        del self._mutable_metadata()['x0']
 
     @property
     def dx(self):
         """Distance between samples on the x-axis
         """
-        return self.metadata['dx']
+        unit = self.xunit
+        return Quantity(self._axis_value('dx', unit), unit)
 
     @dx.setter
     def dx(self, value):
         if isinstance(value, Quantity):
-            self.metadata['dx'] = value.to(self.xunit)
-        else:
-            self.metadata['dx'] = Quantity(value, self.xunit)
+            value = value.to(self.xunit).value
+        self._mutable_metadata()['dx'] = float(value)
 
     @dx.deleter
     def dx(self):
-        del self.metadata['dx']
+        del self._mutable_metadata()['dx']
 
     @property
     def span_x(self):
@@ -111,35 +121,35 @@ class Array2D(Array):
     def y0(self):
         """X-axis value of first sample
         """
-        return self.metadata['y0']
+        unit = self.yunit
+        return Quantity(self._axis_value('y0', unit), unit)
 
     @y0.setter
     def y0(self, value):
         if isinstance(value, Quantity):
-            self.metadata['y0'] = value.to(self.yunit)
-        else:
-            self.metadata['y0'] = Quantity(value, self.yunit)
+            value = value.to(self.yunit).value
+        self._mutable_metadata()['y0'] = float(value)
 
     @y0.deleter
     def y0(self):
-        del self.metadata['y0']
+        del self._mutable_metadata()['y0']
 
     @property
     def dy(self):
         """Distance between samples on the x-axis
         """
-        return self.metadata['dy']
+        unit = self.yunit
+        return Quantity(self._axis_value('dy', unit), unit)
 
     @dy.setter
     def dy(self, value):
         if isinstance(value, Quantity):
-            self.metadata['dy'] = value.to(self.yunit)
-        else:
-            self.metadata['dy'] = Quantity(value, self.yunit)
+            value = value.to(self.yunit).value
+        self._mutable_metadata()['dy'] = float(value)
 
     @dy.deleter
     def dy(self):
-        del self.metadata['dy']
+        del self._mutable_metadata()['dy']
 
     @property
     def span_y(self):
@@ -151,24 +161,29 @@ class Array2D(Array):
     def xindex(self):
         """Positions of the data on the x-axis
 
-        :type: `Series`
+        For regularly-sampled data this is a virtual
+        :class:`~gwpy.data.index.RegularIndex`, computing positions on
+        demand from `x0` and `dx`, otherwise it is the `Array` of
+        positions given explicitly.
+
+        :type: `RegularIndex` or `Array`
         """
         try:
             return self._xindex
         except AttributeError:
-            if self.logx:
-                logdx = (numpy.log10(self.x0.value + self.dx.value) -
-                         numpy.log10(self.x0.value))
-                logx1 = numpy.log10(self.x0.value) + self.shape[0] * logdx
-                self.xindex = numpy.logspace(numpy.log10(self.x0.value), logx1,
-                                             num=self.shape[0])
-            else:
-                self.xindex = (numpy.arange(self.shape[0]) * self.dx.value +
-                               self.x0.value)
-            return self.xindex
+            unit = self.xunit
+            return RegularIndex(self._axis_value('x0', unit),
+                                self._axis_value('dx', unit), self.shape[0],
+                                logx=self.logx, unit=unit,
+                                name='%s xindex' % self.name)
 
     @xindex.setter
     def xindex(self, samples):
+        if isinstance(samples, RegularIndex):
+            del self.xindex
+            self.x0 = samples.x0
+            self.dx = samples.dx
+            return
         if not isinstance(samples, Array):
             fname = inspect.stack()[0][3]
             name = '%s %s' % (self.name, fname)
@@ -181,28 +196,40 @@ class Array2D(Array):
         except IndexError:
             del self.dx
 
+    @xindex.deleter
+    def xindex(self):
+        try:
+            del self._xindex
+        except AttributeError:
+            pass
+
     @property
     def yindex(self):
-        """Positions of the data on the x-axis
+        """Positions of the data on the y-axis
 
-        :type: `Series`
+        For regularly-sampled data this is a virtual
+        :class:`~gwpy.data.index.RegularIndex`, computing positions on
+        demand from `y0` and `dy`, otherwise it is the `Array` of
+        positions given explicitly.
+
+        :type: `RegularIndex` or `Array`
         """
         try:
             return self._yindex
         except AttributeError:
-            if self.logy:
-                logdy = (numpy.log10(self.y0.value + self.dy.value) -
-                         numpy.log10(self.y0.value))
-                logy1 = numpy.log10(self.y0.value) + self.shape[-1] * logdy
-                self.yindex = numpy.logspace(numpy.log10(self.y0.value), logy1,
-                                             num=self.shape[-1])
-            else:
-                self.yindex = (numpy.arange(self.shape[-1]) * self.dy.value +
-                               self.y0.value)
-            return self.yindex
+            unit = self.yunit
+            return RegularIndex(self._axis_value('y0', unit),
+                                self._axis_value('dy', unit), self.shape[-1],
+                                logx=self.logy, unit=unit,
+                                name='%s yindex' % self.name)
 
     @yindex.setter
     def yindex(self, samples):
+        if isinstance(samples, RegularIndex):
+            del self.yindex
+            self.y0 = samples.x0
+            self.dy = samples.dx
+            return
         if not isinstance(samples, Array):
             fname = inspect.stack()[0][3]
             name = '%s %s' % (self.name, fname)
@@ -215,23 +242,31 @@ class Array2D(Array):
         except IndexError:
             del self.dy
 
+    @yindex.deleter
+    def yindex(self):
+        try:
+            del self._yindex
+        except AttributeError:
+            pass
+
     @property
     def logx(self):
         """Boolean telling whether this `Series` has a logarithmic
         x-axis scale
         """
         try:
-            return self.metadata['logx']
+            return self._metadata['logx']
         except KeyError:
             self.logx = False
             return self.logx
 
     @logx.setter
     def logx(self, val):
-        if (val and self.metadata.has_key('logx') and
-            not self.metdata['logx'] and hasattr(self, '_xindex')):
+        meta = self._metadata
+        if (val and 'logx' in meta and not meta['logx'] and
+                hasattr(self, '_xindex')):
             del self.xindex
-        self.metadata['logx'] = bool(val)
+        self._mutable_metadata()['logx'] = bool(val)
 
     @property
     def logy(self):
@@ -239,44 +274,52 @@ class Array2D(Array):
         y-ayis scale
         """
         try:
-            return self.metadata['logy']
+            return self._metadata['logy']
         except KeyError:
             self.logy = False
             return self.logy
 
     @logy.setter
     def logy(self, val):
-        if (val and self.metadata.has_key('logy') and
-           not self.metadata['logy'] and hasattr(self, '_yindex')):
+        meta = self._metadata
+        if (val and 'logy' in meta and not meta['logy'] and
+                hasattr(self, '_yindex')):
            del self._index
-        self.metadata['logy'] = bool(val)
+        self._mutable_metadata()['logy'] = bool(val)
 
     # -------------------------------------------
     # Series methods
 
     def resample(self, rate, window=None):
-        """Resample this Series to a new rate
+        """Resample this `Array2D` to a new rate along the x-axis
 
         Parameters
         ----------
         rate : `float`
-            rate to which to resample this `Series`
-        window : array_like, callable, string, float, or tuple, optional
-            specifies the window applied to the signal in the Fourier
-            domain.
+            rate to which to resample this `Array2D`
+        window : `str`, `tuple`, optional, default: ``('kaiser', 5.0)``
+            window used to design the anti-aliasing FIR filter, see
+            :func:`scipy.signal.firwin` for details
 
         Returns
         -------
-        Series
-            a new Series with the resampling applied, and the same
+        Array2D
+            a new Array2D with the resampling applied, and the same
             metadata
+
+        See Also
+        --------
+        :class:`~gwpy.data.resample.Resampler`
+            for details of the polyphase resampling
         """
         if isinstance(rate, Quantity):
             rate = rate.value
-        N = self.size * self.dx * rate
-        data = signal.resample(self.data, N, window=window)
-        new = self.__class__(data, **self.metadata)
-        new.dx = 1 / rate
+        up, down = rational_ratio(rate, 1 / self.dx.value)
+        data = resample_poly(self.data, up, down,
+                             window=window or ('kaiser', 5.0), axis=0)
+        new = self.__class__(data, dtype=self.dtype)
+        new._metadata = self._metadata.copy()
+        new.dx = 1 / float(rate)
         return new
 
     # -------------------------------------------
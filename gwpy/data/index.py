@@ -0,0 +1,267 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""The `RegularIndex` is a virtual array of regularly-spaced sample
+positions
+
+Regularly sampled data only need the first position, the spacing and
+the number of samples to describe the x-axis of the data, so the
+`RegularIndex` records only these, computing sample positions on demand.
+"""
+
+import numbers
+import numpy
+
+from ..version import version as __version__
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+
+__all__ = ['RegularIndex']
+
+
+class RegularIndex(object):
+    """A virtual, non-materialised, array of regularly-spaced positions
+
+    Parameters
+    ----------
+    x0 : `float`
+        position of the first sample
+    dx : `float`
+        distance between the first two samples
+    n : `int`
+        number of samples
+    logx : `bool`, optional, default: `False`
+        samples are evenly spaced in logarithmic space
+    unit : :class:`~astropy.units.Unit`, optional
+        unit of the sample positions
+    name : `str`, optional
+        name for this index
+
+    Notes
+    -----
+    The full array of positions is only computed when explicitly
+    requested, via the :attr:`~RegularIndex.data` attribute, or when
+    the `RegularIndex` is used in place of a :class:`numpy.ndarray`.
+    Slicing, scalar item access, and sorted-position lookups via
+    :meth:`~RegularIndex.searchsorted` are computed arithmetically.
+    """
+    __array_priority__ = 10.2
+
+    def __init__(self, x0, dx, n, logx=False, unit=None, name=None):
+        """Define a new `RegularIndex`
+        """
+        x0 = float(x0)
+        dx = float(dx)
+        n = int(n)
+        self.logx = bool(logx)
+        if self.logx and n > 1:
+            # match the sample positions of the logarithmic Series index
+            logdx = numpy.log10(x0 + dx) - numpy.log10(x0)
+            self._start = numpy.log10(x0)
+            self._step = n * logdx / (n - 1)
+        elif self.logx:
+            self._start = numpy.log10(x0)
+            self._step = 0.
+        else:
+            self._start = x0
+            self._step = dx
+        self._size = n
+        self.unit = unit
+        self.name = name
+
+    @classmethod
+    def _from_grid(cls, start, step, n, logx, unit=None, name=None):
+        """Build a new `RegularIndex` directly from its internal grid
+        """
+        new = cls.__new__(cls)
+        new._start = start
+        new._step = step
+        new._size = int(n)
+        new.logx = logx
+        new.unit = unit
+        new.name = name
+        return new
+
+    # -------------------------------------------
+    # RegularIndex properties
+
+    @property
+    def x0(self):
+        """Position of the first sample
+        """
+        return self._values(0)
+
+    @property
+    def dx(self):
+        """Distance between the first two samples
+        """
+        if self.logx:
+            return self._values(1) - self._values(0)
+        return self._step
+
+    @property
+    def size(self):
+        """Number of samples in this `RegularIndex`
+        """
+        return self._size
+
+    @property
+    def shape(self):
+        return (self._size,)
+
+    ndim = 1
+    dtype = numpy.dtype(numpy.float64)
+
+    @property
+    def data(self):
+        """The full array of sample positions
+
+        :type: :class:`numpy.ndarray`
+        """
+        return self._values(numpy.arange(self._size))
+    A = value = data
+
+    # -------------------------------------------
+    # array-like methods
+
+    def _values(self, idx):
+        """Return the position(s) of the given sample index (or indices)
+        """
+        grid = self._start + numpy.multiply(idx, self._step,
+                                            dtype=numpy.float64)
+        if self.logx:
+            return numpy.power(10., grid)
+        return grid
+
+    def __len__(self):
+        return self._size
+
+    def __array__(self, dtype=None):
+        data = self.data
+        if dtype is not None:
+            return data.astype(dtype)
+        return data
+
+    def __iter__(self):
+        i = 0
+        while i < self._size:
+            yield self._values(i)
+            i += 1
+
+    def __getitem__(self, item):
+        if isinstance(item, numbers.Integral):
+            if item < 0:
+                item += self._size
+            if not 0 <= item < self._size:
+                raise IndexError("index %d is out of bounds for %s of size "
+                                 "%d" % (item, type(self).__name__,
+                                         self._size))
+            return self._values(item)
+        elif isinstance(item, slice):
+            start, stop, step = item.indices(self._size)
+            if step > 0:
+                n = max(0, (stop - start + step - 1) // step)
+            else:
+                n = max(0, (start - stop - step - 1) // -step)
+            return self._from_grid(self._start + start * self._step,
+                                   self._step * step, n, self.logx,
+                                   unit=self.unit, name=self.name)
+        idx = numpy.asarray(item)
+        if idx.dtype == bool:
+            idx = numpy.flatnonzero(idx)
+        idx = numpy.where(idx < 0, idx + self._size, idx)
+        if idx.size and (idx.min() < 0 or idx.max() >= self._size):
+            raise IndexError("index out of bounds for %s of size %d"
+                             % (type(self).__name__, self._size))
+        return self._values(idx)
+
+    def searchsorted(self, v, side='left'):
+        """Find the indices at which the given positions would be
+        inserted to maintain order
+
+        See :meth:`numpy.ndarray.searchsorted` for details, this
+        method is computed arithmetically without materialising the
+        full index array.
+        """
+        v = numpy.asarray(v, dtype=numpy.float64)
+        if self.logx:
+            v = numpy.log10(v)
+        if self._step == 0:
+            return numpy.zeros(v.shape, dtype=int)
+        idx = (v - self._start) / self._step
+        # absorb floating-point rounding of positions that sit on a sample
+        nearest = numpy.round(idx)
+        onsample = numpy.isclose(idx, nearest, rtol=0, atol=1e-9)
+        if side == 'left':
+            out = numpy.where(onsample, nearest, numpy.ceil(idx))
+        else:
+            out = numpy.where(onsample, nearest + 1, numpy.floor(idx) + 1)
+        out = numpy.clip(out, 0, self._size).astype(int)
+        if out.ndim == 0:
+            return int(out)
+        return out
+
+    def min(self, *args, **kwargs):
+        if args or kwargs:
+            return self.data.min(*args, **kwargs)
+        if self._step < 0:
+            return self._values(self._size - 1)
+        return self._values(0)
+
+    def max(self, *args, **kwargs):
+        if args or kwargs:
+            return self.data.max(*args, **kwargs)
+        if self._step < 0:
+            return self._values(0)
+        return self._values(self._size - 1)
+
+    def copy(self):
+        return self._from_grid(self._start, self._step, self._size,
+                               self.logx, unit=self.unit, name=self.name)
+
+    def __getattr__(self, attr):
+        # fall back to the methods of the materialised array
+        if attr.startswith('_'):
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (type(self).__name__, attr))
+        return getattr(self.data, attr)
+
+    def __repr__(self):
+        return ("<%s(x0=%r, dx=%r, n=%d, logx=%r, unit=%r)>"
+                % (type(self).__name__, self.x0, self.dx, self._size,
+                   self.logx, self.unit))
+
+    def __str__(self):
+        return str(self.data)
+
+
+def _delegate(name):
+    """Build a method that applies the given operator to the
+    materialised array
+    """
+    def method(self, *args):
+        return getattr(self.data, name)(*args)
+    method.__name__ = name
+    return method
+
+for _op in ['__add__', '__radd__', '__sub__', '__rsub__', '__mul__',
+            '__rmul__', '__div__', '__rdiv__', '__truediv__',
+            '__rtruediv__', '__floordiv__', '__rfloordiv__', '__pow__',
+            '__rpow__', '__neg__', '__abs__', '__lt__', '__le__',
+            '__gt__', '__ge__', '__eq__', '__ne__']:
+    if hasattr(numpy.ndarray, _op):
+        setattr(RegularIndex, _op, _delegate(_op))
+del _op
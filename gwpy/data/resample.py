@@ -0,0 +1,302 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Polyphase rational resampling of regularly-sampled data
+
+The `Resampler` changes the rate of an input stream by a rational
+factor ``up / down``, equivalent to up-sampling by ``up``, applying a
+zero-phase low-pass FIR filter, then down-sampling by ``down``, but
+evaluating only those filter outputs that are kept.
+"""
+
+from fractions import Fraction
+
+import numpy
+from numpy.lib import stride_tricks
+from scipy import signal
+
+from ..version import version as __version__
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+
+__all__ = ['Resampler', 'resample_poly', 'rational_ratio']
+
+# cache of anti-alias filter designs, keyed by (up, down, window)
+_FILTER_CACHE = {}
+
+# maximum number of elements in a single block of the polyphase sum
+_MAX_BLOCK_SIZE = 2 ** 22
+
+
+def rational_ratio(rate, original, maxden=1000):
+    """Return the rational ratio ``(up, down)`` between two sample rates
+
+    Parameters
+    ----------
+    rate : `float`
+        target sample rate
+    original : `float`
+        input sample rate
+    maxden : `int`, optional, default: 1000
+        maximum denominator allowed when approximating non-integer rates
+
+    Returns
+    -------
+    up, down : `int`
+        the up- and down-sampling factors, with no common factor
+
+    Raises
+    ------
+    ValueError
+        if the ratio of the rates cannot be given exactly as a fraction
+        with a denominator no larger than ``maxden``, since the output
+        would not be sampled at the requested rate
+    """
+    rate = float(rate)
+    original = float(original)
+    if rate.is_integer() and original.is_integer():
+        ratio = Fraction(int(rate), int(original))
+    else:
+        exact = rate / original
+        ratio = Fraction(exact).limit_denominator(maxden)
+        if abs(float(ratio) - exact) > 1e-9 * exact:
+            raise ValueError("Cannot resample from %s Hz to %s Hz, the "
+                             "ratio of the rates is not a fraction with "
+                             "denominator of at most %d"
+                             % (original, rate, maxden))
+    return ratio.numerator, ratio.denominator
+
+
+def design_filter(up, down, window=('kaiser', 5.0)):
+    """Design the anti-alias FIR filter for a rational resampling
+
+    Filter designs are cached, so repeated calls with the same arguments
+    are free.
+
+    Parameters
+    ----------
+    up : `int`
+        up-sampling factor
+    down : `int`
+        down-sampling factor
+    window : `str`, `tuple`, optional, default: ``('kaiser', 5.0)``
+        window to use in the FIR design, see :func:`scipy.signal.firwin`
+
+    Returns
+    -------
+    taps : `numpy.ndarray`
+        odd-length array of filter coefficients, scaled by ``up``
+    """
+    key = (up, down, window)
+    try:
+        return _FILTER_CACHE[key]
+    except KeyError:
+        maxrate = max(up, down)
+        if maxrate == 1:  # no resampling, so no filtering
+            taps = numpy.ones(1)
+        else:
+            ntaps = 2 * 10 * maxrate + 1
+            taps = signal.firwin(ntaps, 1. / maxrate, window=window) * up
+        taps.flags.writeable = False
+        _FILTER_CACHE[key] = taps
+        return taps
+
+
+class Resampler(object):
+    """Stateful polyphase rational resampler
+
+    Data may be passed in consecutive chunks via :meth:`process`, with
+    the filter history carried between calls, so that the concatenated
+    output, including that returned by the final call to :meth:`flush`,
+    is identical to resampling the full input in a single pass.
+
+    Parameters
+    ----------
+    up : `int`
+        up-sampling factor
+    down : `int`
+        down-sampling factor
+    window : `str`, `tuple`, optional, default: ``('kaiser', 5.0)``
+        window to use in the anti-alias FIR design
+
+    Notes
+    -----
+    The FIR filter is applied with its group delay removed, so the output
+    is zero-phase with respect to the input, and the first output sample
+    is coincident with the first input sample. The input is assumed to be
+    zero outside of the data given, so edge effects are limited to the
+    length of the filter.
+    """
+    def __init__(self, up, down, window=('kaiser', 5.0)):
+        """Create a new `Resampler`
+        """
+        factor = Fraction(int(up), int(down))
+        self.up = factor.numerator
+        self.down = factor.denominator
+        self.window = window
+        self.taps = design_filter(self.up, self.down, window=window)
+        # split filter into polyphase branches, time-reversed for
+        # correlation against windows of the input
+        ntaps = self.taps.size
+        self._nbranch = -(-ntaps // self.up)
+        branches = numpy.zeros(self._nbranch * self.up)
+        branches[:ntaps] = self.taps
+        self._branches = branches.reshape((self._nbranch, self.up)).T[:, ::-1]
+        self._delay = (ntaps - 1) // 2
+        self.reset()
+
+    def reset(self):
+        """Reset the internal state of this `Resampler`
+        """
+        self._buffer = numpy.zeros(self._nbranch - 1)
+        self._offset = -(self._nbranch - 1)  # input index of _buffer[0]
+        self._nin = 0
+        self._nout = 0
+        self._dtype = None
+
+    def _input_index(self, m):
+        """Return the index of the latest input sample required by the
+        given output sample(s), and the polyphase branch to use
+        """
+        n = numpy.asarray(m) * self.down + self._delay
+        return n // self.up, n % self.up
+
+    def _run(self, end):
+        """Compute all outputs up to (not including) index ``end``
+        """
+        start = self._nout
+        if end <= start:
+            return numpy.zeros(0, dtype=self._buffer.dtype)
+        nbranch = self._nbranch
+        buf = self._buffer
+        windows = stride_tricks.as_strided(
+            buf, shape=(buf.size - nbranch + 1, nbranch),
+            strides=(buf.strides[0], buf.strides[0]))
+        out = numpy.zeros(end - start, dtype=buf.dtype)
+        nblock = max(1, _MAX_BLOCK_SIZE // nbranch)
+        for i in range(start, end, nblock):
+            m = numpy.arange(i, min(i + nblock, end))
+            idx, phase = self._input_index(m)
+            rows = idx - self._offset - nbranch + 1
+            for p in numpy.unique(phase):
+                sel = phase == p
+                out[m[sel] - start] = numpy.dot(windows[rows[sel]],
+                                                self._branches[p])
+        self._nout = end
+        # drop input that is no longer needed
+        first = self._input_index(end)[0] - nbranch + 1
+        drop = min(max(0, first - self._offset), buf.size)
+        self._buffer = buf[drop:].copy()
+        self._offset += drop
+        return out
+
+    def _cast(self, out):
+        if self._dtype is not None and self._dtype.kind in 'fc':
+            return out.astype(self._dtype, copy=False)
+        return out
+
+    def process(self, data):
+        """Resample the next chunk of input data
+
+        Parameters
+        ----------
+        data : `numpy.ndarray`
+            one-dimensional array of input samples, directly following
+            those passed in the previous call
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            all output samples that can be computed from the input
+            given so far
+        """
+        data = numpy.asarray(data)
+        if self._dtype is None:
+            self._dtype = data.dtype
+        if numpy.iscomplexobj(data) and not numpy.iscomplexobj(self._buffer):
+            self._buffer = self._buffer.astype(complex)
+        self._buffer = numpy.concatenate((self._buffer, data.ravel()))
+        self._nin += data.size
+        # find number of outputs that depend only on input received so far
+        last = self._offset + self._buffer.size  # one past last input index
+        end = -(-(last * self.up - self._delay) // self.down)
+        return self._cast(self._run(max(end, self._nout)))
+
+    def flush(self):
+        """Return the final output samples, assuming zeros after the
+        end of the input, and reset this `Resampler`
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            remaining output samples, such that the total number of
+            outputs is ``ceil(ninput * up / down)``
+        """
+        total = -(-self._nin * self.up // self.down)
+        if total > self._nout:
+            need = self._input_index(total - 1)[0] + 1
+            npad = max(0, need - (self._offset + self._buffer.size))
+            self._buffer = numpy.concatenate(
+                (self._buffer, numpy.zeros(npad, dtype=self._buffer.dtype)))
+            out = self._cast(self._run(total))
+        else:
+            out = self._cast(numpy.zeros(0, dtype=self._buffer.dtype))
+        self.reset()
+        return out
+
+
+def resample_poly(data, up, down, window=('kaiser', 5.0), axis=0):
+    """Resample an array by the rational factor ``up / down``
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`
+        input data array
+    up : `int`
+        up-sampling factor
+    down : `int`
+        down-sampling factor
+    window : `str`, `tuple`, optional, default: ``('kaiser', 5.0)``
+        window to use in the anti-alias FIR design
+    axis : `int`, optional, default: 0
+        axis along which to resample
+
+    Returns
+    -------
+    out : `numpy.ndarray`
+        resampled array, of the same floating-point type as the input
+
+    See Also
+    --------
+    Resampler
+        for details of the algorithm, and for chunked resampling
+    """
+    data = numpy.asarray(data)
+    resampler = Resampler(up, down, window=window)
+    if data.ndim == 1:
+        return numpy.concatenate((resampler.process(data),
+                                  resampler.flush()))
+    moved = numpy.rollaxis(data, axis)
+    nout = -(-moved.shape[0] * resampler.up // resampler.down)
+    out = None
+    for idx in numpy.ndindex(*moved.shape[1:]):
+        column = moved[(slice(None),) + idx]
+        column = numpy.concatenate((resampler.process(column),
+                                    resampler.flush()))
+        if out is None:
+            out = numpy.empty((nout,) + moved.shape[1:], dtype=column.dtype)
+        out[(slice(None),) + idx] = column
+    return numpy.rollaxis(out, 0, axis + 1)
@@ -28,6 +28,8 @@ from ..version import version as __version__
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 
 from .array import Array
+from .index import RegularIndex
+from .resample import (rational_ratio, resample_poly)
 from ..segments import Segment
 
 
@@ -53,10 +55,15 @@ class Series(Array):
         if isinstance(item, int):
             return Quantity(new, unit=self.unit)
         elif isinstance(item, slice):
+            # shift the axis using the stored values, without building
+            # any Quantities
+            if item.start or item.step:
+                dx = self._axis_value('dx', self.xunit)
             if item.start:
-                new.x0 += (item.start * new.dx)
+                new.x0 = (self._axis_value('x0', self.xunit) +
+                          item.start * dx)
             if item.step:
-                new.dx *= item.step
+                new.dx = dx * item.step
         elif isinstance(item, (list, tuple, numpy.ndarray)):
             new.index = self.index[item]
         else:
@@ -70,35 +77,35 @@ class Series(Array):
     def x0(self):
         """X-axis value of first sample
         """
-        return self.metadata['x0']
+        unit = self.xunit
+        return Quantity(self._axis_value('x0', unit), unit)
 
     @x0.setter
     def x0(self, value):
         if isinstance(value, Quantity):
-            self.metadata['x0'] = value.to(self.xunit)
-        else:
-            self.metadata['x0'] = Quantity(value, self.xunit)
+            value = value.to(self.xunit).value
+        self._mutable_metadata()['x0'] = float(value)
 
     @x0.deleter
     def x0(self):
-        del self.metadata['x0']
+        del self._mutable_metadata()['x0']
 
     @property
     def dx(self):
         """Distance between samples on the x-axis
         """
-        return self.metadata['dx']
+        unit = self.xunit
+        return Quantity(self._axis_value('dx', unit), unit)
 
     @dx.setter
     def dx(self, value):
         if isinstance(value, Quantity):
-            self.metadata['dx'] = value.to(self.xunit)
-        else:
-            self.metadata['dx'] = Quantity(value, self.xunit)
+            value = value.to(self.xunit).value
+        self._mutable_metadata()['dx'] = float(value)
 
     @dx.deleter
     def dx(self):
-        del self.metadata['dx']
+        del self._mutable_metadata()['dx']
 
     @property
     def span(self):
@@ -110,24 +117,29 @@ class Series(Array):
     def index(self):
         """Positions of the data on the x-axis
 
-        :type: `Series`
+        For regularly-sampled data this is a virtual
+        :class:`~gwpy.data.index.RegularIndex`, computing positions on
+        demand from `x0` and `dx`, otherwise it is the `Array` of
+        positions given explicitly.
+
+        :type: `RegularIndex` or `Array`
         """
         try:
             return self._index
         except AttributeError:
-            if self.logx:
-                logdx = (numpy.log10(self.x0.value + self.dx.value) -
-                         numpy.log10(self.x0.value))
-                logx1 = numpy.log10(self.x0.value) + self.shape[-1] * logdx
-                self.index = numpy.logspace(numpy.log10(self.x0.value), logx1,
-                                             num=self.shape[-1])
-            else:
-                self.index = (numpy.arange(self.shape[-1]) * self.dx.value +
-                              self.x0.value)
-            return self.index
+            unit = self.xunit
+            return RegularIndex(self._axis_value('x0', unit),
+                                self._axis_value('dx', unit), self.shape[-1],
+                                logx=self.logx, unit=unit,
+                                name='%s index' % self.name)
 
     @index.setter
     def index(self, samples):
+        if isinstance(samples, RegularIndex):
+            del self.index
+            self.x0 = samples.x0
+            self.dx = samples.dx
+            return
         if not isinstance(samples, Array):
             fname = inspect.stack()[0][3]
             name = '%s %s' % (self.name, fname)
@@ -140,23 +152,31 @@ class Series(Array):
         except IndexError:
             del self.dx
 
+    @index.deleter
+    def index(self):
+        try:
+            del self._index
+        except AttributeError:
+            pass
+
     @property
     def logx(self):
         """Boolean telling whether this `Series` has a logarithmic
         x-axis scale
         """
         try:
-            return self.metadata['logx']
+            return self._metadata['logx']
         except KeyError:
             self.logx = False
             return self.logx
 
     @logx.setter
     def logx(self, val):
-        if (val and self.metadata.has_key('logx') and
-            not self.metadata['logx'] and self.metadata.has_key('index')):
+        meta = self._metadata
+        if (val and 'logx' in meta and not meta['logx'] and
+                'index' in meta):
             del self.index
-        self.metadata['logx'] = bool(val)
+        self._mutable_metadata()['logx'] = bool(val)
 
     # -------------------------------------------
     # Series methods
@@ -168,29 +188,39 @@ class Series(Array):
         ----------
         rate : `float`
             rate to which to resample this `Series`
-        window : array_like, callable, string, float, or tuple, optional
-            specifies the window applied to the signal in the Fourier
-            domain.
+        window : `str`, `tuple`, optional, default: ``('kaiser', 5.0)``
+            window used to design the anti-aliasing FIR filter, see
+            :func:`scipy.signal.firwin` for details
+        dtype : `numpy.dtype`, optional, default: the input dtype
+            data-type of the output
         doDecimate: Boolean
             tell code to use decimate instead of resample
+
         Returns
         -------
         Series
             a new Series with the resampling applied, and the same
             metadata
+
+        See Also
+        --------
+        :class:`~gwpy.data.resample.Resampler`
+            for details of the polyphase resampling, and for resampling
+            long data in chunks
         """
         if isinstance(rate, Quantity):
             rate = rate.value
-        N = self.shape[0] * self.dx * rate
 
         if doDecimate:
             r = (1/self.dx) / rate
             rval = int(r.value)
             data = decimate(self.data, rval)
         else:
-            data = signal.resample(self.data, N, window=window)
+            up, down = rational_ratio(rate, 1 / self.dx.value)
+            data = resample_poly(self.data, up, down,
+                                 window=window or ('kaiser', 5.0))
         new = self.__class__(data, dtype=dtype or self.dtype)
-        new.metadata = self.metadata.copy()
+        new._metadata = self._metadata.copy()
         new.dx = 1 / float(rate)
         return new
 
@@ -0,0 +1,338 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Core HDF5 input/output methods for `Array` and sub-classes
+
+The axes of each dataset follow those of the `Array`: the first axis
+is the x-axis (time for a `TimeSeries` or `Spectrogram`, frequency for a
+`Spectrum` or `SpectralVariance`), the second (if any) the y-axis. The
+position of the first sample and the spacing of the samples along each
+axis are stored as the ``x0``, ``dx``, ``y0`` and ``dy`` attributes, in
+the units of that axis.
+"""
+
+from contextlib import contextmanager
+from math import ceil
+
+import numpy
+
+from astropy.units import Quantity
+
+from ... import version
+
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+__version__ = version.version
+
+#: target number of bytes in a single chunk of a dataset
+CHUNK_BYTES = 1024 ** 2
+
+_AXES = ('x', 'y')
+
+
+@contextmanager
+def _open(f, mode='r'):
+    """Open the given HDF5 file, if required
+
+    Files opened here are closed on exit, while open `h5py.File` and
+    `h5py.Group` objects are returned as is
+    """
+    import h5py
+    if isinstance(f, (h5py.File, h5py.Group)):
+        yield f
+    else:
+        h5f = h5py.File(f, mode)
+        try:
+            yield h5f
+        finally:
+            h5f.close()
+
+
+def _str(value):
+    """Return the given HDF5 attribute value as a `str`
+    """
+    if isinstance(value, bytes) and not isinstance(value, str):
+        return value.decode('utf-8')
+    return str(value)
+
+
+def _chunks(shape, dtype, chunks=None, extendable=False):
+    """Return the chunk shape for a dataset
+
+    By default, each chunk holds all columns for as many rows as fit into
+    `CHUNK_BYTES`, limited to the number of rows in the dataset unless
+    it can be extended.
+    """
+    if chunks is None:
+        rowsize = numpy.dtype(dtype).itemsize * int(numpy.prod(shape[1:]))
+        chunks = max(1, CHUNK_BYTES // max(rowsize, 1))
+    if isinstance(chunks, (int, numpy.integer)):
+        rows = int(chunks)
+        if not extendable:
+            rows = min(rows, max(shape[0], 1))
+        chunks = (rows,) + tuple(shape[1:])
+    return tuple(chunks)
+
+
+def _sample_index(value, x0, dx, precision=1e-6):
+    """Return the index of the first sample at or after the given value
+    """
+    idx = (float(value) - x0) / dx
+    nearest = round(idx)
+    if abs(idx - nearest) < precision:
+        return int(nearest)
+    return int(ceil(idx))
+
+
+def _metadata(array):
+    """Return the metadata for the given array as HDF5 attributes
+    """
+    # read the record directly, `Array.metadata` would mark it as handed
+    # out, so that every later view of the array copies it
+    metadata = array._metadata
+    attrs = {}
+    for key in ('name', 'unit', 'channel'):
+        value = metadata.get(key, None)
+        if value is not None:
+            attrs[key] = str(value)
+    if metadata.get('epoch', None) is not None:
+        attrs['epoch'] = float(metadata['epoch'])
+    for axis in _AXES:
+        for key in (axis + '0', 'd' + axis):
+            value = metadata.get(key, None)
+            if isinstance(value, Quantity):
+                attrs[key] = float(value.value)
+            elif value is not None:
+                attrs[key] = float(value)
+        if metadata.get('log' + axis, None) is not None:
+            attrs['log' + axis] = bool(metadata['log' + axis])
+    if metadata.get('bins', None) is not None:
+        attrs['bins'] = numpy.asarray(metadata['bins'])
+    return attrs
+
+
+def write_hdf5(array, f, path=None, append=False, overwrite=False,
+               chunks=None, compression='gzip', compression_opts=None,
+               shuffle=True, extendable=False):
+    """Write an `Array` to an HDF5 file
+
+    Parameters
+    ----------
+    array : `~gwpy.data.Array`
+        data to write
+    f : `str`, `h5py.File`, `h5py.Group`
+        path of HDF5 file, or open file or group, to write to
+    path : `str`, optional
+        name of dataset in file, defaults to the name of the array
+    append : `bool`, optional, default: `False`
+        append the data to the end of an existing dataset, which must
+        end where the new data begin
+    overwrite : `bool`, optional, default: `False`
+        replace an existing dataset of the same name
+    chunks : `int`, `tuple`, optional
+        number of rows, or shape, of each chunk of the dataset, by default
+        each chunk holds roughly `CHUNK_BYTES` of data
+    compression : `str`, optional, default: ``'gzip'``
+        compression filter to apply to the dataset, or `None`
+    compression_opts : optional
+        options for the compression filter, e.g. the gzip level
+    shuffle : `bool`, optional, default: `True`
+        apply the shuffle filter before compression
+    extendable : `bool`, optional, default: `False`
+        allow data to be appended to the dataset at a later time
+
+    Raises
+    ------
+    IOError
+        if the dataset already exists, and neither ``append`` nor
+        ``overwrite`` are `True`
+    ValueError
+        if the data cannot be appended to the existing dataset, or the
+        array has an irregularly-sampled axis
+    """
+    for attr in ('_index', '_xindex', '_yindex'):
+        if hasattr(array, attr):
+            raise ValueError("Cannot write %s with an irregularly-sampled "
+                             "axis to HDF5" % type(array).__name__)
+    if path is None:
+        path = array.name or 'data'
+    data = array.view(numpy.ndarray)
+    attrs = _metadata(array)
+    with _open(f, 'a') as h5f:
+        if path in h5f and append:
+            return _append(h5f[path], data, attrs)
+        elif path in h5f and overwrite:
+            del h5f[path]
+        elif path in h5f:
+            raise IOError("Dataset %r already exists in HDF5 file, give "
+                          "overwrite=True or append=True" % path)
+        extendable = extendable or append
+        if extendable:
+            maxshape = (None,) + data.shape[1:]
+        else:
+            maxshape = None
+        dset = h5f.create_dataset(path, data=data, maxshape=maxshape,
+                                  chunks=_chunks(data.shape, data.dtype,
+                                                 chunks, extendable),
+                                  compression=compression,
+                                  compression_opts=compression_opts,
+                                  shuffle=shuffle and bool(compression))
+        for key, value in attrs.items():
+            dset.attrs[key] = value
+
+
+def _append(dset, data, attrs):
+    """Append data to the end of an existing HDF5 dataset
+    """
+    if dset.maxshape[0] is not None:
+        raise ValueError("Cannot append to HDF5 dataset %r, it was not "
+                         "written with extendable=True" % dset.name)
+    if dset.shape[1:] != data.shape[1:] or dset.dtype != data.dtype:
+        raise ValueError("Cannot append data of shape %s and type %s to "
+                         "HDF5 dataset %r of shape %s and type %s"
+                         % (data.shape, data.dtype, dset.name, dset.shape,
+                            dset.dtype))
+    if 'x0' in dset.attrs and 'x0' in attrs:
+        x0 = float(dset.attrs['x0'])
+        dx = float(dset.attrs['dx'])
+        if abs(attrs['dx'] - dx) > 1e-6 * dx:
+            raise ValueError("Cannot append data with dx=%r to HDF5 "
+                             "dataset %r with dx=%r"
+                             % (attrs['dx'], dset.name, dx))
+        if _sample_index(attrs['x0'], x0, dx) != dset.shape[0] or \
+                abs((attrs['x0'] - x0) / dx - dset.shape[0]) > 1e-6:
+            raise ValueError("Cannot append data starting at x0=%r to HDF5 "
+                             "dataset %r ending at %r, the data must be "
+                             "contiguous" % (attrs['x0'], dset.name,
+                                             x0 + dset.shape[0] * dx))
+    n = dset.shape[0]
+    dset.resize(n + data.shape[0], axis=0)
+    dset[n:] = data
+
+
+def _axis_slice(attrs, axis, size, low=None, high=None):
+    """Return the slice of the given axis covering ``[low, high)``
+    """
+    if low is None and high is None:
+        return slice(None)
+    key = _AXES[axis]
+    if attrs.get('log' + key, False):
+        raise ValueError("Cannot select a sub-range of a logarithmic axis")
+    x0 = float(attrs[key + '0'])
+    dx = float(attrs['d' + key])
+    start = 0
+    end = size
+    if low is not None:
+        start = min(max(0, _sample_index(low, x0, dx)), size)
+    if high is not None:
+        end = min(max(start, _sample_index(high, x0, dx)), size)
+    return slice(start, end)
+
+
+def read_hdf5(cls, f, path=None, timeaxis=None, frequencyaxis=None,
+              start=None, end=None, fmin=None, fmax=None):
+    """Read an `Array` from an HDF5 file
+
+    Only those chunks of the dataset that overlap the requested span are
+    read from disk.
+
+    Parameters
+    ----------
+    cls : `type`
+        `~gwpy.data.Array` sub-class to return
+    f : `str`, `h5py.File`, `h5py.Group`
+        path of HDF5 file, or open file or group, to read from
+    path : `str`, optional
+        name of dataset in file, only required if the file contains more
+        than one dataset
+    timeaxis : `int`, optional
+        index of the time axis of the dataset, if any
+    frequencyaxis : `int`, optional
+        index of the frequency axis of the dataset, if any
+    start : `float`, optional
+        GPS start time of data to read, requires ``timeaxis``
+    end : `float`, optional
+        GPS end time of data to read, requires ``timeaxis``
+    fmin : `float`, optional
+        lower frequency of data to read, requires ``frequencyaxis``
+    fmax : `float`, optional
+        upper frequency of data to read, requires ``frequencyaxis``
+
+    Returns
+    -------
+    array : ``cls``
+        a new array containing the data read from disk
+    """
+    if timeaxis is None and (start is not None or end is not None):
+        raise ValueError("Cannot select GPS span for %s" % cls.__name__)
+    if frequencyaxis is None and (fmin is not None or fmax is not None):
+        raise ValueError("Cannot select frequency band for %s"
+                         % cls.__name__)
+    with _open(f, 'r') as h5f:
+        if path is None:
+            names = list(h5f.keys())
+            if len(names) != 1:
+                raise ValueError("Multiple datasets found in HDF5 file, "
+                                 "please select one via the `path` "
+                                 "keyword argument: %s" % ', '.join(names))
+            path = names[0]
+        dset = h5f[str(path)]
+        attrs = dict(dset.attrs)
+        index = [slice(None)] * dset.ndim
+        if timeaxis is not None:
+            index[timeaxis] = _axis_slice(attrs, timeaxis,
+                                          dset.shape[timeaxis], start, end)
+        if frequencyaxis is not None:
+            index[frequencyaxis] = _axis_slice(
+                attrs, frequencyaxis, dset.shape[frequencyaxis], fmin, fmax)
+        data = dset[tuple(index)]
+    # build array and apply metadata
+    new = data.view(cls)
+    new._metadata = cls._metadata_type()
+    for key in ('name', 'unit', 'channel'):
+        if key in attrs:
+            setattr(new, key, _str(attrs[key]))
+    if 'epoch' in attrs:
+        new._mutable_metadata()['epoch'] = float(attrs['epoch'])
+    for axis, key in enumerate(_AXES):
+        for attr in ('log' + key, key + '0', 'd' + key):
+            if attr in attrs:
+                setattr(new, attr, attrs[attr].item())
+        # shift start of axis to first sample read
+        offset = axis < len(index) and index[axis].start or 0
+        if offset:
+            setattr(new, key + '0', float(attrs[key + '0']) +
+                    offset * float(attrs['d' + key]))
+    if 'bins' in attrs:
+        new.bins = numpy.asarray(attrs['bins'])
+    return new
+
+
+def identify_hdf5(*args, **kwargs):
+    """Identify the given file as an HDF5 file, rather than anything else
+
+    Returns
+    -------
+    True
+        if the file is an open `h5py` object, or the filename ends with
+        .h5, .hdf, or .hdf5
+    False
+        otherwise
+    """
+    filename = args[1]
+    if isinstance(filename, str):
+        return filename.endswith(('.h5', '.hdf', '.hdf5'))
+    return type(filename).__module__.startswith('h5py')
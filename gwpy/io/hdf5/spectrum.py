@@ -0,0 +1,79 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Read and write a Spectrum or SpectralVariance in HDF5 format
+"""
+
+from astropy.io import registry
+
+from ... import version
+from ...spectrum.core import Spectrum
+from ...spectrum.hist import SpectralVariance
+from .core import (read_hdf5, write_hdf5, identify_hdf5)
+
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+__version__ = version.version
+
+__all__ = []
+
+
+def read_spectrum(f, path=None, fmin=None, fmax=None):
+    """Read a `Spectrum` from an HDF5 file
+
+    Parameters
+    ----------
+    f : `str`, `h5py.File`, `h5py.Group`
+        path of HDF5 file, or open file or group, to read from
+    path : `str`, optional
+        name of dataset in file, only required if the file contains more
+        than one dataset
+    fmin : `float`, optional
+        lower frequency of desired data
+    fmax : `float`, optional
+        upper frequency of desired data
+
+    Returns
+    -------
+    Spectrum
+        a new `Spectrum` containing the data read from disk
+    """
+    return read_hdf5(Spectrum, f, path=path, frequencyaxis=0, fmin=fmin,
+                     fmax=fmax)
+
+
+def read_spectral_variance(f, path=None, fmin=None, fmax=None):
+    """Read a `SpectralVariance` from an HDF5 file
+
+    See :func:`read_spectrum` for details of the arguments.
+
+    Returns
+    -------
+    SpectralVariance
+        a new `SpectralVariance` containing the data read from disk
+    """
+    return read_hdf5(SpectralVariance, f, path=path, frequencyaxis=0,
+                     fmin=fmin, fmax=fmax)
+
+
+# register these file-readers with the Spectrum and SpectralVariance classes
+registry.register_reader('hdf5', Spectrum, read_spectrum, force=True)
+registry.register_writer('hdf5', Spectrum, write_hdf5, force=True)
+registry.register_identifier('hdf5', Spectrum, identify_hdf5)
+registry.register_reader('hdf5', SpectralVariance, read_spectral_variance,
+                         force=True)
+registry.register_writer('hdf5', SpectralVariance, write_hdf5, force=True)
+registry.register_identifier('hdf5', SpectralVariance, identify_hdf5)
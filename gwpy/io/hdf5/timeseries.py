@@ -0,0 +1,76 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Read and write a TimeSeries in HDF5 format
+"""
+
+from astropy.io import registry
+
+from ... import version
+from ...time import Time
+from ...timeseries.core import TimeSeries
+from .core import (read_hdf5, write_hdf5, identify_hdf5)
+
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+__version__ = version.version
+
+__all__ = []
+
+
+def read_timeseries(f, path=None, start=None, end=None):
+    """Read a `TimeSeries` from an HDF5 file
+
+    Parameters
+    ----------
+    f : `str`, `h5py.File`, `h5py.Group`
+        path of HDF5 file, or open file or group, to read from
+    path : `str`, optional
+        name of dataset in file, only required if the file contains more
+        than one dataset
+    start : :class:`~gwpy.time.Time`, `float`, optional
+        start GPS time of desired data
+    end : :class:`~gwpy.time.Time`, `float`, optional
+        end GPS time of desired data
+
+    Returns
+    -------
+    TimeSeries
+        a new `TimeSeries` containing the data read from disk
+    """
+    if isinstance(start, Time):
+        start = start.gps
+    if isinstance(end, Time):
+        end = end.gps
+    return read_hdf5(TimeSeries, f, path=path, timeaxis=0, start=start,
+                     end=end)
+
+
+def write_timeseries(timeseries, f, path=None, **kwargs):
+    """Write a `TimeSeries` to an HDF5 file
+
+    The dataset is written such that more data can be appended at a
+    later time. See :func:`~gwpy.io.hdf5.core.write_hdf5` for details
+    of the other keyword arguments.
+    """
+    kwargs.setdefault('extendable', True)
+    return write_hdf5(timeseries, f, path=path, **kwargs)
+
+
+# register this file-reader with the TimeSeries class
+registry.register_reader('hdf5', TimeSeries, read_timeseries, force=True)
+registry.register_writer('hdf5', TimeSeries, write_timeseries, force=True)
+registry.register_identifier('hdf5', TimeSeries, identify_hdf5)
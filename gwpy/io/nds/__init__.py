@@ -30,6 +30,9 @@ from ...time import Time
 from ...timeseries import (TimeSeries, TimeSeriesList)
 
 from .kerberos import *
+from .cache import *
+from .pool import *
+from .catalogue import *
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 __version__ = version.version
@@ -0,0 +1,337 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Persistent on-disk cache of data fetched from NDS
+
+The cache is enabled by setting the ``GWPY_NDS_CACHE`` environment
+variable to the path of a directory in which to store data. The total
+size of the cache is limited to ``GWPY_NDS_CACHE_SIZE`` bytes (default:
+10 GiB), with the least-recently used data removed first.
+
+Data for each (channel, type) pair are stored in their own directory,
+with each fetched interval stored as a separate binary ``.npy`` file,
+named by its sample rate and GPS ``[start, end)`` span.
+"""
+
+import json
+import os
+import re
+import tempfile
+from math import (ceil, floor)
+
+import numpy
+
+from ... import version
+from ...detector import Channel
+from ...segments import (Segment, SegmentList)
+
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+__version__ = version.version
+
+__all__ = ['NDSCache']
+
+DEFAULT_CACHE_SIZE = 10 * 1024 ** 3
+
+_re_unsafe = re.compile(r'[^A-Za-z0-9_.:\-]')
+
+
+def _safe(key):
+    """Return a filesystem-safe version of the given key
+    """
+    return _re_unsafe.sub('_', str(key))
+
+
+class NDSCache(object):
+    """Persistent on-disk cache of data fetched from NDS
+
+    Parameters
+    ----------
+    directory : `str`
+        path of directory in which to store data
+    maxsize : `int`, optional, default: 10 GiB
+        maximum total size (in bytes) of data to store
+
+    Methods
+    -------
+    from_env
+    missing
+    store
+    get
+    evict
+    """
+    def __init__(self, directory, maxsize=DEFAULT_CACHE_SIZE):
+        """Create a new `NDSCache`
+        """
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.maxsize = int(maxsize)
+
+    @classmethod
+    def from_env(cls):
+        """Create a new `NDSCache` as configured by the environment
+
+        Returns
+        -------
+        cache : `NDSCache`
+            a new `NDSCache` in the ``GWPY_NDS_CACHE`` directory, or
+            `None` if that variable is not set
+        """
+        directory = os.getenv('GWPY_NDS_CACHE')
+        if not directory:
+            return None
+        maxsize = float(os.getenv('GWPY_NDS_CACHE_SIZE', DEFAULT_CACHE_SIZE))
+        return cls(directory, maxsize=maxsize)
+
+    # -------------------------------------------
+    # internal bookkeeping
+
+    def _keydir(self, name, ctype):
+        return os.path.join(self.directory, _safe(name), _safe(ctype))
+
+    def _entries(self, name, ctype, rate=None):
+        """List the stored intervals for the given channel
+
+        Returns
+        -------
+        entries : `list`
+            list of ``(rate, segment, path)`` tuples, sorted by start
+            time, for the given sample rate, or, if no rate is given, for
+            the only rate stored
+        """
+        keydir = self._keydir(name, ctype)
+        try:
+            files = os.listdir(keydir)
+        except OSError:
+            return []
+        entries = []
+        for f in files:
+            if not f.endswith('.npy'):
+                continue
+            try:
+                r, s, e = map(float, f[:-4].split('_'))
+            except ValueError:
+                continue
+            entries.append((r, Segment(s, e), os.path.join(keydir, f)))
+        if rate is not None:
+            entries = [e for e in entries if e[0] == float(rate)]
+        elif len(set(e[0] for e in entries)) > 1:
+            return []
+        entries.sort(key=lambda e: e[1][0])
+        return entries
+
+    # -------------------------------------------
+    # cache access
+
+    def missing(self, name, ctype, start, end, rate=None):
+        """Find those parts of the given interval not held in the cache
+
+        Parameters
+        ----------
+        name : `str`
+            name of channel
+        ctype : `str`, `int`
+            NDS type of channel
+        start : `float`
+            GPS start time of the interval
+        end : `float`
+            GPS end time of the interval
+        rate : `float`, optional
+            sample rate of channel
+
+        Returns
+        -------
+        segments : :class:`~gwpy.segments.SegmentList`
+            list of sub-intervals of ``[start, end)`` with no cached data
+        """
+        covered = SegmentList([e[1] for e in
+                               self._entries(name, ctype, rate=rate)])
+        return (SegmentList([Segment(start, end)]) -
+                covered.coalesce()).coalesce()
+
+    def store(self, name, ctype, timeseries, evict=True):
+        """Store the data for the given channel in the cache
+
+        Parameters
+        ----------
+        name : `str`
+            name of channel
+        ctype : `str`, `int`
+            NDS type of channel
+        timeseries : `~gwpy.timeseries.TimeSeries`
+            the data to store
+        evict : `bool`, optional, default: `True`
+            remove least-recently used data after storing, if the cache
+            is over size, use `False` when the data are about to be read
+            back with :meth:`get`, and call :meth:`evict` afterwards
+        """
+        keydir = self._keydir(name, ctype)
+        try:
+            os.makedirs(keydir)
+        except OSError:
+            if not os.path.isdir(keydir):
+                raise
+        # record channel metadata
+        metafile = os.path.join(keydir, 'channel.json')
+        if not os.path.isfile(metafile):
+            unit = timeseries.unit
+            with open(metafile, 'w') as f:
+                json.dump({'name': timeseries.name,
+                           'unit': unit and str(unit) or None}, f)
+        # write data to a temporary file and move it into place, so that
+        # other processes never see a partially-written file
+        span = timeseries.span
+        path = os.path.join(keydir, '%r_%r_%r.npy'
+                            % (float(timeseries.sample_rate.value),
+                               float(span[0]), float(span[1])))
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=keydir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                numpy.save(f, numpy.asarray(timeseries.data))
+            os.rename(tmp, path)
+        except:
+            os.remove(tmp)
+            raise
+        if evict:
+            self.evict()
+
+    def pieces(self, name, ctype, start, end, rate=None):
+        """List the stored files holding data for the given interval
+
+        Returns
+        -------
+        paths : `list`
+            list of paths of the files overlapping ``[start, end)``
+        """
+        span = Segment(start, end)
+        return [e[2] for e in self._entries(name, ctype, rate=rate)
+                if e[1].intersects(span)]
+
+    def get(self, name, ctype, start, end, entryclass, rate=None):
+        """Read the data for the given channel from the cache
+
+        The output is aligned to the sample grid of the cached data, so
+        may extend outward from the requested interval by up to one sample
+        at either end.
+
+        Parameters
+        ----------
+        name : `str`
+            name of channel
+        ctype : `str`, `int`
+            NDS type of channel
+        start : `float`
+            GPS start time of the interval
+        end : `float`
+            GPS end time of the interval
+        entryclass : `type`
+            `~gwpy.timeseries.TimeSeries` class to return
+        rate : `float`, optional
+            sample rate of channel
+
+        Returns
+        -------
+        timeseries : ``entryclass``
+            the cached data for the given interval
+
+        Raises
+        ------
+        KeyError
+            if the cached data do not cover the whole of the given
+            interval, including if data were removed while being read
+        """
+        span = Segment(start, end)
+        entries = [e for e in self._entries(name, ctype, rate=rate)
+                   if e[1].intersects(span)]
+        if not entries:
+            raise KeyError("No cached data for %s in [%s, %s)"
+                           % (name, start, end))
+        gaps = SegmentList([span]) - SegmentList(
+            [e[1] for e in entries]).coalesce()
+        if any(abs(seg) * entries[0][0] > 1e-6 for seg in gaps):
+            raise KeyError("Cached data for %s do not cover [%s, %s)"
+                           % (name, start, end))
+        rate = entries[0][0]
+        x0 = entries[0][1][0]
+        # find output span on the sample grid of the cached data
+        t0 = x0 + floor((start - x0) * rate + 1e-6) / rate
+        size = int(ceil((end - t0) * rate - 1e-6))
+        data = None
+        for r, seg, path in entries:
+            try:
+                piece = numpy.load(path, mmap_mode='r')
+            except (IOError, OSError):
+                # removed by another process since being listed
+                raise KeyError("Cached data for %s in [%s, %s) were "
+                               "removed while being read"
+                               % (name, start, end))
+            if data is None:
+                data = numpy.zeros(size, dtype=piece.dtype)
+            offset = int(round((seg[0] - t0) * rate))
+            a = max(0, -offset)
+            b = min(piece.size, size - offset)
+            if b > a:
+                data[offset+a:offset+b] = piece[a:b]
+            # record access for least-recently-used eviction
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+        with open(os.path.join(self._keydir(name, ctype),
+                               'channel.json'), 'r') as f:
+            meta = json.load(f)
+        channel = Channel(meta['name'], sample_rate=rate, unit=meta['unit'],
+                          dtype=data.dtype)
+        return entryclass(data, epoch=t0, channel=channel)
+
+    def evict(self, keep=()):
+        """Remove the least-recently used data from the cache until its
+        total size is no larger than `maxsize`
+
+        Parameters
+        ----------
+        keep : `list`, optional
+            list of paths of files not to remove, e.g. those being read
+            to answer the current request
+        """
+        keep = set(keep)
+        files = []
+        total = 0
+        for root, _, names in os.walk(self.directory):
+            for f in names:
+                if not f.endswith('.npy'):
+                    continue
+                path = os.path.join(root, f)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                total += stat.st_size
+                if path not in keep:
+                    files.append((stat.st_mtime, stat.st_size, path))
+        if total <= self.maxsize:
+            return
+        for mtime, size, path in sorted(files):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.maxsize:
+                break
+
+    def __repr__(self):
+        return '<%s(%r, maxsize=%d)>' % (type(self).__name__, self.directory,
+                                         self.maxsize)
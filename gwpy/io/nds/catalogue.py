@@ -0,0 +1,326 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Local catalogue of the channels available from NDS servers
+
+Listing the channels on an NDS server is slow, so the full channel list
+for each server is downloaded once and stored in an indexed SQLite
+database, with channel name resolution and server routing answered
+from the local copy until it is older than a given time-to-live.
+
+The catalogue is enabled by setting the ``GWPY_NDS_CATALOGUE``
+environment variable to the path of the database file, with the
+time-to-live (in seconds) given by ``GWPY_NDS_CATALOGUE_TTL`` (default:
+one day).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from ... import version
+
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+__version__ = version.version
+
+__all__ = ['ChannelCatalogue']
+
+DEFAULT_TTL = 86400
+
+# catalogues opened by ChannelCatalogue.from_env, keyed by (path, ttl)
+_CATALOGUES = {}
+_CATALOGUES_LOCK = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS servers (
+    host TEXT, port INTEGER, updated REAL, PRIMARY KEY (host, port));
+CREATE TABLE IF NOT EXISTS channels (
+    host TEXT, port INTEGER, name TEXT, type INTEGER, sample_rate REAL,
+    unit TEXT);
+CREATE INDEX IF NOT EXISTS channels_name ON channels (name);
+CREATE INDEX IF NOT EXISTS channels_server ON channels (host, port);
+"""
+
+
+class ChannelCatalogue(object):
+    """Local catalogue of the channels available from NDS servers
+
+    Parameters
+    ----------
+    path : `str`
+        path of SQLite database file in which to store the catalogue
+    ttl : `float`, optional, default: 86400
+        number of seconds after which the channel list for a server is
+        downloaded again
+
+    Methods
+    -------
+    from_env
+    is_stale
+    update
+    refresh
+    find
+    resolve
+    channel
+    hosts
+    """
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        """Open a new `ChannelCatalogue`
+        """
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.ttl = float(ttl)
+        self._local = threading.local()
+        with self._connection() as db:
+            db.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls):
+        """Open the `ChannelCatalogue` configured by the environment
+
+        The catalogue for each file is opened once, and reused by later
+        calls with the same environment.
+
+        Returns
+        -------
+        catalogue : `ChannelCatalogue`
+            the catalogue in the ``GWPY_NDS_CATALOGUE`` file, or `None` if
+            that variable is not set
+        """
+        path = os.getenv('GWPY_NDS_CATALOGUE')
+        if not path:
+            return None
+        ttl = float(os.getenv('GWPY_NDS_CATALOGUE_TTL', DEFAULT_TTL))
+        key = (os.path.abspath(os.path.expanduser(path)), ttl)
+        with _CATALOGUES_LOCK:
+            try:
+                return _CATALOGUES[key]
+            except KeyError:
+                catalogue = _CATALOGUES[key] = cls(path, ttl=ttl)
+                return catalogue
+
+    def _connection(self):
+        """Return this thread's connection to the database
+        """
+        try:
+            return self._local.db
+        except AttributeError:
+            dirname = os.path.dirname(self.path)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            self._local.db = sqlite3.connect(self.path, timeout=60)
+            return self._local.db
+
+    @staticmethod
+    def _type_mask(ctype):
+        """Return the NDS2 channel type bit mask for the given type
+        """
+        if ctype is None:
+            return None
+        try:
+            return int(ctype)
+        except (TypeError, ValueError):
+            from . import NDS2_CHANNEL_TYPE
+            return NDS2_CHANNEL_TYPE.get(str(ctype))
+
+    # -------------------------------------------
+    # catalogue maintenance
+
+    def is_stale(self, host, port):
+        """Determine whether the channel list for the given server needs
+        to be downloaded
+
+        Returns
+        -------
+        stale : `bool`
+            `True` if the server has no channel list in the catalogue, or
+            its list is older than the `ttl`
+        """
+        row = self._connection().execute(
+            'SELECT updated FROM servers WHERE host=? AND port=?',
+            (host, port)).fetchone()
+        return row is None or (time.time() - row[0]) > self.ttl
+
+    def update(self, host, port, connection):
+        """Download the full channel list for the given server
+
+        Parameters
+        ----------
+        host : `str`
+            name of NDS server
+        port : `int`
+            port number for NDS server
+        connection : :class:`nds2.connection`
+            open connection to the server
+        """
+        channels = connection.find_channels('*')
+        rows = ((host, port, c.name, int(c.channel_type),
+                 float(c.sample_rate), c.signal_units or None)
+                for c in channels)
+        with self._connection() as db:
+            db.execute('DELETE FROM channels WHERE host=? AND port=?',
+                       (host, port))
+            db.executemany('INSERT INTO channels VALUES (?, ?, ?, ?, ?, ?)',
+                           rows)
+            db.execute('INSERT OR REPLACE INTO servers VALUES (?, ?, ?)',
+                       (host, port, time.time()))
+
+    def refresh(self, host, port, connection):
+        """Download the channel list for the given server if it is stale
+        """
+        if self.is_stale(host, port):
+            self.update(host, port, connection)
+
+    # -------------------------------------------
+    # catalogue queries
+
+    def find(self, name, host=None, port=None, ctype=None, partial=False):
+        """Find channels with the given name
+
+        Parameters
+        ----------
+        name : `str`
+            name of channel
+        host : `str`, optional
+            name of NDS server, default: all servers
+        port : `int`, optional
+            port number for NDS server
+        ctype : `int`, `str`, optional
+            NDS2 channel type bit mask, or name
+        partial : `bool`, optional, default: `False`
+            match all channels whose names contain the given name
+
+        Returns
+        -------
+        channels : `list`
+            list of ``(host, port, name, type, sample_rate, unit)``
+            tuples for each matching channel
+        """
+        if partial:
+            query = 'SELECT * FROM channels WHERE name GLOB ?'
+            args = ['*%s*' % name]
+        else:
+            query = 'SELECT * FROM channels WHERE name=?'
+            args = [name]
+        if host is not None:
+            query += ' AND host=? AND port=?'
+            args.extend((host, port))
+        mask = self._type_mask(ctype)
+        if mask is not None:
+            query += ' AND (type & ?) != 0'
+            args.append(mask)
+        return self._connection().execute(query, args).fetchall()
+
+    def resolve(self, name, host, port, ctype=None, strict=False):
+        """Resolve the name of a channel against the given server
+
+        This method follows the rules used when resolving names
+        directly against the server: an exact match is returned as is, a
+        unique partial match is returned in full.
+
+        Parameters
+        ----------
+        name : `str`
+            name of channel
+        host : `str`
+            name of NDS server
+        port : `int`
+            port number for NDS server
+        ctype : `int`, `str`, optional
+            NDS2 channel type bit mask, or name
+        strict : `bool`, optional, default: `False`
+            raise an exception if more than one partial match is found,
+            and return the input name if none are found
+
+        Returns
+        -------
+        name : `str`
+            the name of the matching channel on the server, or `None` if
+            no match was found and ``strict`` is `False`
+
+        Raises
+        ------
+        ValueError
+            if ``strict`` is `True` and more than one partial match was
+            found
+        """
+        if self.find(name, host=host, port=port, ctype=ctype):
+            return name
+        matches = sorted(set(row[2] for row in self.find(
+            name, host=host, port=port, ctype=ctype, partial=True)))
+        if len(matches) == 0 and not strict:
+            return None
+        elif len(matches) == 0:
+            return name
+        elif len(matches) == 1:
+            return matches[0]
+        elif strict:
+            raise ValueError("No channel '%s' found on server. However, %d "
+                             "others were found, please restrict your "
+                             "search and try again:\n    %s"
+                             % (name, len(matches), "\n    ".join(matches)))
+        return name
+
+    def channel(self, name, host=None, port=None, ctype=None):
+        """Look up the type, sample rate, and unit of a channel
+
+        Parameters
+        ----------
+        name : `str`
+            name of channel
+        host : `str`, optional
+            name of NDS server, default: all servers
+        port : `int`, optional
+            port number for NDS server
+        ctype : `int`, `str`, optional
+            NDS2 channel type bit mask, or name
+
+        Returns
+        -------
+        channel : `~gwpy.detector.Channel`
+            a new `Channel` with the properties recorded in the catalogue,
+            or `None` if the channel was not found, or the matching
+            entries do not agree on the sample rate; the type is only set
+            if all matching entries agree on it
+        """
+        from ...detector import Channel
+        from . import NDS2_CHANNEL_TYPESTR
+        rows = self.find(name, host=host, port=port, ctype=ctype)
+        if len(set(row[4] for row in rows)) != 1:
+            return None
+        types = set(row[3] for row in rows)
+        if len(types) == 1:
+            ctype = NDS2_CHANNEL_TYPESTR.get(types.pop())
+        else:
+            ctype = None
+        return Channel(name, sample_rate=rows[0][4], unit=rows[0][5],
+                       type=ctype)
+
+    def hosts(self, name, ctype=None):
+        """List the servers known to hold the given channel
+
+        Returns
+        -------
+        hosts : `list`
+            list of ``(host, port)`` pairs
+        """
+        return sorted(set((row[0], row[1]) for row in
+                          self.find(name, ctype=ctype)))
+
+    def __repr__(self):
+        return '<%s(%r, ttl=%r)>' % (type(self).__name__, self.path,
+                                     self.ttl)
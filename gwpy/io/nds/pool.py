@@ -0,0 +1,345 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Pool of open NDS2 connections, reused across requests
+
+Opening a connection to an NDS2 server, including SASL authentication,
+can take much longer than the data request itself, so connections are
+returned to the `NDSConnectionPool` after use, and handed out again for
+later requests to the same server.
+"""
+
+from __future__ import print_function
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+try:
+    from collections import OrderedDict
+except ImportError:
+    from astropy.utils import OrderedDict
+
+import nds2
+
+from ... import version
+from .kerberos import kinit
+
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+__version__ = version.version
+
+__all__ = ['NDSConnectionPool', 'CONNECTION_POOL', 'connect']
+
+_INF = float('inf')
+
+# channel name used to check that a connection is still open, the query
+# needs a reply from the server, but is not expected to match anything
+_CHECK_CHANNEL = 'GWPY-CONNECTION-CHECK'
+
+
+def connect(host, port=None, outputcontext=None, verbose=False):
+    """Open a new connection to the given NDS server
+
+    If the server requests SASL authentication, a kerberos ticket is
+    generated via :func:`~gwpy.io.nds.kerberos.kinit`, and the
+    connection attempted once more.
+
+    Parameters
+    ----------
+    host : `str`
+        name of NDS server
+    port : `int`, optional
+        port number for NDS server
+    outputcontext : `NDSOutputContext`, optional
+        context in which to redirect output from the NDS client
+    verbose : `bool`, optional
+        print verbose output
+
+    Returns
+    -------
+    connection : :class:`nds2.connection`
+        a new open connection
+    """
+    if outputcontext is None:
+        from . import NDSOutputContext
+        outputcontext = NDSOutputContext()
+    if verbose:
+        print("Connecting to %s:%s" % (host, port))
+    try:
+        with outputcontext:
+            return nds2.connection(host, port)
+    except RuntimeError as e:
+        if str(e).startswith('Request SASL authentication'):
+            print('\nError authenticating against %s' % host,
+                  file=sys.stderr)
+            kinit()
+            with outputcontext:
+                return nds2.connection(host, port)
+        raise
+
+
+def _close(connection):
+    """Close the given connection, ignoring any errors
+    """
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def _healthy(connection):
+    """Determine whether the given connection is still usable
+
+    A short query is sent to the server, so that a connection dropped by
+    the server, or left mid-transfer, is not reused.
+    """
+    try:
+        connection.find_channels(_CHECK_CHANNEL)
+    except Exception:
+        return False
+    return True
+
+
+class _ChannelRecord(OrderedDict):
+    """Record of resolved channel names, holding at most ``maxsize``
+    entries, with the least recently added discarded first
+    """
+    def __init__(self, maxsize):
+        OrderedDict.__init__(self)
+        self.maxsize = int(maxsize)
+
+    def __setitem__(self, key, value):
+        if key in self:
+            del self[key]
+        OrderedDict.__setitem__(self, key, value)
+        while len(self) > self.maxsize:
+            try:
+                self.popitem(last=False)
+            except KeyError:  # emptied by another thread
+                break
+
+
+class NDSConnectionPool(object):
+    """Pool of open NDS2 connections, keyed by (host, port)
+
+    Parameters
+    ----------
+    maxconnections : `int`, optional, default: 4
+        maximum number of connections open to a single server at once,
+        requests for more connections block until one is released
+    maxidle : `float`, optional, default: 300
+        maximum number of seconds for which an unused connection is kept,
+        after which it is closed rather than reused
+    maxchannels : `int`, optional, default: 10000
+        maximum number of resolved channel names to keep, the oldest are
+        forgotten first
+
+    Attributes
+    ----------
+    channels : `dict`
+        record of channel names resolved against each server, keyed by
+        ``(host, port, name, type)``, holding at most ``maxchannels``
+        entries
+    latency : `dict`
+        running average of the time (seconds) taken to connect to, and
+        resolve channels against, each server, keyed by ``(host, port)``
+
+    Methods
+    -------
+    acquire
+    release
+    connection
+    record_latency
+    rank
+    clear
+    """
+    def __init__(self, maxconnections=4, maxidle=300, maxchannels=10000):
+        """Create a new `NDSConnectionPool`
+        """
+        self.maxconnections = int(maxconnections)
+        self.maxidle = float(maxidle)
+        self.maxchannels = int(maxchannels)
+        self.channels = _ChannelRecord(self.maxchannels)
+        self.latency = {}
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._limits = {}
+
+    def _limit(self, key):
+        with self._lock:
+            try:
+                return self._limits[key]
+            except KeyError:
+                limit = threading.BoundedSemaphore(self.maxconnections)
+                self._limits[key] = limit
+                return limit
+
+    def acquire(self, host, port=None, outputcontext=None, verbose=False):
+        """Take a connection to the given server from this pool
+
+        An idle connection is reused if one is available, and passes a
+        health check, otherwise a new connection is opened. The
+        connection must be returned via :meth:`release`.
+
+        Parameters
+        ----------
+        host : `str`
+            name of NDS server
+        port : `int`, optional
+            port number for NDS server
+        outputcontext : `NDSOutputContext`, optional
+            context in which to redirect output from the NDS client
+        verbose : `bool`, optional
+            print verbose output
+
+        Returns
+        -------
+        connection : :class:`nds2.connection`
+            an open connection
+        """
+        key = (host, port)
+        limit = self._limit(key)
+        limit.acquire()
+        try:
+            while True:
+                with self._lock:
+                    try:
+                        conn, released = self._idle[key].pop()
+                    except (KeyError, IndexError):
+                        break
+                if (time.time() - released) < self.maxidle and \
+                        _healthy(conn):
+                    return conn
+                _close(conn)
+            return connect(host, port, outputcontext=outputcontext,
+                           verbose=verbose)
+        except:
+            limit.release()
+            raise
+
+    def release(self, host, port, connection, discard=False):
+        """Return a connection to this pool
+
+        Parameters
+        ----------
+        host : `str`
+            name of NDS server
+        port : `int`
+            port number for NDS server
+        connection : :class:`nds2.connection`
+            connection, as returned by :meth:`acquire`
+        discard : `bool`, optional, default: `False`
+            close the connection rather than keep it for reuse, e.g.
+            after an error
+        """
+        key = (host, port)
+        if discard:
+            _close(connection)
+        else:
+            with self._lock:
+                self._idle.setdefault(key, []).append((connection,
+                                                       time.time()))
+        self._limit(key).release()
+
+    @contextmanager
+    def connection(self, host, port=None, outputcontext=None,
+                   verbose=False):
+        """Context manager to take a connection from this pool, returning
+        it on exit, or discarding it if the NDS client raised an error
+
+        Only a `RuntimeError` or `IOError`, as raised by `nds2`, causes the
+        connection to be discarded, any other exception leaves it usable,
+        so it is returned to the pool before the exception propagates.
+
+        Examples
+        --------
+        >>> with CONNECTION_POOL.connection('nds.ligo.caltech.edu',
+        ...                                 31200) as conn:
+        ...     buffers = conn.fetch(start, end, channels)
+        """
+        conn = self.acquire(host, port, outputcontext=outputcontext,
+                            verbose=verbose)
+        discard = False
+        try:
+            yield conn
+        except (RuntimeError, IOError):
+            discard = True
+            raise
+        finally:
+            self.release(host, port, conn, discard=discard)
+
+    def record_latency(self, host, port, seconds):
+        """Record the time taken by a request to the given server
+
+        Parameters
+        ----------
+        host : `str`
+            name of NDS server
+        port : `int`
+            port number for NDS server
+        seconds : `float`
+            time taken by the request, or `None` if the request failed,
+            in which case the server is ranked behind all those that have
+            responded until it responds again
+        """
+        key = (host, port)
+        with self._lock:
+            old = self.latency.get(key, _INF)
+            if seconds is None:
+                self.latency[key] = _INF
+            elif old == _INF:
+                self.latency[key] = float(seconds)
+            else:
+                self.latency[key] = (old + seconds) / 2.
+
+    def rank(self, hostlist):
+        """Sort a list of servers by their recorded latency
+
+        Servers that have not yet been used, or whose last request
+        failed, are placed after all others, in the order given.
+
+        Parameters
+        ----------
+        hostlist : `list`
+            list of ``(host, port)`` pairs
+
+        Returns
+        -------
+        hostlist : `list`
+            a new list of ``(host, port)`` pairs, fastest first
+        """
+        return sorted(hostlist, key=lambda hp: self.latency.get(hp, _INF))
+
+    def clear(self):
+        """Close all idle connections, and forget all resolved channels
+        and recorded latencies
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+            self.channels = _ChannelRecord(self.maxchannels)
+            self.latency = {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                _close(conn)
+
+    def __repr__(self):
+        return ('<%s(maxconnections=%d, maxidle=%r)>'
+                % (type(self).__name__, self.maxconnections, self.maxidle))
+
+
+#: Default pool used by :meth:`~gwpy.timeseries.TimeSeries.fetch`
+CONNECTION_POOL = NDSConnectionPool()
@@ -125,10 +125,12 @@ def wiener(params, target_channel, segment):
             continue
 
         residual, FF = subtractFF(W,XCut,yCut,samplef)
-       
-        yCut = np.fft.ifft(yCut.data[0]).real
-        residual = np.fft.ifft(residual).real
-        FF = np.fft.ifft(FF).real
+
+        # fftgram rows hold the one-sided (rfft) transform of each segment
+        fftlength = int(round(params["fftDuration"] * samplef))
+        yCut = np.fft.irfft(yCut.data[0], n=fftlength)
+        residual = np.fft.irfft(residual, n=fftlength)
+        FF = np.fft.irfft(FF, n=fftlength)
 
         thisGPSStart = gpss[i]
         dataOriginal = gwpy.timeseries.TimeSeries(yCut, epoch=thisGPSStart, sample_rate=samplef,name="Original")
@@ -242,9 +244,10 @@ def miso_firwiener_fft(N,X,y):
 
     freqs = np.array(y.frequencies)
 
-    R = np.zeros([M,M,len(freqs)])
-    P = np.zeros([M,len(freqs)])
-    W = np.zeros([M,len(freqs)])
+    # one filter coefficient for each one-sided frequency bin
+    R = np.zeros([M,M,len(freqs)], dtype=complex)
+    P = np.zeros([M,len(freqs)], dtype=complex)
+    W = np.zeros([M,len(freqs)], dtype=complex)
 
     for i in xrange(len(freqs)):
         yCut = y.data[:,i]
@@ -300,7 +303,8 @@ def subtractFF(W,SS,S,samplef):
         Xtemp = []
         for x in SS:
             Xtemp.append(x.data[0,i])
-        FF.append(np.sum(Wtemp*Xtemp))
+        # W solves R W = P, with R and P conjugated, see miso_firwiener_fft
+        FF.append(np.sum(np.conjugate(Wtemp)*np.array(Xtemp)))
 
     residual = S.data[0] - np.array(FF)
 
@@ -23,7 +23,9 @@ import scipy
 from astropy import units
 
 from ..data import Array2D
+from ..time import Time
 from ..timeseries import (TimeSeries, TimeSeriesList)
+from ..timeseries.core import _sample_index
 from ..spectrum import Spectrum
 
 from .. import version
@@ -167,6 +169,45 @@ class Spectrogram(Array2D):
                               f0=self.f0, name=self.name, dt=self.dt,
                               df=self.df, logf=self.logf)
 
+    def crop(self, gpsstart, gpsend):
+        """Crop this `Spectrogram` to the given GPS ``[start, end)``
+        `Segment`.
+
+        Parameters
+        ----------
+        gpsstart : `Time`, `float`
+            GPS start time to crop `Spectrogram` at left
+        gpsend : `Time`, `float`
+            GPS end time to crop `Spectrogram` at right
+
+        Returns
+        -------
+        spectrogram : `Spectrogram`
+            A new `Spectrogram` with the same metadata but different GPS
+            span
+
+        Notes
+        -----
+        Limits outside of the original `Spectrogram` span are restricted
+        to the :attr:`Spectrogram.span`.
+
+        The returned `Spectrogram` is a view of the original data, so no
+        data are copied, or read from disk for a memory-mapped
+        `Spectrogram`.
+        """
+        if isinstance(gpsstart, Time):
+            gpsstart = gpsstart.gps
+        if isinstance(gpsend, Time):
+            gpsend = gpsend.gps
+        span = self.span
+        gpsstart = max(gpsstart, span[0])
+        gpsend = min(gpsend, span[1])
+        x0 = self.x0.value
+        dx = self.dx.value
+        idx0 = _sample_index(gpsstart, x0, dx)
+        idx1 = max(idx0, _sample_index(gpsend, x0, dx))
+        return self[idx0:idx1]
+
     def plot(self, **kwargs):
         """Plot the data for this `Spectrogram`
         """
@@ -191,7 +232,7 @@ class Spectrogram(Array2D):
                                                       self.data[i, -logf.size:],
                                                       axis=0)
             new.data[i, :] = interpolator(logf)
-        new.metadata = self.metadata.copy()
+        new._metadata = self._metadata.copy()
         new.f0 = logf[0]
         new.df = logf[1] - logf[0]
         new.logf = True
@@ -25,3 +25,4 @@ __version__ = version.version
 from .core import *
 from .hist import *
 from ..io.spectrum import *
+from ..io.hdf5.spectrum import *
@@ -26,6 +26,7 @@ from ..data import Series
 from ..detector import Channel
 from ..time import Time
 from ..timeseries import TimeSeries
+from ..timeseries.core import _shares_buffer
 
 from ..version import version as __version__
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org"
@@ -229,8 +230,21 @@ class Spectrum(Series):
             return self.filterba(lti.num, lti.den, inplace=inplace)
 
     @classmethod
-    def from_lal(cls, lalfs):
+    def from_lal(cls, lalfs, copy=False):
         """Generate a new `Spectrum` from a LAL `FrequencySeries` of any type
+
+        Parameters
+        ----------
+        lalfs : :lalsuite:`XLALREAL8FrequencySeries`
+            input LAL FrequencySeries of any type
+        copy : `bool`, optional, default: `False`
+            copy the data into new memory, otherwise the new `Spectrum`
+            shares the memory of the LAL FrequencySeries
+
+        Returns
+        -------
+        spectrum : `Spectrum`
+            a new `Spectrum` with the data and metadata of the input
         """
         try:
             from lal import UnitToString
@@ -239,15 +253,28 @@ class Spectrum(Series):
                               "www.lsc-group.phys.uwm.edu/daswg/"
                               "projects/lalsuite.html for installation "
                               "instructions")
+        data = lalfs.data.data
         channel = Channel(lalfs.name,
                           unit=UnitToString(lalfs.sampleUnits),
-                          dtype=lalfs.data.data.dtype)
-        return cls(lalfs.data.data, channel=channel, f0=lalfs.f0,
-                   df=lalfs.deltaF, epoch=lalfs.epoch)
+                          dtype=data.dtype)
+        new = cls(data, channel=channel, f0=lalfs.f0, df=lalfs.deltaF,
+                  epoch=lalfs.epoch, copy=copy)
+        if not copy:
+            # record the source so that to_lal can return it without copying
+            new._lal = lalfs
+        return new
 
-    def to_lal(self):
+    def to_lal(self, copy=False):
         """Convert this `Spectrum` into a LAL FrequencySeries
 
+        Parameters
+        ----------
+        copy : `bool`, optional, default: `False`
+            always copy the data into a new LAL FrequencySeries, otherwise,
+            if this `Spectrum` is a complete view of the LAL FrequencySeries
+            it was created from via :meth:`Spectrum.from_lal`, that
+            LAL FrequencySeries is returned with its metadata updated
+
         Returns
         -------
         FrequencySeries
@@ -268,11 +295,19 @@ class Spectrum(Series):
                               "instructions")
         else:
             from lal import utils as lalutils
+        lalfs = getattr(self, '_lal', None)
+        if (not copy and lalfs is not None and
+                _shares_buffer(self.data, lalfs.data.data)):
+            lalfs.name = str(self.name)
+            lalfs.epoch = lal.LIGOTimeGPS(self.epoch.gps)
+            lalfs.f0 = float(self.f0.value)
+            lalfs.deltaF = float(self.df.value)
+            return lalfs
         laltype = lalutils.LAL_TYPE_FROM_NUMPY[self.dtype.type]
         typestr = lalutils.LAL_TYPE_STR[laltype]
         create = getattr(lal, 'Create%sFrequencySeries' % typestr.upper())
         lalfs = create(self.name, lal.LIGOTimeGPS(self.epoch.gps),
-                       float(self.f0), float(self.dt),
+                       float(self.f0.value), float(self.df.value),
                        lal.lalDimensionlessUnit, self.size)
         lalfs.data.data = self.data
         return lalfs
@@ -0,0 +1,432 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Multi-channel cross-spectral density estimation
+
+The :func:`csd_matrix` function calculates the Welch-averaged
+cross-spectral density between every pair of a set of channels,
+transforming each segment of each channel only once. The
+`CrossSpectralMatrix` it returns provides the power spectral density,
+cross-spectral density, coherence and transfer function for any pair of
+channels as `Spectrum` objects.
+
+The :func:`coherence_spectrogram` function calculates the time-resolved
+coherence between two channels from a single batched FFT of each.
+"""
+
+import numpy
+
+from astropy import units
+
+from .core import Spectrum
+from .psd import (_MAX_BATCH_SIZE, _to_value, _gcd, _get_window_data,
+                  _segment_view)
+from ..spectrogram import Spectrogram
+
+from .. import version
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+__version__ = version.version
+
+__all__ = ['CrossSpectralMatrix', 'csd_matrix', 'coherence_spectrogram']
+
+
+class CrossSpectralMatrix(object):
+    """Cross-spectral density between each pair of a set of channels
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`
+        3-D ``(nfreqs, nchannels, nchannels)`` complex array, where
+        ``data[:, i, j]`` is the average of ``conj(X_i) * X_j`` for the
+        Fourier transforms ``X`` of the data for each channel
+    names : `list`
+        list of names for each channel
+    f0 : `float`
+        frequency of the first bin
+    df : `float`
+        frequency spacing of the bins
+    epoch : `float` GPS time, or :class:`~gwpy.time.Time`, optional
+        start time of the input data
+    units : `list`, optional
+        list of units of the input data for each channel
+    channels : `list`, optional
+        list of :class:`~gwpy.detector.Channel` for each channel
+
+    Attributes
+    ----------
+    data
+    names
+    frequencies
+
+    Methods
+    -------
+    psd
+    csd
+    coherence
+    transfer_function
+    coherence_matrix
+    """
+    def __init__(self, data, names, f0, df, epoch=None, units=None,
+                 channels=None):
+        """Create a new `CrossSpectralMatrix`
+        """
+        self.data = numpy.asarray(data)
+        if (self.data.ndim != 3 or
+                not self.data.shape[1] == self.data.shape[2] == len(names)):
+            raise ValueError("Cross-spectral matrix data must have shape "
+                             "(nfreqs, nchannels, nchannels)")
+        self.names = list(names)
+        self.f0 = float(f0)
+        self.df = float(df)
+        self.epoch = epoch
+        self.units = units is None and [None] * len(names) or list(units)
+        self.channels = (channels is None and [None] * len(names) or
+                         list(channels))
+
+    @property
+    def frequencies(self):
+        """Array of frequencies for each bin of this `CrossSpectralMatrix`
+        """
+        return self.f0 + numpy.arange(self.data.shape[0]) * self.df
+
+    def __len__(self):
+        return len(self.names)
+
+    def _index(self, key):
+        """Return the matrix index of the given channel name or index
+        """
+        if isinstance(key, (int, numpy.integer)):
+            return int(key)
+        try:
+            return self.names.index(key)
+        except ValueError:
+            raise KeyError("No channel named %r in this %s"
+                           % (key, type(self).__name__))
+
+    def _unit(self, i):
+        return self.units[i] or units.dimensionless_unscaled
+
+    def _spectrum(self, data, name, channel=None, unit=None):
+        return Spectrum(data, name=name, epoch=self.epoch, channel=channel,
+                        f0=self.f0, df=self.df, unit=unit)
+
+    def __getitem__(self, item):
+        a, b = item
+        return self.csd(a, b)
+
+    def psd(self, a):
+        """Return the power spectral density of the given channel
+
+        Parameters
+        ----------
+        a : `str`, `int`
+            name, or index, of the channel
+
+        Returns
+        -------
+        Spectrum
+            the power spectral density of the given channel
+        """
+        i = self._index(a)
+        return self._spectrum(self.data[:, i, i].real, self.names[i],
+                              channel=self.channels[i],
+                              unit=self._unit(i) ** 2 / units.Hertz)
+
+    def csd(self, a, b):
+        """Return the cross-spectral density between two channels
+
+        Parameters
+        ----------
+        a : `str`, `int`
+            name, or index, of the first channel
+        b : `str`, `int`
+            name, or index, of the second channel
+
+        Returns
+        -------
+        Spectrum
+            the complex cross-spectral density ``<conj(A) * B>``
+        """
+        i = self._index(a)
+        j = self._index(b)
+        return self._spectrum(self.data[:, i, j],
+                              'CSD between %s and %s'
+                              % (self.names[i], self.names[j]),
+                              unit=(self._unit(i) * self._unit(j) /
+                                    units.Hertz))
+
+    def coherence(self, a, b):
+        """Return the magnitude-squared coherence between two channels
+
+        Parameters
+        ----------
+        a : `str`, `int`
+            name, or index, of the first channel
+        b : `str`, `int`
+            name, or index, of the second channel
+
+        Returns
+        -------
+        Spectrum
+            the coherence `Spectrum` between the given channels
+        """
+        i = self._index(a)
+        j = self._index(b)
+        coh = (numpy.absolute(self.data[:, i, j]) ** 2 /
+               (self.data[:, i, i].real * self.data[:, j, j].real))
+        return self._spectrum(coh, 'Coherence between %s and %s'
+                                   % (self.names[i], self.names[j]),
+                              unit=units.dimensionless_unscaled)
+
+    def transfer_function(self, a, b):
+        """Return the transfer function from one channel to another
+
+        The transfer function is estimated as the ratio of the
+        cross-spectral density to the power spectral density of the
+        input channel, ``<conj(A) * B> / <conj(A) * A>``.
+
+        Parameters
+        ----------
+        a : `str`, `int`
+            name, or index, of the input channel
+        b : `str`, `int`
+            name, or index, of the output channel
+
+        Returns
+        -------
+        Spectrum
+            the complex transfer function from ``a`` to ``b``
+        """
+        i = self._index(a)
+        j = self._index(b)
+        tf = self.data[:, i, j] / self.data[:, i, i].real
+        return self._spectrum(tf, 'Transfer function from %s to %s'
+                                  % (self.names[i], self.names[j]),
+                              unit=self._unit(j) / self._unit(i))
+
+    def coherence_matrix(self):
+        """Return the magnitude-squared coherence between all pairs of
+        channels
+
+        Returns
+        -------
+        coherence : `numpy.ndarray`
+            3-D ``(nfreqs, nchannels, nchannels)`` array of coherence
+            values
+        """
+        power = numpy.diagonal(self.data, axis1=1, axis2=2).real
+        return (numpy.absolute(self.data) ** 2 /
+                (power[:, :, None] * power[:, None, :]))
+
+    def __repr__(self):
+        return ('<%s(%d channels, %d frequencies, df=%r)>'
+                % (type(self).__name__, len(self), self.data.shape[0],
+                   self.df))
+
+
+def csd_matrix(timeseries, segmentlength, overlap, window=None):
+    """Calculate the Welch-average cross-spectral density matrix for a
+    set of `TimeSeries`
+
+    Each segment of each input is windowed and transformed exactly
+    once, with the cross-spectral density between every pair of inputs
+    accumulated from the same set of Fourier transforms. The
+    normalisation matches that of the :func:`~gwpy.spectrum.psd.psd`
+    routines.
+
+    Parameters
+    ----------
+    timeseries : `list`, `dict`
+        list of `TimeSeries`, or `dict` of (name, `TimeSeries`) pairs,
+        all with the same sample rate and number of samples
+    segmentlength : `int`
+        number of samples in single average
+    overlap : `int`
+        number of samples between averages
+    window : `timeseries.Window`, `str`, optional, default: 'hanning'
+        window function to apply to timeseries prior to FFT
+
+    Returns
+    -------
+    CrossSpectralMatrix
+        the cross-spectral density between each pair of inputs
+
+    Raises
+    ------
+    ValueError
+        if the inputs do not share a start time, sample rate, and number
+        of samples, or do not each have a unique name
+    """
+    if isinstance(timeseries, dict):
+        names = list(timeseries.keys())
+        series = [timeseries[key] for key in names]
+    else:
+        series = list(timeseries)
+        names = [ts.name for ts in series]
+    if not series:
+        raise ValueError("Cannot calculate cross-spectral density matrix "
+                         "for empty input")
+    # channels are resolved by name, so each must be unique
+    if any(name is None for name in names):
+        raise ValueError("Cannot calculate cross-spectral density matrix "
+                         "for TimeSeries without a name")
+    if len(set(names)) != len(names):
+        raise ValueError("Cannot calculate cross-spectral density matrix "
+                         "for TimeSeries with duplicate names")
+    first = series[0]
+    sampling = first.sample_rate.value
+    epoch = first.x0.value
+    for ts in series[1:]:
+        if ts.x0.value != epoch:
+            raise ValueError("Cannot calculate cross-spectral density "
+                             "matrix for TimeSeries with different start "
+                             "times, please crop first")
+        if ts.sample_rate.value != sampling:
+            raise ValueError("Cannot calculate cross-spectral density "
+                             "matrix for TimeSeries with different sample "
+                             "rates, please resample first")
+        if ts.size != first.size:
+            raise ValueError("Cannot calculate cross-spectral density "
+                             "matrix for TimeSeries of different lengths")
+    segmentlength = int(_to_value(segmentlength))
+    overlap = int(_to_value(overlap))
+    window = _get_window_data(window, segmentlength)
+    segments = [_segment_view(ts.data, segmentlength, overlap)
+                for ts in series]
+    nchan = len(series)
+    nsegs = segments[0].shape[0]
+    if not nsegs:
+        raise ValueError("Cannot calculate cross-spectral density with FFT "
+                         "length longer than the input data")
+    nfreqs = segmentlength // 2 + 1
+
+    # accumulate cross-spectra in blocks of segments
+    out = numpy.zeros((nfreqs, nchan, nchan), dtype=numpy.complex128)
+    nblock = max(1, _MAX_BATCH_SIZE // (nchan * segmentlength))
+    for i in range(0, nsegs, nblock):
+        fft = numpy.array([numpy.fft.rfft(seg[i:i+nblock] * window, axis=-1)
+                           for seg in segments])
+        out += numpy.einsum('isf,jsf->fij', fft.conj(), fft)
+
+    # normalise as a one-sided density
+    out *= 2 / (nsegs * sampling * (window ** 2).sum())
+    out[0] /= 2.
+    if not segmentlength % 2:
+        out[-1] /= 2.
+    return CrossSpectralMatrix(out, names, 0, sampling / segmentlength,
+                               epoch=first.epoch,
+                               units=[ts.unit for ts in series],
+                               channels=[ts.channel for ts in series])
+
+
+def coherence_spectrogram(timeseries, other, stride, segmentlength, overlap,
+                          window=None):
+    """Calculate the coherence spectrogram between two `TimeSeries`
+
+    Every FFT segment for every column of the output is built as a
+    strided view of each input, windowed and transformed in a single
+    batched FFT, then the cross- and power-spectral densities are
+    averaged over the segments in each column.
+
+    Parameters
+    ----------
+    timeseries : `TimeSeries`
+        first input `TimeSeries`
+    other : `TimeSeries`
+        second input `TimeSeries`, with the same start time, sample rate
+        and number of samples as the first
+    stride : `int`
+        number of samples in single column of the output `Spectrogram`
+    segmentlength : `int`
+        number of samples in single average
+    overlap : `int`
+        number of samples between averages
+    window : `timeseries.Window`, `str`, optional, default: 'hanning'
+        window function to apply to timeseries prior to FFT
+
+    Returns
+    -------
+    Spectrogram
+        time-frequency `Spectrogram` of the magnitude-squared coherence
+        between the inputs
+
+    Raises
+    ------
+    ValueError
+        if the inputs do not share a start time, sample rate and number
+        of samples, or if fewer than two FFT segments fit in each column, for which
+        the coherence is identically one
+    """
+    if timeseries.x0.value != other.x0.value:
+        raise ValueError("Cannot calculate coherence spectrogram for "
+                         "TimeSeries with different start times, please "
+                         "crop first")
+    if timeseries.sample_rate.value != other.sample_rate.value:
+        raise ValueError("Cannot calculate coherence spectrogram for "
+                         "TimeSeries with different sample rates, please "
+                         "resample first")
+    if timeseries.size != other.size:
+        raise ValueError("Cannot calculate coherence spectrogram for "
+                         "TimeSeries of different lengths")
+    stride = int(_to_value(stride))
+    segmentlength = int(_to_value(segmentlength))
+    overlap = int(_to_value(overlap))
+    if segmentlength > stride:
+        raise ValueError("Cannot calculate Spectrogram with FFT length "
+                         "longer than the stride")
+    nsegs = 1 + (stride - segmentlength) // overlap
+    if nsegs < 2:
+        raise ValueError("Cannot calculate coherence from a single FFT "
+                         "per column, please choose an FFT length and "
+                         "stride that give at least two FFTs per column")
+    sampling = timeseries.sample_rate.value
+    window = _get_window_data(window, segmentlength)
+
+    # get output dimensions
+    nsteps = timeseries.size // stride
+    nfreqs = segmentlength // 2 + 1
+    out = Spectrogram(numpy.zeros((nsteps, nfreqs)),
+                      name='Coherence between %s and %s'
+                           % (timeseries.name, other.name),
+                      epoch=timeseries.epoch, f0=0,
+                      df=sampling / segmentlength, dt=stride / sampling,
+                      copy=True)
+    out.unit = units.dimensionless_unscaled
+    if not nsteps:
+        return out
+
+    # find the start index of each FFT segment, relative to a strided view
+    # of the data whose step is the highest common factor of both strides
+    step = _gcd(stride, overlap)
+    segments = [_segment_view(ts.data[:nsteps*stride], segmentlength, step)
+                for ts in (timeseries, other)]
+    offsets = (numpy.arange(nsteps)[:, None] * (stride // step) +
+               numpy.arange(nsegs)[None, :] * (overlap // step))
+
+    # process blocks of columns to bound the memory footprint of the FFT,
+    # the normalisation of each density cancels in the coherence
+    nblock = max(1, _MAX_BATCH_SIZE // (2 * nsegs * segmentlength))
+    for i in range(0, nsteps, nblock):
+        rows = offsets[i:i+nblock].ravel()
+        shape = offsets[i:i+nblock].shape + (nfreqs,)
+        fft1 = numpy.fft.rfft(segments[0][rows] * window, axis=-1)
+        fft2 = numpy.fft.rfft(segments[1][rows] * window, axis=-1)
+        csd = (fft1.conj() * fft2).reshape(shape).mean(axis=1)
+        power1 = (numpy.absolute(fft1) ** 2).reshape(shape).mean(axis=1)
+        power2 = (numpy.absolute(fft2) ** 2).reshape(shape).mean(axis=1)
+        out.data[i:i+nblock] = numpy.absolute(csd) ** 2 / (power1 * power2)
+    return out
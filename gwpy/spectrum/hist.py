@@ -29,6 +29,7 @@ __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
 from ..data import (Array, Array2D)
 from .core import Spectrum
+from .psd import _MAX_BATCH_SIZE
 from ..spectrogram import Spectrogram
 
 __all__ = ['SpectralVariance']
@@ -72,7 +73,7 @@ class SpectralVariance(Array2D):
 
     @property
     def bins(self):
-        return self.metadata['bins']
+        return self._metadata['bins']
 
     @bins.setter
     def bins(self, bins):
@@ -83,7 +84,7 @@ class SpectralVariance(Array2D):
                ("SpectralVariance.bins must be given as a list of bin edges, "
                 "including the rightmost edge, and have length 1 greater than "
                 "the y-axis of the SpectralVariance data")
-        self.metadata['bins'] = bins
+        self._mutable_metadata()['bins'] = bins
 
     # over-write yindex to communicate with bins
     @property
@@ -180,35 +181,37 @@ class SpectralVariance(Array2D):
         assert not (norm and density),\
                "Cannot give both norm=True and density=True, please pick one"
 
-        # get data and bins
+        # get bins, reading each input in blocks of rows so that
+        # memory-mapped data are streamed from disk
         spectrogram = spectrograms[0]
-        data = numpy.vstack(s.data for s in spectrograms)
-        ubins = (bins is not None)
         if bins is None:
-            if low is None and log:
-                low = numpy.log10(data.min() / 2)
-            elif low is None:
-                low = data.min()/2
-            elif log:
-                low = numpy.log10(low)
-            if high is None and log:
-                high = numpy.log10(data.max() * 2)
-            elif high is None:
-                high = data.max() * 2
-            elif log:
-                high = numpy.log10(high)
+            if low is None:
+                low = min(s.data.min() for s in spectrograms) / 2
+            if high is None:
+                high = max(s.data.max() for s in spectrograms) * 2
             if log:
-                bins = numpy.logspace(low, high, num=nbins+1)
+                bins = numpy.logspace(numpy.log10(low), numpy.log10(high),
+                                      num=nbins+1)
             else:
                 bins = numpy.linspace(low, high, num=nbins+1)
+        bins = numpy.asarray(bins)
         nbins = bins.size-1
 
-        # loop over frequencies
-        out = numpy.zeros((data.shape[1], nbins))
-        for i in range(data.shape[1]):
-            out[i,:], bins = numpy.histogram(data[:,i], bins, density=density)
-            if norm and out[i,:].sum():
-                out[i,:] /= out[i,:].sum()
+        # count samples in each bin for all frequencies at once
+        nfreqs = spectrogram.shape[1]
+        out = numpy.zeros((nfreqs, nbins))
+        nrows = max(1, _MAX_BATCH_SIZE // nfreqs)
+        for s in spectrograms:
+            for i in range(0, s.shape[0], nrows):
+                out += _histogram_rows(s.data[i:i+nrows], bins)
+        if density:
+            total = out.sum(axis=1)[:, None]
+            total[total == 0] = 1
+            out /= total * numpy.diff(bins)[None, :]
+        elif norm:
+            total = out.sum(axis=1)[:, None]
+            total[total == 0] = 1
+            out /= total
 
         # return SpectralVariance
         name = '%s variance' % spectrogram.name
@@ -254,3 +257,33 @@ class SpectralVariance(Array2D):
         name = '%s %s%% percentile' % (self.name, percentile)
         return Spectrum(out, epoch=self.epoch, frequencies=self.frequencies,
                         channel=self.channel, name=name, logf=self.logx)
+
+
+def _histogram_rows(data, bins):
+    """Count the samples in each bin for each column of a 2-D array
+
+    Samples are binned as by :func:`numpy.histogram`, with each bin
+    closed on the left, except the last, which is closed at both ends,
+    and samples outside of the bins ignored.
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`
+        2-D ``(nrows, ncolumns)`` array of data
+    bins : `numpy.ndarray`
+        monotonically increasing array of bin edges
+
+    Returns
+    -------
+    counts : `numpy.ndarray`
+        2-D ``(ncolumns, nbins)`` array of counts
+    """
+    data = numpy.asarray(data)
+    ncols = data.shape[1]
+    nbins = bins.size - 1
+    idx = numpy.searchsorted(bins, data, side='right') - 1
+    idx[data == bins[-1]] = nbins - 1
+    valid = (idx >= 0) & (idx < nbins)
+    idx += numpy.arange(ncols)[None, :] * nbins
+    counts = numpy.bincount(idx[valid], minlength=ncols * nbins)
+    return counts.reshape(ncols, nbins).astype(float)
@@ -26,10 +26,15 @@ Average-spectrum calculation routines are available for the following methods
 
 Each of these methods utilises an existing method provided by the
 LIGO Algorithm Library, wrapped into python as part of the `lal.spectrum`
-module.
+module, if available, otherwise a native `numpy` implementation,
+:func:`numpy_psd`, is used.
+
+The :func:`spectrogram` function computes a time-series of average
+spectra using a batched FFT engine implemented directly in `numpy`.
 """
 
 import numpy
+from numpy.lib import stride_tricks
 from matplotlib import mlab
 from scipy import signal
 
@@ -38,12 +43,14 @@ from astropy import units
 from .core import Spectrum
 from ..timeseries import window as tdwindow
 from ..spectrogram import Spectrogram
+from ..window import get_window
 
 from .. import version
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 __version__ = version.version
 
-__all__ = ['bartlett', 'welch', 'median_mean', 'median', 'spectrogram']
+__all__ = ['bartlett', 'welch', 'median_mean', 'median', 'spectrogram',
+           'lal_psd', 'scipy_psd', 'numpy_psd']
 
 
 def bartlett(timeseries, segmentlength, window=None):
@@ -92,12 +99,7 @@ def welch(timeseries, segmentlength, overlap, window=None):
     Spectrum
         Welch-averaged `Spectrum`
     """
-    try:
-        return lal_psd(timeseries, 'welch', segmentlength, overlap,
-                       window=window)
-    except ImportError:
-        return scipy_psd(timeseries, 'welch', segmentlength, overlap,
-                         window=window)
+    return psd(timeseries, 'welch', segmentlength, overlap, window=window)
 
 
 def median_mean(timeseries, segmentlength, overlap, window=None):
@@ -122,15 +124,15 @@ def median_mean(timeseries, segmentlength, overlap, window=None):
     Spectrum
         median-mean-averaged `Spectrum`
     """
-    return lal_psd(timeseries, 'medianmean', segmentlength, overlap,
-                    window=window)
+    return psd(timeseries, 'medianmean', segmentlength, overlap,
+               window=window)
 
 
 def median(timeseries, segmentlength, overlap, window=None):
     """Calculate the power spectral density of the given `TimeSeries`
-    using the median-mean average method.
+    using the median average method.
 
-    For more details see :lalsuite:`XLALREAL8AverageSpectrumMean`.
+    For more details see :lalsuite:`XLALREAL8AverageSpectrumMedian`.
 
     Parameters
     ----------
@@ -146,10 +148,56 @@ def median(timeseries, segmentlength, overlap, window=None):
     Returns
     -------
     Spectrum
-        median-mean-averaged `Spectrum`
+        median-averaged `Spectrum`
+    """
+    return psd(timeseries, 'median', segmentlength, overlap, window=window)
+
+
+def psd(timeseries, method, segmentlength, overlap, window=None,
+        backend=None):
+    """Calculate the average power spectral density of the given
+    `TimeSeries` using the given method and backend
+
+    Parameters
+    ----------
+    timeseries : `TimeSeries`
+        input `TimeSeries` data
+    method : `str`
+        average method, one of 'welch', 'bartlett', 'median', 'medianmean'
+    segmentlength : `int`
+        number of samples in single average
+    overlap : `int`
+        number of samples between averages
+    window : `timeseries.Window`, optional
+        window function to apply to timeseries prior to FFT
+    backend : `str`, optional
+        library with which to calculate the PSD, one of
+
+            - ``'lal'`` - :func:`lal_psd`
+            - ``'numpy'`` - :func:`numpy_psd`
+            - ``'scipy'`` - :func:`scipy_psd` (welch and bartlett only)
+
+        default: use LAL if available, otherwise `numpy`
+
+    Returns
+    -------
+    Spectrum
+        average power `Spectrum`
     """
-    return lal_psd(timeseries, 'medianmean', segmentlength, overlap,
-                    window=window)
+    if backend is None:
+        try:
+            return lal_psd(timeseries, method, segmentlength, overlap,
+                           window=window)
+        except ImportError:
+            backend = 'numpy'
+    try:
+        func = _BACKENDS[backend.lower()]
+    except KeyError:
+        raise ValueError("'backend' must be one of: '%s'"
+                         % "','".join(sorted(_BACKENDS)))
+    if func is scipy_psd and window is None:
+        window = 'hanning'
+    return func(timeseries, method, segmentlength, overlap, window=window)
 
 
 def lal_psd(timeseries, method, segmentlength, overlap, window=None):
@@ -241,3 +289,305 @@ def scipy_psd(timeseries, method, segmentlength, overlap, window='hanning'):
     else:
         spec.unit = 1 / units.Hertz
     return spec
+
+
+def numpy_psd(timeseries, method, segmentlength, overlap, window=None):
+    """Calculate the average power spectral density of the given
+    `TimeSeries` natively using `numpy`
+
+    All segments are extracted as a strided view of the input data,
+    windowed and transformed in batches, with no conversion to LAL
+    format. The median and median-mean averages include the same
+    bias correction as the LAL routines.
+
+    Parameters
+    ----------
+    timeseries : `TimeSeries`
+        input `TimeSeries` data
+    method : `str`
+        average method, one of 'welch', 'bartlett', 'median', 'medianmean'
+    segmentlength : `int`
+        number of samples in single average
+    overlap : `int`
+        number of samples between averages
+    window : `timeseries.Window`, `str`, optional, default: 'hanning'
+        window function to apply to timeseries prior to FFT
+
+    Returns
+    -------
+    Spectrum
+        average power `Spectrum`
+    """
+    segmentlength = int(_to_value(segmentlength))
+    overlap = int(_to_value(overlap))
+    method = _parse_method(method)
+    if method == 'bartlett':
+        overlap = segmentlength
+    sampling = timeseries.sample_rate.value
+    window = _get_window_data(window, segmentlength)
+    segments = _segment_view(timeseries.data, segmentlength, overlap)
+    nsegs = segments.shape[0]
+    if not nsegs:
+        raise ValueError("Cannot calculate PSD with FFT length longer than "
+                         "the input data")
+    # calculate periodograms in blocks to bound the memory footprint,
+    # mean averages are accumulated block-by-block, so that only one
+    # block of the input is read at a time
+    nfreqs = segmentlength // 2 + 1
+    nblock = max(1, _MAX_BATCH_SIZE // segmentlength)
+    if method in ['welch', 'bartlett']:
+        average = numpy.zeros(nfreqs)
+        for i in range(0, nsegs, nblock):
+            average += _periodograms(segments[i:i+nblock], window,
+                                     sampling).sum(axis=0)
+        average /= nsegs
+    else:
+        power = numpy.zeros((nsegs, nfreqs))
+        for i in range(0, nsegs, nblock):
+            power[i:i+nblock] = _periodograms(segments[i:i+nblock], window,
+                                              sampling)
+        average = _average(power, method, axis=0)
+    spec = Spectrum(average, name=timeseries.name,
+                    epoch=timeseries.epoch, channel=timeseries.channel,
+                    f0=0, df=sampling / segmentlength)
+    if timeseries.unit:
+        spec.unit = timeseries.unit ** 2 / units.Hertz
+    else:
+        spec.unit = 1 / units.Hertz
+    return spec
+
+
+_BACKENDS = {'lal': lal_psd,
+             'numpy': numpy_psd,
+             'scipy': scipy_psd}
+
+
+def spectrogram(timeseries, method, stride, segmentlength, overlap,
+                window=None):
+    """Calculate the average power spectrogram of the given `TimeSeries`
+
+    Every FFT segment for every column of the output is built as a strided
+    view of the input data, windowed and transformed in a single batched
+    FFT, then reduced into columns using the given average method.
+
+    Parameters
+    ----------
+    timeseries : `TimeSeries`
+        input `TimeSeries` data
+    method : `str`
+        average method, one of 'welch', 'bartlett', 'median', 'medianmean'
+    stride : `int`
+        number of samples in single column of the output `Spectrogram`
+    segmentlength : `int`
+        number of samples in single average
+    overlap : `int`
+        number of samples between averages
+    window : `timeseries.Window`, `str`, optional, default: 'hanning'
+        window function to apply to timeseries prior to FFT
+
+    Returns
+    -------
+    Spectrogram
+        time-frequency power `Spectrogram`
+    """
+    stride = int(_to_value(stride))
+    segmentlength = int(_to_value(segmentlength))
+    overlap = int(_to_value(overlap))
+    method = _parse_method(method)
+    if method == 'bartlett':
+        overlap = segmentlength
+    if segmentlength > stride:
+        raise ValueError("Cannot calculate Spectrogram with FFT length "
+                         "longer than the stride")
+    sampling = timeseries.sample_rate.value
+    window = _get_window_data(window, segmentlength)
+    data = numpy.asarray(timeseries.data)
+
+    # get output dimensions
+    nsteps = data.size // stride
+    nsegs = 1 + (stride - segmentlength) // overlap
+    nfreqs = segmentlength // 2 + 1
+    out = Spectrogram(numpy.zeros((nsteps, nfreqs)), name=timeseries.name,
+                      epoch=timeseries.epoch, f0=0,
+                      df=sampling / segmentlength, dt=stride / sampling,
+                      copy=True)
+    if timeseries.unit:
+        out.unit = timeseries.unit ** 2 / units.Hertz
+    else:
+        out.unit = 1 / units.Hertz
+    if not nsteps:
+        return out
+
+    # find the start index of each FFT segment, relative to a strided view
+    # of the data whose step is the highest common factor of both strides
+    step = _gcd(stride, overlap)
+    segments = _segment_view(data[:nsteps*stride], segmentlength, step)
+    offsets = (numpy.arange(nsteps)[:, None] * (stride // step) +
+               numpy.arange(nsegs)[None, :] * (overlap // step))
+
+    # process blocks of columns to bound the memory footprint of the FFT
+    nblock = max(1, _MAX_BATCH_SIZE // (nsegs * segmentlength))
+    for i in range(0, nsteps, nblock):
+        rows = offsets[i:i+nblock]
+        power = _periodograms(segments[rows.ravel()], window, sampling)
+        power.shape = rows.shape + (nfreqs,)
+        out.data[i:i+nblock] = _average(power, method, axis=1)
+    return out
+
+
+# -----------------------------------------------------------------------------
+# batched FFT engine
+
+_MAX_BATCH_SIZE = 2 ** 22
+
+_METHODS = {'welch': 'welch',
+            'bartlett': 'bartlett',
+            'median': 'median',
+            'medianmean': 'medianmean',
+            'median-mean': 'medianmean',
+            'median_mean': 'medianmean'}
+
+
+def _to_value(x):
+    """Return the value of a `Quantity`, or the input itself
+    """
+    if isinstance(x, units.Quantity):
+        return x.value
+    return x
+
+
+def _gcd(a, b):
+    """Return the greatest common divisor of the two integers
+    """
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def _parse_method(method):
+    """Return the canonical name of the given average-spectrum method
+    """
+    try:
+        return _METHODS[method.lower()]
+    except KeyError:
+        raise ValueError("'method' must be one of: '%s'"
+                         % "','".join(sorted(set(_METHODS.values()))))
+
+
+def _get_window_data(window, length):
+    """Return the window function as a plain `numpy.ndarray`
+    """
+    if window is None:
+        window = 'hanning'
+    if isinstance(window, (str, tuple, list)):
+        window = get_window(window, length)
+    window = numpy.asarray(window, dtype=numpy.float64)
+    if window.size != length:
+        raise ValueError("Window length (%d) does not match FFT length (%d)"
+                         % (window.size, length))
+    return window
+
+
+def _segment_view(data, segmentlength, step):
+    """Return a read-only view of every segment of the data
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`
+        one-dimensional input array
+    segmentlength : `int`
+        number of samples in each segment
+    step : `int`
+        number of samples between the starts of consecutive segments
+
+    Returns
+    -------
+    segments : `numpy.ndarray`
+        2-D ``(nsegments, segmentlength)`` view of the input, sharing
+        its memory
+    """
+    data = numpy.ascontiguousarray(data)
+    nsegs = 1 + (data.size - segmentlength) // step
+    if nsegs < 1:
+        return numpy.empty((0, segmentlength), dtype=data.dtype)
+    view = stride_tricks.as_strided(
+        data, shape=(nsegs, segmentlength),
+        strides=(step * data.strides[0], data.strides[0]))
+    view.flags.writeable = False
+    return view
+
+
+def _periodograms(segments, window, sampling):
+    """Calculate the one-sided power spectral density of each segment
+
+    The normalisation matches that of the LAL average-spectrum routines,
+    with the DC and Nyquist components not doubled.
+
+    Parameters
+    ----------
+    segments : `numpy.ndarray`
+        2-D ``(nsegments, segmentlength)`` array of data segments
+    window : `numpy.ndarray`
+        window function to apply to each segment
+    sampling : `float`
+        sample rate of the data
+
+    Returns
+    -------
+    power : `numpy.ndarray`
+        2-D ``(nsegments, segmentlength // 2 + 1)`` array of PSDs
+    """
+    segmentlength = segments.shape[-1]
+    fft = numpy.fft.rfft(segments * window, axis=-1)
+    power = fft.real ** 2
+    power += fft.imag ** 2
+    power *= 2 / (sampling * (window ** 2).sum())
+    power[..., 0] /= 2.
+    if not segmentlength % 2:
+        power[..., -1] /= 2.
+    return power
+
+
+def _median_bias(n):
+    """Return the bias factor of the median of ``n`` exponentially
+    distributed random variables, as given by :lalsuite:`XLALMedianBias`
+    """
+    bias = 1.
+    for i in range(1, (n - 1) // 2 + 1):
+        bias -= 1. / (2 * i)
+        bias += 1. / (2 * i + 1)
+    return bias
+
+
+def _average(power, method, axis=0):
+    """Average a set of periodograms according to the given method
+
+    Parameters
+    ----------
+    power : `numpy.ndarray`
+        array of periodograms
+    method : `str`
+        average method, one of 'welch', 'bartlett', 'median', 'medianmean'
+    axis : `int`, optional, default: 0
+        axis of ``power`` along which to average
+
+    Returns
+    -------
+    average : `numpy.ndarray`
+        the input averaged along the given axis
+    """
+    nsegs = power.shape[axis]
+    if method in ['welch', 'bartlett']:
+        return power.mean(axis=axis)
+    elif method == 'median':
+        return numpy.median(power, axis=axis) / _median_bias(nsegs)
+    elif method == 'medianmean':
+        if nsegs < 2:
+            raise ValueError("Median-mean average requires at least "
+                             "two segments")
+        even = numpy.take(power, numpy.arange(0, nsegs, 2), axis=axis)
+        odd = numpy.take(power, numpy.arange(1, nsegs, 2), axis=axis)
+        return (numpy.median(even, axis=axis) / _median_bias(even.shape[axis]) +
+                numpy.median(odd, axis=axis) /
+                _median_bias(odd.shape[axis])) / 2.
+    raise ValueError("Average method '%s' not recognised" % method)
@@ -24,3 +24,6 @@ __version__ = version.version
 
 from .core import *
 from .statevector import *
+from .filter import *
+from .pipeline import *
+from ..io.hdf5.timeseries import *
@@ -23,10 +23,14 @@ from __future__ import (division, print_function)
 import os
 import numbers
 import numpy
-import sys
+import time
 import warnings
 from math import (ceil, floor, modf)
-from scipy import (fftpack, signal)
+try:
+    from collections import OrderedDict
+except ImportError:
+    from astropy.utils import OrderedDict
+from scipy import fftpack
 from matplotlib import mlab
 
 from astropy import units
@@ -37,11 +41,13 @@ from ..detector import (Channel, ChannelList)
 from ..segments import (Segment, SegmentList)
 from ..time import Time
 from ..window import *
+from .filter import Filter
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 __version__ = version.version
 
-__all__ = ["TimeSeries", 'ArrayTimeSeries', 'TimeSeriesList']
+__all__ = ["TimeSeries", 'ArrayTimeSeries', 'TimeSeriesList',
+           'TimeSeriesDict']
 
 _UFUNC_STRING = {'less': '<',
                  'less_equal': '<=',
@@ -51,6 +57,18 @@ _UFUNC_STRING = {'less': '<',
                  }
 
 
+_WINDOW_STATS = {
+    'rms': lambda x, axis: numpy.sqrt(numpy.mean(numpy.absolute(x)**2,
+                                                 axis=axis)),
+    'mean': numpy.mean,
+    'median': numpy.median,
+    'min': numpy.min,
+    'max': numpy.max,
+    'std': numpy.std,
+    'percentile': None,
+}
+
+
 class TimeSeries(Series):
     """A data array holding some metadata to represent a time series of
     instrumental or analysis data.
@@ -109,6 +127,8 @@ class TimeSeries(Series):
     highpass
     lowpass
     bandpass
+    rms
+    stat
     """
     _metadata_slots = ['name', 'unit', 'epoch', 'channel', 'sample_rate']
     xunit = units.Unit('s')
@@ -207,7 +227,7 @@ class TimeSeries(Series):
 
     @classmethod
     def read(cls, source, channel, start=None, end=None, datatype=None,
-             verbose=False):
+             verbose=False, nproc=1, pad=None, format=None):
         """Read data into a `TimeSeries` from files on disk.
 
         Parameters
@@ -218,9 +238,11 @@ class TimeSeries(Series):
             - a filepath for a GWF-format frame file,
             - a filepath for a LAL-format Cache file
             - a Cache object from GLUE or LAL
+            - a filepath for an HDF5-format file
 
         channel : `str`, :class:`~gwpy.detector.channel.Channel`
-            channel (name or object) to read
+            channel (name or object) to read, for HDF5 files this is the
+            name of the dataset
         start : :class:`~gwpy.time.Time`, `float`, optional
             start GPS time of desired data
         end : :class:`~gwpy.time.Time`, `float`, optional
@@ -229,17 +251,55 @@ class TimeSeries(Series):
             identifier for desired output data type
         verbose : `bool`, optional
             print verbose output
+        nproc : `int`, optional, default: 1
+            number of parallel processes with which to read data, only
+            used when reading from a cache of more than one file
+        pad : `float`, optional, default: `None`
+            value with which to fill gaps in the cache when reading in
+            parallel, including before the first file or after the last,
+            so that the output spans ``[start, end)``, by default any gap
+            raises a `ValueError`
+        format : `str`, optional
+            format of the source, e.g. ``'hdf5'``, by default frame
+            files are assumed, unless the filepath ends with an HDF5
+            extension; ``datatype``, ``verbose``, ``nproc``, and ``pad``
+            apply to frame files only
 
         Returns
         -------
         TimeSeries
             a new `TimeSeries` containing the data read from disk
+
+        Raises
+        ------
+        ValueError
+            if any of ``datatype``, ``verbose``, ``nproc``, or ``pad`` are
+            given when reading another format
         """
+        if (format is None and isinstance(source, str) and
+                source.endswith(('.h5', '.hdf', '.hdf5'))):
+            format = 'hdf5'
+        if format is not None:
+            if (datatype is not None or verbose or nproc != 1 or
+                    pad is not None):
+                raise ValueError("datatype, verbose, nproc, and pad cannot "
+                                 "be used when reading %s format"
+                                 % format)
+            from astropy.io import registry
+            return registry.read(cls, source, path=str(channel),
+                                 start=start, end=end, format=format)
         from lalframe import frread
         if isinstance(channel, Channel):
-            channel = channel.name
             if datatype is None:
                 datatype = channel.dtype
+            channel = channel.name
+        if nproc > 1:
+            cache = _parse_cache(source)
+            if cache is not None and len(cache) > 1:
+                return _read_parallel(cache, [channel], start=start,
+                                      end=end, datatype=datatype,
+                                      nproc=nproc, pad=pad,
+                                      verbose=verbose, entryclass=cls)[0]
         if start and isinstance(start, Time):
             start = start.gps
         if end and isinstance(end, Time):
@@ -258,7 +318,8 @@ class TimeSeries(Series):
 
     @classmethod
     def fetch(cls, channel, start, end, host=None, port=None, verbose=False,
-              connection=None, ndschanneltype=None):
+              connection=None, ndschanneltype=None, chunksize=None,
+              nretry=2, race=False):
         """Fetch data from NDS into a TimeSeries.
 
         Parameters
@@ -279,119 +340,122 @@ class TimeSeries(Series):
             open NDS connection to use
         ndschanneltype : `int`
             NDS2 channel type integer
+        chunksize : `int`, optional
+            number of seconds of data in a single request, by default
+            the full span is requested at once
+        nretry : `int`, optional, default: 2
+            number of times to retry a failed request, only used with
+            ``chunksize``
+        race : `bool`, optional, default: `False`
+            probe all known servers at once, and fetch data from the
+            first to respond with all of the channels, rather than trying
+            each server in turn, only used if neither ``host`` nor
+            ``connection`` is given
 
         Returns
         -------
         TimeSeries
             a new `TimeSeries` containing the data read from NDS
+
+        See Also
+        --------
+        TimeSeries.fetch_chunks
+            for a streaming version of this method
         """
-        # import module and type-cast arguments
-        from ..io import nds as ndsio
-        import nds2
-        start = int(floor(isinstance(start, Time) and start.gps or start))
-        end = int(ceil(isinstance(end, Time) and end.gps or end))
-        # set context
-        if verbose:
-            outputcontext = ndsio.NDSOutputContext()
-        else:
-            outputcontext = ndsio.NDSOutputContext(open(os.devnull, 'w'),
-                                                   open(os.devnull, 'w'))
-        # get type
-        if not ndschanneltype and isinstance(channel, Channel) and channel.type:
-            ndschanneltype = channel.type
-        if not ndschanneltype:
-            ndschanneltype = (nds2.channel.CHANNEL_TYPE_RAW |
-                              nds2.channel.CHANNEL_TYPE_RDS |
-                              nds2.channel.CHANNEL_TYPE_STREND |
-                              nds2.channel.CHANNEL_TYPE_MTREND)
-
-        channel = str(channel)
-        # user-defined host or open connection
-        if connection or host:
-            hostlist = [(host, port)]
-        # logical host resolution order
-        else:
-            hostlist = ndsio.host_resolution_order(Channel(channel).ifo)
+        kwargs = dict(host=host, port=port, verbose=verbose,
+                      connection=connection, ndschanneltype=ndschanneltype,
+                      entryclass=cls, race=race)
+        if chunksize:
+            return _fetch_chunked([channel], start, end, chunksize,
+                                  nretry=nretry, **kwargs)[0]
+        return _fetch([channel], start, end, **kwargs)[0]
 
-        # loop hosts, stopping on first success
-        for host,port in hostlist:
-            if connection:
-                _conn = connection
-            # open connection if needed - check kerberos ticket
-            if connection is None:
-                if verbose:
-                    print("Connecting to %s:%s" % (host, port))
-                try:
-                    with outputcontext:
-                        _conn = nds2.connection(host, port)
-                except RuntimeError as e:
-                    if str(e).startswith('Request SASL authentication'):
-                        print('\nError authenticating against %s' % host,
-                              file=sys.stderr)
-                        ndsio.kinit()
-                        with outputcontext:
-                            _conn = nds2.connection(host, port)
-                    else:
-                        raise
-            # double check channels against server
-            with outputcontext:
-                channelok = _conn.find_channels(str(channel), ndschanneltype)
-                if not channelok:
-                    channels = _conn.find_channels(
-                                   '*%s*' % str(channel), ndschanneltype)
-                    # if no channels and user didn't supply their own server
-                    # warn and move one
-                    if len(channels) == 0 and not connection:
-                        if verbose:
-                            warnings.warn("No matching channels found",
-                                          ndsio.NDSWarning)
-                        continue
-                    elif len(channels) == 0:
-                        pass
-                    # if one channel, find
-                    elif len(channels) == 1:
-                        channel = channels[0].name
-                    # if more than one channel and user did supply their own
-                    # server, barf
-                    elif connection:
-                        raise ValueError("No channel '%s' found on server."
-                                         " However, %d others were found, "
-                                         "please restrict your search and "
-                                         "try again:\n    %s"
-                                         % (str(channel), len(channels),
-                                            "\n    ".join(map(str, channels))))
-                if channel.endswith('m-trend') and (start % 60 or end % 60):
-                    warnings.warn("Requested channel is minute trend, but "
-                                  "start and stop GPS times are not modulo "
-                                  "60-seconds (from GPS epoch). Times will be "
-                                  "expanded outwards to compensate")
-                    if start % 60:
-                        start = start // 60 * 60
-                    if end % 60:
-                        end = end // 60 * 60 + 60
-                # fetch data
-                try:
-                    if verbose:
-                        print("Downloading data...")
-                    buffer_ = _conn.fetch(start, end, [str(channel)])[0]
-                except RuntimeError as e:
-                    # if error and user supplied their own server, raise
-                    if connection:
-                        raise
-                    # otherwise warn and move on
-                    elif verbose:
-                        warnings.warn(str(e), ndsio.NDSWarning)
-                else:
-                    # cast as TimeSeries and return
-                    epoch = Time(buffer_.gps_seconds, buffer_.gps_nanoseconds,
-                                 format='gps')
-                    channel = Channel.from_nds2(buffer_.channel)
-                    return cls(buffer_.data, epoch=epoch, channel=channel)
-        raise RuntimeError("Cannot find relevant data on any known server")
+    @classmethod
+    def fetch_chunks(cls, channel, start, end, chunksize, host=None,
+                     port=None, verbose=False, connection=None,
+                     ndschanneltype=None, nretry=2, race=False,
+                     prefetch=1):
+        """Fetch data from NDS in consecutive chunks
+
+        Requests for the following chunks are issued while the current
+        chunk is being processed by the caller, and failed requests are
+        retried.
+
+        Parameters
+        ----------
+        channel : :class:`~gwpy.detector.channel.Channel`, or `str`
+            required data channel
+        start : `~gwpy.time.Time`, or float
+            GPS start time of data span
+        end : `~gwpy.time.Time`, or float
+            GPS end time of data span
+        chunksize : `int`
+            number of seconds of data in a single chunk
+        host : `str`, optional
+            URL of NDS server to use, defaults to observatory site host
+        port : `int`, optional
+            port number for NDS server query, must be given with `host`
+        verbose : `bool`, optional
+            print verbose output about NDS progress
+        connection : :class:`~gwpy.io.nds.NDS2Connection`
+            open NDS connection to use
+        ndschanneltype : `int`
+            NDS2 channel type integer
+        nretry : `int`, optional, default: 2
+            number of times to retry a failed request
+        race : `bool`, optional, default: `False`
+            probe all known servers at once, and fetch data from the
+            first to respond with all of the channels, rather than trying
+            each server in turn, only used if neither ``host`` nor
+            ``connection`` is given
+        prefetch : `int`, optional, default: 1
+            number of chunks to request ahead of the one being processed;
+            these are fetched concurrently over separate connections,
+            unless ``connection`` is given, in which case they are fetched
+            one at a time
+
+        Returns
+        -------
+        iterator
+            a generator yielding a new `TimeSeries` for each chunk
+        """
+        for data in _fetch_chunks([channel], start, end, chunksize,
+                                  nretry=nretry, host=host, port=port,
+                                  verbose=verbose, connection=connection,
+                                  ndschanneltype=ndschanneltype,
+                                  entryclass=cls, race=race,
+                                  prefetch=prefetch):
+            yield data[0]
 
     # -------------------------------------------
     # TimeSeries product methods
 
+    def lazy(self, blocksize=2**20):
+        """Start a lazy, block-wise processing `Pipeline` for this
+        `TimeSeries`
+
+        Operations applied to the `Pipeline` are recorded, and executed
+        block by block only when the result is requested, so that long
+        (e.g. memory-mapped) data can be filtered, resampled, and
+        transformed with a memory footprint set by the block size.
+
+        Parameters
+        ----------
+        blocksize : `int`, optional, default: 1048576
+            number of input samples to process at once
+
+        Returns
+        -------
+        pipeline : :class:`~gwpy.timeseries.pipeline.Pipeline`
+            a new, empty `Pipeline` reading from this `TimeSeries`
+
+        Examples
+        --------
+        >>> asd = data.lazy().highpass(10).resample(1024).asd(4, 2)
+        """
+        from .pipeline import Pipeline
+        return Pipeline(self, blocksize=blocksize)
+
     def crop(self, gpsstart, gpsend):
         """Crop this `TimeSeries` to the given GPS ``[start, end)``
         `Segment`.
@@ -414,6 +478,10 @@ class TimeSeries(Series):
         If either ``gpsstart`` or ``gpsend`` are outside of the original
         `TimeSeries` span, warnings will be printed and the limits will
         be restricted to the :attr:`TimeSeries.span`
+
+        The returned `TimeSeries` is a view of the original data, so
+        in-place modifications of one will affect the other, use
+        ``crop(...).copy()`` to get an independent array.
         """
         if isinstance(gpsstart, Time):
             gpsstart = gpsstart.gps
@@ -429,9 +497,12 @@ class TimeSeries(Series):
                           'end time of the input TimeSeries. Crop will '
                           'end when the TimeSeries actually ends.')
             gpsend = self.span[1]
-        times = self.times.data
-        croptimes = (times >= gpsstart) & (times < gpsend)
-        return self[croptimes]
+        # find the first sample at or after each boundary
+        x0 = self.x0.value
+        dx = self.dx.value
+        idx0 = _sample_index(gpsstart, x0, dx)
+        idx1 = max(idx0, _sample_index(gpsend, x0, dx))
+        return self[idx0:idx1]
 
     def fft(self, fftlength=None):
         """Compute the one-dimensional discrete Fourier transform of
@@ -447,24 +518,39 @@ class TimeSeries(Series):
 
         Returns
         -------
-        out : complex `Series`
+        out : complex `Spectrum`
             the transformed output, with populated frequencies array
             metadata
 
+        Notes
+        -----
+        For real-valued data, the one-sided transform is computed via
+        :func:`numpy.fft.rfft`, returning only the ``fftlength // 2 + 1``
+        non-negative frequencies. Complex-valued data are transformed with
+        :func:`scipy.fftpack.fft`, returning the full two-sided spectrum.
+
         See Also
         --------
         :mod:`scipy.fftpack` for the definition of the DFT and conventions
         used.
         """
         from ..spectrum import Spectrum
-        new = fftpack.fft(self.data, n=fftlength).view(Spectrum)
-        new.frequencies = fftpack.fftfreq(new.size, d=numpy.float64(self.dx))
-        #new.x0 = new.frequencies[0]
-        #if len(new.frequencies) > 1:
-        #    new.dx = new.frequencies[1] - new.frequencies[0]
+        if numpy.iscomplexobj(self):
+            new = fftpack.fft(self.data, n=fftlength).view(Spectrum)
+            new.frequencies = fftpack.fftfreq(new.size,
+                                              d=numpy.float64(self.dx))
+        else:
+            fftlength = fftlength or self.size
+            new = Spectrum(numpy.fft.rfft(self.data, n=fftlength), f0=0,
+                           df=1 / (fftlength * self.dx.value))
+        new.name = self.name
+        new.epoch = self.epoch
+        if self.channel is not None:
+            new.channel = self.channel
         return new
 
-    def psd(self, fftlength=None, fftstride=None, method='welch', window=None):
+    def psd(self, fftlength=None, fftstride=None, method='welch', window=None,
+            backend=None):
         """Calculate the power spectral density (PSD) `Spectrum` for this
         `TimeSeries`.
 
@@ -486,6 +572,10 @@ class TimeSeries(Series):
             average spectrum method
         window : `timeseries.Window`, optional
             window function to apply to timeseries prior to FFT
+        backend : `str`, optional
+            library with which to calculate the PSD, one of 'lal',
+            'numpy', or 'scipy', default: 'lal' if available, otherwise
+            'numpy', see :func:`gwpy.spectrum.psd.psd` for details
 
         Returns
         -------
@@ -497,23 +587,18 @@ class TimeSeries(Series):
             fftlength = self.duration.value
         if fftstride is None:
             fftstride = fftlength
-        fftlength *= self.sample_rate.value
-        fftstride *= self.sample_rate.value
+        fftlength = int(fftlength * self.sample_rate.value)
+        fftstride = int(fftstride * self.sample_rate.value)
         if window is not None:
             window = get_window(window, fftlength)
-        try:
-            psd_ = psd.lal_psd(self, method, int(fftlength), int(fftstride),
-                               window=window)
-        except ImportError:
-            if window is None:
-                window = 'hanning'
-            psd_ = psd.scipy_psd(self, method, int(fftlength), int(fftstride),
-                               window=window)
+        psd_ = psd.psd(self, method, fftlength, fftstride, window=window,
+                       backend=backend)
         if psd_.unit:
             psd_.unit.__doc__ = "Power spectral density"
         return psd_
 
-    def asd(self, fftlength=None, fftstride=None, method='welch', window=None):
+    def asd(self, fftlength=None, fftstride=None, method='welch', window=None,
+            backend=None):
         """Calculate the amplitude spectral density (ASD) `Spectrum` for this
         `TimeSeries`.
 
@@ -537,6 +622,10 @@ class TimeSeries(Series):
             average spectrum method
         window : `timeseries.Window`, optional
             window function to apply to timeseries prior to FFT
+        backend : `str`, optional
+            library with which to calculate the PSD, one of 'lal',
+            'numpy', or 'scipy', default: 'lal' if available, otherwise
+            'numpy', see :func:`gwpy.spectrum.psd.psd` for details
 
         Returns
         -------
@@ -544,7 +633,7 @@ class TimeSeries(Series):
             a data series containing the ASD.
         """
         asd = self.psd(fftlength, fftstride=fftstride, method=method,
-                       window=window)
+                       window=window, backend=backend)
         asd **= 1/2.
         if asd.unit:
             asd.unit.__doc__ = "Amplitude spectral density"
@@ -567,81 +656,62 @@ class TimeSeries(Series):
             number of seconds between FFTs
         window : `timeseries.window.Window`, optional, default: `None`
             window function to apply to timeseries prior to FFT
+
+        Returns
+        -------
+        spectrogram : :class:`~gwpy.spectrogram.core.Spectrogram`
+            time-frequency power spectrogram as generated from the
+            input time-series
+
+        See Also
+        --------
+        :func:`gwpy.spectrum.psd.spectrogram`
+            for details of the batched FFT engine
         """
         from ..spectrum import psd
-        from ..spectrogram import Spectrogram
         if fftlength == None:
             fftlength = stride
         if fftstride == None:
             fftstride = fftlength
-        dt = stride
-        df = 1/fftlength
-        stride *= self.sample_rate.value
-
-        # get size of Spectrogram
-        nsteps = int(self.size // stride)
-        # get number of frequencies
-        nfreqs = int(fftlength*self.sample_rate.value // 2 + 1)
-
-        # generate output spectrogram
-        out = Spectrogram(numpy.zeros((nsteps, nfreqs)), name=self.name,
-                          epoch=self.epoch, f0=0, df=df, dt=dt, copy=True)
-        if not nsteps:
-            return out
-
-        # stride through TimeSeries, recording PSDs as columns of spectrogram
-        for step in range(nsteps):
-            # find step TimeSeries
-            idx = stride * step
-            idx_end = idx + stride
-            stepseries = self[idx:idx_end]
-            steppsd = stepseries.psd(fftlength, fftstride, method,
-                                     window=window)
-            out[step] = steppsd.data
-        try:
-            out.unit = self.unit / units.Hertz
-        except KeyError:
-            out.unit = 1 / units.Hertz
-        return out
+        sampling = self.sample_rate.value
+        stride = int(round(stride * sampling))
+        fftlength = int(round(fftlength * sampling))
+        fftstride = int(round(fftstride * sampling))
+        return psd.spectrogram(self, method, stride, fftlength, fftstride,
+                               window=window)
 
     def fftgram(self, stride):
-        """Calculate the average power spectrogram of this `TimeSeries`
-        using the specified average spectrum method.
+        """Calculate the Fourier-gram of this `TimeSeries`.
+
+        The `TimeSeries` is split into non-overlapping segments of the
+        given length, each of which is transformed with a single batched
+        real-input FFT.
 
         Parameters
         ----------
         stride : `float`
-            number of seconds in single PSD (column of spectrogram)
+            number of seconds in single FFT (column of spectrogram)
+
+        Returns
+        -------
+        fftgram : :class:`~gwpy.spectrogram.core.Spectrogram`
+            complex-valued `Spectrogram` of the one-sided FFT of each
+            segment
         """
         from ..spectrogram import Spectrogram
 
-        fftlength = stride
-
-        dt = stride
-        df = 1/fftlength
-        stride *= self.sample_rate.value
-
-        # get size of Spectrogram
-        nsteps = int(self.size // stride)
-        # get number of frequencies
-        nfreqs = int(fftlength*self.sample_rate.value)
-
-        # generate output spectrogram
-        out = Spectrogram(numpy.zeros((nsteps, nfreqs)), name=self.name,
-                          epoch=self.epoch, f0=0, df=df, dt=dt, copy=True)
-        # stride through TimeSeries, recording PSDs as columns of spectrogram
-        for step in range(nsteps):
-            # find step TimeSeries
-            idx = stride * step
-            idx_end = idx + stride
-            stepseries = self[idx:idx_end]
-            stepfft = stepseries.fft()
-            out[step] = stepfft.data
+        sampling = self.sample_rate.value
+        fftlength = int(round(stride * sampling))
+        nsteps = int(self.size // fftlength)
+        segments = self.data[:nsteps*fftlength].reshape((nsteps, fftlength))
+        # axes follow the rounded number of samples in each segment
+        out = Spectrogram(numpy.fft.rfft(segments, axis=1), name=self.name,
+                          epoch=self.epoch, f0=0, df=sampling/fftlength,
+                          dt=fftlength/sampling)
         try:
             out.unit = self.unit / units.Hertz
         except KeyError:
             out.unit = 1 / units.Hertz
-        out.frequencies = stepfft.frequencies
         return out
 
     def plot(self, **kwargs):
@@ -653,7 +723,8 @@ class TimeSeries(Series):
     # -------------------------------------------
     # TimeSeries filtering
 
-    def highpass(self, frequency, amplitude=0.9, order=8, method='scipy'):
+    def highpass(self, frequency, amplitude=0.9, order=8, method='scipy',
+                 filtfilt=False):
         """Filter this `TimeSeries` with a Butterworth high-pass filter.
 
         See (for example) :lalsuite:`XLALHighPassREAL8TimeSeries` for more
@@ -669,6 +740,8 @@ class TimeSeries(Series):
             desired order of the Butterworth filter
         method : `str`, optional, default: 'scipy'
             choose method of high-passing, LAL or SciPy
+        filtfilt : `bool`, optional, default: `False`
+            filter forwards and backwards for zero phase, SciPy method only
 
         Returns
         -------
@@ -681,23 +754,21 @@ class TimeSeries(Series):
         method.
         """
         if method.lower() == 'lal':
-            lalts = self.to_lal()
+            import lal
+            lalts = self.to_lal(copy=True)
             highpass = getattr(lal, 'HighPass%s' % lalts.__class__.__name__)
             highpass(lalts, float(frequency), amplitude, order)
             return TimeSeries.from_lal(lalts)
         elif method.lower() == 'scipy':
-            # build filter
-            B,A = signal.butter(order, numpy.float64(frequency * 2.0 /
-                                                     self.sample_rate),
-                                btype='highpass')
-            new = signal.lfilter(B, A, self, axis=0).view(self.__class__)
-            new.metadata = self.metadata.copy()
-            return new
+            filt = Filter.butter('highpass', order, frequency,
+                                 self.sample_rate)
+            return self.filter(filt, filtfilt=filtfilt)
         raise NotImplementedError("Highpass filter method '%s' not "
                                   "recognised, please choose one of "
-                                  "'scipy' or 'lal'")
+                                  "'scipy' or 'lal'" % method)
 
-    def lowpass(self, frequency, amplitude=0.9, order=4, method='scipy'):
+    def lowpass(self, frequency, amplitude=0.9, order=4, method='scipy',
+                filtfilt=False):
         """Filter this `TimeSeries` with a Butterworth low-pass filter.
 
         Parameters
@@ -710,6 +781,8 @@ class TimeSeries(Series):
             desired order of the Butterworth filter
         method : `str`, optional, default: 'scipy'
             choose method of high-passing, LAL or SciPy
+        filtfilt : `bool`, optional, default: `False`
+            filter forwards and backwards for zero phase, SciPy method only
 
         Returns
         -------
@@ -722,27 +795,28 @@ class TimeSeries(Series):
         method.
         """
         if method.lower() == 'lal':
-            lalts = self.to_lal()
+            import lal
+            lalts = self.to_lal(copy=True)
             lowpass = getattr(lal, 'LowPass%s' % lalts.__class__.__name__)
             lowpass(lalts, float(frequency), amplitude, order)
             return TimeSeries.from_lal(lalts)
         elif method.lower() == 'scipy':
-            # build filter
-            B,A = signal.butter(order, numpy.float64(frequency * 2.0 /
-                                                     self.sample_rate),
-                                btype='lowpass')
-            new = signal.lfilter(B, A, self, axis=0).view(self.__class__)
-            new.metadata = self.metadata.copy()
-            return new
+            filt = Filter.butter('lowpass', order, frequency,
+                                 self.sample_rate)
+            return self.filter(filt, filtfilt=filtfilt)
         raise NotImplementedError("Lowpass filter method '%s' not "
                                   "recognised, please choose one of "
-                                  "'scipy' or 'lal'")
-
+                                  "'scipy' or 'lal'" % method)
 
-    def bandpass(self, flow, fhigh, amplitude=0.9, order=6, method='scipy'):
+    def bandpass(self, flow, fhigh, amplitude=0.9, order=6, method='scipy',
+                 filtfilt=False):
         """Filter this `TimeSeries` by applying both low- and high-pass
         filters.
 
+        With the SciPy method, the high- and low-pass filters are
+        cascaded into a single set of second-order sections, so the data
+        are filtered in a single pass.
+
         See (for example) :lalsuite:`XLALLowPassREAL8TimeSeries` for more
         information.
 
@@ -756,6 +830,10 @@ class TimeSeries(Series):
             desired amplitude response of the filter
         order : `int`, optional
             desired order of the Butterworth filter
+        method : `str`, optional, default: 'scipy'
+            choose method of filtering, LAL or SciPy
+        filtfilt : `bool`, optional, default: `False`
+            filter forwards and backwards for zero phase, SciPy method only
 
         Returns
         -------
@@ -767,12 +845,53 @@ class TimeSeries(Series):
         the LAL method, otherwise see :mod:`scipy.signal` for the SciPy
         method.
         """
+        if method.lower() == 'scipy':
+            filt = (Filter.butter('highpass', order, flow, self.sample_rate) +
+                    Filter.butter('lowpass', order, fhigh, self.sample_rate))
+            return self.filter(filt, filtfilt=filtfilt)
         try:
-            high = self.highpass(flow, amplitude=amplitude, order=order)
+            high = self.highpass(flow, amplitude=amplitude, order=order,
+                                 method=method)
         except NotImplementedError as e:
-            raise NotImplementedError(str(e).replace('Lowpass', 'Bandpass'))
+            raise NotImplementedError(str(e).replace('Highpass', 'Bandpass'))
+        else:
+            return high.lowpass(fhigh, amplitude=amplitude, order=order,
+                                method=method)
+
+    def filter(self, filt, filtfilt=False):
+        """Apply the given digital filter to this `TimeSeries`
+
+        Parameters
+        ----------
+        filt : :class:`~gwpy.timeseries.filter.Filter`, `tuple`, `numpy.ndarray`
+            the filter to apply, one of
+
+            - a `Filter`, whose state is used and updated, so that
+              consecutive chunks of data can be filtered in turn
+            - a ``(zeros, poles, gain)`` `tuple` of digital filter roots
+            - an ``(nsections, 6)`` array of second-order sections
+
+        filtfilt : `bool`, optional, default: `False`
+            filter forwards and backwards for zero phase, this does not
+            use or update the state of a `Filter`
+
+        Returns
+        -------
+        TimeSeries
+            a new `TimeSeries` containing the filtered data
+        """
+        if not isinstance(filt, Filter):
+            if isinstance(filt, tuple) and len(filt) == 3:
+                filt = Filter.from_zpk(*filt)
+            else:
+                filt = Filter(filt)
+        if filtfilt:
+            data = filt.filtfilt(self.data, axis=0)
         else:
-            return high.lowpass(fhigh, amplitude=amplitude, order=order)
+            data = filt.process(self.data, axis=0)
+        new = data.view(self.__class__)
+        new._metadata = self._metadata.copy()
+        return new
 
     def coherence(self, other, fftlength=None, fftstride=None,
                   window=None, **kwargs):
@@ -847,6 +966,70 @@ class TimeSeries(Series):
         out.name = 'Coherence between %s and %s' % (self.name, other.name)
         return out
 
+    def coherence_spectrogram(self, other, stride, fftlength,
+                              fftstride=None, window=None):
+        """Calculate the coherence spectrogram between this `TimeSeries`
+        and another.
+
+        Parameters
+        ----------
+        other : `TimeSeries`
+            `TimeSeries` signal to calculate coherence with
+        stride : `float`
+            number of seconds in single coherence (column of spectrogram)
+        fftlength : `float`
+            number of seconds in single FFT, at least two FFTs must fit
+            in each ``stride``
+        fftstride : `float`, optional, default: fftlength
+            number of seconds between FFTs
+        window : `timeseries.window.Window`, optional, default: `None`
+            window function to apply to timeseries prior to FFT
+
+        Returns
+        -------
+        spectrogram : :class:`~gwpy.spectrogram.core.Spectrogram`
+            time-frequency coherence spectrogram between this
+            `TimeSeries` and the other
+
+        Raises
+        ------
+        ValueError
+            if fewer than two FFTs fit in each ``stride``, since the
+            coherence of a single FFT is identically one, or if the two
+            `TimeSeries` do not start at the same time
+
+        Notes
+        -----
+        If `self` and `other` have difference
+        :attr:`TimeSeries.sample_rate` values, the higher sampled
+        `TimeSeries` will be down-sampled to match the lower.
+
+        See Also
+        --------
+        :func:`gwpy.spectrum.csd.coherence_spectrogram`
+            for details of the batched FFT engine
+        """
+        from ..spectrum import csd
+        # check sampling rates
+        if self.sample_rate.to('Hertz') != other.sample_rate.to('Hertz'):
+            sampling = min(self.sample_rate.value, other.sample_rate.value)
+            # resample higher rate series
+            if self.sample_rate.value == sampling:
+                other = other.resample(sampling)
+                self_ = self
+            else:
+                self_ = self.resample(sampling)
+        else:
+            sampling = self.sample_rate.value
+            self_ = self
+        if fftstride is None:
+            fftstride = fftlength
+        stride = int(round(stride * sampling))
+        fftlength = int(round(fftlength * sampling))
+        fftstride = int(round(fftstride * sampling))
+        return csd.coherence_spectrogram(self_, other, stride, fftlength,
+                                         fftstride, window=window)
+
     def auto_coherence(self, dt, fftlength=None, fftstride=None,
                        window=None, **kwargs):
         """Calculate the frequency-coherence between this `TimeSeries`
@@ -897,7 +1080,7 @@ class TimeSeries(Series):
         return self_.coherence(other, fftlength=fftlength,
                                fftstride=fftstride, window=window, **kwargs)
 
-    def rms(self, stride=1):
+    def rms(self, stride=1, duration=None):
         """Calculate the root-mean-square value of this `TimeSeries`
         once per stride.
 
@@ -905,26 +1088,110 @@ class TimeSeries(Series):
         ----------
         stride : `float`
             stride (seconds) between RMS calculations
+        duration : `float`, optional, default: ``stride``
+            length (seconds) of the window over which to calculate the
+            RMS, give ``duration > stride`` for overlapping windows
 
         Returns
         -------
         rms : `TimeSeries`
             a new `TimeSeries` containing the RMS value with dt=stride
+
+        See Also
+        --------
+        TimeSeries.stat
+            for details of the windowing
         """
-        stridesamp = stride * self.sample_rate.value
-        nsteps = int(self.size // stridesamp)
-        # stride through TimeSeries, recording RMS
-        data = numpy.zeros(nsteps)
-        for step in range(nsteps):
-            # find step TimeSeries
-            idx = stridesamp * step
-            idx_end = idx + stridesamp
-            stepseries = self[idx:idx_end]
-            rms_ = numpy.sqrt(numpy.mean(numpy.absolute(stepseries.data)**2))
-            data[step] = rms_
-        name = '%s %.2f-second RMS' % (self.name, stride)
-        return self.__class__(data, channel=self.channel, epoch=self.epoch,
-                              name=name, sample_rate=(1/float(stride)))
+        return self.stat('rms', stride=stride, duration=duration)
+
+    def stat(self, method, stride=1, duration=None, percentile=None):
+        """Calculate a statistic of this `TimeSeries` once per stride.
+
+        The `method` argument can be one of
+
+            * 'rms'
+            * 'mean'
+            * 'median'
+            * 'min'
+            * 'max'
+            * 'std'
+            * 'percentile'
+
+        Parameters
+        ----------
+        method : `str`
+            statistic to calculate in each window
+        stride : `float`
+            stride (seconds) between calculations, need not be an
+            integer number of samples
+        duration : `float`, optional, default: ``stride``
+            length (seconds) of the window over which to calculate the
+            statistic, give ``duration > stride`` for overlapping windows
+        percentile : `float`, optional
+            percentile (0 - 100) to calculate, required for
+            ``method='percentile'``
+
+        Returns
+        -------
+        out : `TimeSeries`
+            a new `TimeSeries` containing the statistic with dt=stride,
+            each sample is calculated from the window starting at that
+            sample's time
+
+        Notes
+        -----
+        For fractional-sample strides, the start of each window is
+        rounded to the nearest sample. All windows are evaluated at once
+        from a strided view of the data, in blocks to bound memory usage.
+        """
+        try:
+            func = _WINDOW_STATS[method.lower()]
+        except KeyError:
+            raise ValueError("'method' must be one of: '%s'"
+                             % "','".join(sorted(_WINDOW_STATS)))
+        if method.lower() == 'percentile':
+            if percentile is None:
+                raise ValueError("percentile must be given for "
+                                 "method='percentile'")
+            func = lambda x, axis: numpy.percentile(x, percentile, axis=axis)
+        if duration is None:
+            duration = stride
+        sampling = self.sample_rate.value
+        stridesamp = stride * sampling
+        winsamp = int(round(duration * sampling))
+        if winsamp < 1:
+            raise ValueError("Cannot calculate %s over window shorter than "
+                             "one sample" % method)
+        data = self.data
+        # find start index of each window
+        if self.size < winsamp:
+            nsteps = 0
+        else:
+            nsteps = int(floor((self.size - winsamp) / stridesamp + 1e-9)) + 1
+        if not nsteps:
+            out = numpy.zeros(0)
+        elif stridesamp == winsamp:
+            # non-overlapping integer strides: reshape without copying
+            windows = data[:nsteps*winsamp].reshape((nsteps, winsamp) +
+                                                     data.shape[1:])
+            out = func(windows, axis=1)
+        else:
+            starts = numpy.round(numpy.arange(nsteps) *
+                                 stridesamp).astype(int)
+            windows = numpy.lib.stride_tricks.as_strided(
+                data, shape=(self.size - winsamp + 1, winsamp),
+                strides=(data.strides[0], data.strides[0]))
+            out = numpy.zeros(nsteps, dtype=func(windows[:1], axis=1).dtype)
+            nblock = max(1, 2 ** 22 // winsamp)
+            for i in range(0, nsteps, nblock):
+                out[i:i+nblock] = func(windows[starts[i:i+nblock]], axis=1)
+        if method.lower() == 'rms':
+            name = '%s %.2f-second RMS' % (self.name, stride)
+        else:
+            name = '%s %.2f-second %s' % (self.name, stride, method)
+        return self.__class__(out, channel=self.channel, epoch=self.epoch,
+                              name=name, unit=self.unit,
+                              sample_rate=(1/float(stride)))
 
     # -------------------------------------------
     # connectors
@@ -1076,8 +1343,21 @@ class TimeSeries(Series):
         return TimeSeriesPlot(self, **kwargs)
 
     @classmethod
-    def from_lal(cls, lalts):
+    def from_lal(cls, lalts, copy=False):
         """Generate a new TimeSeries from a LAL TimeSeries of any type.
+
+        Parameters
+        ----------
+        lalts : :lalsuite:`XLALREAL8TimeSeries`
+            input LAL TimeSeries of any type
+        copy : `bool`, optional, default: `False`
+            copy the data into new memory, otherwise the new `TimeSeries`
+            shares the memory of the LAL TimeSeries
+
+        Returns
+        -------
+        timeseries : `TimeSeries`
+            a new `TimeSeries` with the data and metadata of the input
         """
         # write Channel
         try:
@@ -1087,14 +1367,32 @@ class TimeSeries(Series):
                               "www.lsc-group.phys.uwm.edu/daswg/"
                               "projects/lalsuite.html for installation "
                               "instructions")
+        data = lalts.data.data
         channel = Channel(lalts.name, 1/lalts.deltaT,
                           unit=UnitToString(lalts.sampleUnits),
-                          dtype=lalts.data.data.dtype)
-        return cls(lalts.data.data, channel=channel, epoch=lalts.epoch,
-                   unit=UnitToString(lalts.sampleUnits), copy=True)
+                          dtype=data.dtype)
+        new = cls(data, channel=channel, epoch=lalts.epoch,
+                  unit=UnitToString(lalts.sampleUnits), copy=copy)
+        if not copy:
+            # record the source so that to_lal can return it without copying
+            new._lal = lalts
+        return new
 
-    def to_lal(self):
+    def to_lal(self, copy=False):
         """Convert this `TimeSeries` into a LAL TimeSeries.
+
+        Parameters
+        ----------
+        copy : `bool`, optional, default: `False`
+            always copy the data into a new LAL TimeSeries, otherwise,
+            if this `TimeSeries` is a complete view of the LAL TimeSeries
+            it was created from via :meth:`TimeSeries.from_lal`, that
+            LAL TimeSeries is returned with its metadata updated
+
+        Returns
+        -------
+        lalts : :lalsuite:`XLALREAL8TimeSeries`
+            a LAL TimeSeries of the relevant type
         """
         try:
             import lal
@@ -1105,6 +1403,13 @@ class TimeSeries(Series):
                               "instructions")
         else:
             from lal import utils as lalutils
+        lalts = getattr(self, '_lal', None)
+        if (not copy and lalts is not None and
+                _shares_buffer(self.data, lalts.data.data)):
+            lalts.name = str(self.name)
+            lalts.epoch = lal.LIGOTimeGPS(self.epoch.gps)
+            lalts.deltaT = self.dt.value
+            return lalts
         laltype = lalutils.LAL_TYPE_FROM_NUMPY[self.dtype.type]
         typestr = lalutils.LAL_TYPE_STR[laltype]
         create = getattr(lal, 'Create%sTimeSeries' % typestr.upper())
@@ -1175,7 +1480,7 @@ class TimeSeries(Series):
             except KeyError:
                 op_ = ufunc.__name__
             result = obj.view(StateTimeSeries)
-            result.metadata = self.metadata.copy()
+            result._metadata = self._metadata.copy()
             result.unit = ""
             result.name = '%s %s %s' % (obj.name, op_, value)
             if hasattr(obj, 'unit') and str(obj.unit):
@@ -1186,6 +1491,29 @@ class TimeSeries(Series):
         return result
 
 
+def _shares_buffer(a, b):
+    """Determine whether two arrays are identical views of the same memory
+    """
+    return (a.dtype == b.dtype and a.shape == b.shape and
+            a.strides == b.strides and
+            a.__array_interface__['data'][0] ==
+            b.__array_interface__['data'][0])
+
+
+def _sample_index(gpstime, x0, dx, precision=1e-6):
+    """Return the index of the first sample at or after the given time
+
+    Sample positions within ``precision`` (in units of ``dx``) of the
+    given time are treated as coincident with it, to guard against
+    floating-point rounding of GPS times.
+    """
+    idx = (float(gpstime) - x0) / dx
+    nearest = round(idx)
+    if abs(idx - nearest) < precision:
+        return int(nearest)
+    return int(ceil(idx))
+
+
 class ArrayTimeSeries(TimeSeries, Array2D):
     xunit = TimeSeries.xunit
     def __new__(cls, data, times=None, epoch=None, channel=None, unit=None,
@@ -1260,14 +1588,16 @@ class TimeSeriesList(list):
         N = len(self)
         while j < N:
             this = self[j]
-            j += 1
-            if j < N and this.span[1] >= self[j].span[0]:
-                while j < N and this.span[1] >= self[j].span[0]:
-                    this = self[i] = this.append(self[j])
-                    j += 1
-            else:
-                self[i] = this
+            k = j + 1
+            end = this.span[1]
+            while k < N and end >= self[k].span[0]:
+                end = max(end, self[k].span[1])
+                k += 1
+            if k - j > 1:
+                this = self._join(self[j:k])
+            self[i] = this
             i += 1
+            j = k
         del self[i:]
         return self
 
@@ -1275,6 +1605,11 @@ class TimeSeriesList(list):
         """Concatenate all of the `TimeSeries` in this list into a
         a single object
 
+        Parameters
+        ----------
+        pad : `float`, optional, default: ``0.0``
+            value with which to fill gaps between entries
+
         Returns
         -------
         `TimeSeries`
@@ -1282,7 +1617,935 @@ class TimeSeriesList(list):
              in this list
         """
         self.sort(key=lambda ts: ts.x0.value)
-        out = self[0].copy()
-        for ts in self[1:]:
-            out.append(ts, gap='pad', pad=pad)
-        return out
+        return self._join(self, pad=pad)
+
+    @staticmethod
+    def _join(items, pad=0.0, start=None, end=None):
+        """Copy a time-ordered list of entries into a single new object
+
+        The output is allocated once to cover the full span of all entries,
+        extended to the GPS ``[start, end)`` span if given, with each entry
+        copied into place, and any gaps filled with ``pad``.
+        """
+        first = items[0]
+        dx = first.dx.value
+        if start is None:
+            x0 = first.x0.value
+        else:
+            x0 = start
+        # find the position of each entry in the output
+        offsets = []
+        for item in items:
+            first.is_compatible(item)
+            offsets.append(int(round((item.x0.value - x0) / dx)))
+        size = max(o + item.shape[0] for (o, item) in zip(offsets, items))
+        if end is not None:
+            size = max(size, int(round((end - x0) / dx)))
+        shape = (size,) + first.shape[1:]
+        # allocate output
+        if pad:
+            data = numpy.empty(shape, dtype=first.dtype)
+        else:
+            data = numpy.zeros(shape, dtype=first.dtype)
+        # copy data and fill gaps
+        stop = 0
+        for offset, item in zip(offsets, items):
+            if offset < stop:
+                raise ValueError("Cannot join overlapping %s"
+                                 % type(item).__name__)
+            if pad:
+                data[stop:offset] = pad
+            stop = offset + item.shape[0]
+            data[offset:stop] = item.data
+        if pad:
+            data[stop:] = pad
+        new = data.view(first.__class__)
+        new._metadata = first._metadata.copy()
+        if start is not None:
+            new.x0 = x0
+        return new
+
+
+class TimeSeriesDict(OrderedDict):
+    """Ordered key-value mapping of named `TimeSeries` containing data
+    for many channels over the same time interval.
+
+    The `TimeSeriesDict` allows data for many channels to be read from
+    frames, or fetched from NDS, in a single I/O pass.
+
+    Methods
+    -------
+    read
+    fetch
+    """
+    EntryClass = TimeSeries
+
+    @classmethod
+    def read(cls, source, channels, start=None, end=None, datatype=None,
+             verbose=False, nproc=1, pad=None):
+        """Read data for multiple channels into a `TimeSeriesDict` from
+        files on disk.
+
+        The frame stream for the source is opened once, with data for
+        all channels read from each frame in turn. With ``nproc > 1``,
+        the files in a cache are shared between that many processes.
+
+        Parameters
+        ----------
+        source : `str`, :class:`glue.lal.Cache`, :lalsuite:`LALCache`
+            source for data, one of:
+
+            - a filepath for a GWF-format frame file,
+            - a filepath for a LAL-format Cache file
+            - a Cache object from GLUE or LAL
+
+        channels : `list`
+            list of channels (names or objects) to read
+        start : :class:`~gwpy.time.Time`, `float`, optional
+            start GPS time of desired data
+        end : :class:`~gwpy.time.Time`, `float`, optional
+            end GPS time of desired data
+        datatype : `type`, `numpy.dtype`, `str`, optional
+            identifier for desired output data type
+        verbose : `bool`, optional
+            print verbose output
+        nproc : `int`, optional, default: 1
+            number of parallel processes with which to read data, only
+            used when reading from a cache of more than one file
+        pad : `float`, optional, default: `None`
+            value with which to fill gaps in the cache when reading in
+            parallel, including before the first file or after the last,
+            so that the output spans ``[start, end)``, by default any gap
+            raises a `ValueError`
+
+        Returns
+        -------
+        TimeSeriesDict
+            a new `TimeSeriesDict` containing data for each channel,
+            keyed in the order given
+        """
+        from lalframe import frread
+        channels = list(channels)
+        names = [isinstance(c, Channel) and c.name or str(c)
+                 for c in channels]
+        if nproc > 1:
+            cache = _parse_cache(source)
+            if cache is not None and len(cache) > 1:
+                data = _read_parallel(cache, names, start=start, end=end,
+                                      datatype=datatype, nproc=nproc,
+                                      pad=pad, verbose=verbose,
+                                      entryclass=cls.EntryClass)
+                return cls(zip(channels, data))
+        if start and isinstance(start, Time):
+            start = start.gps
+        if end and isinstance(end, Time):
+            end = end.gps
+        if start and end:
+            duration = end-start
+        elif end:
+            raise ValueError("If `end` is given to %s.read, `start` "
+                             "must also be given" % cls.__name__)
+        else:
+            duration = None
+        lalts = frread.read_timeseries(source, names, start=start,
+                                       duration=duration, datatype=datatype,
+                                       verbose=verbose)
+        new = cls()
+        for channel, ts in zip(channels, lalts):
+            new[channel] = cls.EntryClass.from_lal(ts)
+        return new
+
+    @classmethod
+    def fetch(cls, channels, start, end, host=None, port=None,
+              verbose=False, connection=None, ndschanneltype=None,
+              chunksize=None, nretry=2, race=False):
+        """Fetch data for multiple channels from NDS into a
+        `TimeSeriesDict`.
+
+        Data for all channels are retrieved in a single request to the
+        NDS server.
+
+        Parameters
+        ----------
+        channels : `list`
+            list of channels (names or objects) to fetch
+        start : `~gwpy.time.Time`, or float
+            GPS start time of data span
+        end : `~gwpy.time.Time`, or float
+            GPS end time of data span
+        host : `str`, optional
+            URL of NDS server to use, defaults to observatory site host
+        port : `int`, optional
+            port number for NDS server query, must be given with `host`
+        verbose : `bool`, optional
+            print verbose output about NDS progress
+        connection : :class:`~gwpy.io.nds.NDS2Connection`
+            open NDS connection to use
+        ndschanneltype : `int`
+            NDS2 channel type integer
+        chunksize : `int`, optional
+            number of seconds of data in a single request, by default
+            the full span is requested at once
+        nretry : `int`, optional, default: 2
+            number of times to retry a failed request, only used with
+            ``chunksize``
+        race : `bool`, optional, default: `False`
+            probe all known servers at once, and fetch data from the
+            first to respond with all of the channels, rather than trying
+            each server in turn, only used if neither ``host`` nor
+            ``connection`` is given
+
+        Returns
+        -------
+        TimeSeriesDict
+            a new `TimeSeriesDict` containing data for each channel,
+            keyed in the order given
+        """
+        channels = list(channels)
+        kwargs = dict(host=host, port=port, verbose=verbose,
+                      connection=connection, ndschanneltype=ndschanneltype,
+                      entryclass=cls.EntryClass, race=race)
+        if chunksize:
+            data = _fetch_chunked(channels, start, end, chunksize,
+                                  nretry=nretry, **kwargs)
+        else:
+            data = _fetch(channels, start, end, **kwargs)
+        return cls(zip(channels, data))
+
+    @classmethod
+    def fetch_chunks(cls, channels, start, end, chunksize, host=None,
+                     port=None, verbose=False, connection=None,
+                     ndschanneltype=None, nretry=2, race=False,
+                     prefetch=1):
+        """Fetch data for multiple channels from NDS in consecutive chunks
+
+        See :meth:`TimeSeries.fetch_chunks` for details of the arguments.
+
+        Returns
+        -------
+        iterator
+            a generator yielding a new `TimeSeriesDict` for each chunk
+        """
+        channels = list(channels)
+        for data in _fetch_chunks(channels, start, end, chunksize,
+                                  nretry=nretry, host=host, port=port,
+                                  verbose=verbose, connection=connection,
+                                  ndschanneltype=ndschanneltype,
+                                  entryclass=cls.EntryClass, race=race,
+                                  prefetch=prefetch):
+            yield cls(zip(channels, data))
+
+
+def _fetch(channels, start, end, host=None, port=None, verbose=False,
+           connection=None, ndschanneltype=None, entryclass=TimeSeries,
+           race=False, outputcontext=None):
+    """Fetch data for a list of channels from NDS, or the local cache
+
+    If the ``GWPY_NDS_CACHE`` environment variable is set, data are read
+    from the :class:`~gwpy.io.nds.NDSCache` in that directory, with only
+    those intervals not already held in the cache fetched from NDS. The
+    sample rate of each channel given by name only is taken from the
+    :class:`~gwpy.io.nds.ChannelCatalogue`, if configured.
+
+    See :meth:`TimeSeriesDict.fetch` for details of the arguments.
+
+    Returns
+    -------
+    data : `list`
+        a list of ``entryclass`` objects, one for each channel, in the
+        order given
+    """
+    from ..io import nds as ndsio
+    cache = ndsio.NDSCache.from_env()
+    if cache is None:
+        return _fetch_nds(channels, start, end, host=host, port=port,
+                          verbose=verbose, connection=connection,
+                          ndschanneltype=ndschanneltype,
+                          entryclass=entryclass, race=race,
+                          outputcontext=outputcontext)
+    start = int(floor(isinstance(start, Time) and start.gps or start))
+    end = int(ceil(isinstance(end, Time) and end.gps or end))
+    names = list(map(str, channels))
+    ctypes = [ndschanneltype or (isinstance(c, Channel) and c.type) or
+              'any' for c in channels]
+    rates = [isinstance(c, Channel) and c.sample_rate is not None and
+             c.sample_rate.value or None for c in channels]
+    catalogue = connection is None and ndsio.ChannelCatalogue.from_env()
+    if catalogue:
+        for i, (name, ctype) in enumerate(zip(names, ctypes)):
+            if rates[i] is None:
+                match = catalogue.channel(name, host=host, port=port,
+                                          ctype=ctype)
+                if match is not None:
+                    rates[i] = match.sample_rate.value
+    missing = [cache.missing(name, ctype, start, end, rate=rate) for
+               (name, ctype, rate) in zip(names, ctypes, rates)]
+    # fetch each missing interval once, for all channels that need it
+    for seg in sorted(set(seg for segs in missing for seg in segs)):
+        need = [i for i, segs in enumerate(missing) if seg in segs]
+        if verbose:
+            print("Fetching [%s, %s) for %d channels not found in cache"
+                  % (seg[0], seg[1], len(need)))
+        data = _fetch_nds([channels[i] for i in need], seg[0], seg[1],
+                          host=host, port=port, verbose=verbose,
+                          connection=connection,
+                          ndschanneltype=ndschanneltype, race=race,
+                          outputcontext=outputcontext)
+        # defer eviction until the output has been read back, so that
+        # data needed for this request are not removed
+        for i, ts in zip(need, data):
+            cache.store(names[i], ctypes[i], ts, evict=False)
+            rates[i] = ts.sample_rate.value
+    out = []
+    keep = []
+    for i, (name, ctype, rate) in enumerate(zip(names, ctypes, rates)):
+        keep.extend(cache.pieces(name, ctype, start, end, rate=rate))
+        try:
+            out.append(cache.get(name, ctype, start, end, entryclass,
+                                 rate=rate))
+        except KeyError:
+            # cached data were removed (e.g. by another process) after
+            # being checked, so fetch the whole interval again
+            if verbose:
+                print("Cached data for %s incomplete, fetching [%s, %s)"
+                      % (name, start, end))
+            out.extend(_fetch_nds([channels[i]], start, end, host=host,
+                                  port=port, verbose=verbose,
+                                  connection=connection,
+                                  ndschanneltype=ndschanneltype,
+                                  entryclass=entryclass, race=race,
+                                  outputcontext=outputcontext))
+    cache.evict(keep=keep)
+    return out
+
+
+def _fetch_retry(channels, start, end, nretry=2, **kwargs):
+    """Fetch data from NDS, retrying failed requests
+
+    See :func:`_fetch` for details of the other arguments.
+    """
+    from ..io import nds as ndsio
+    for attempt in range(nretry + 1):
+        try:
+            return _fetch(channels, start, end, **kwargs)
+        except RuntimeError as e:
+            if attempt == nretry:
+                raise
+            warnings.warn("Request for [%s, %s) failed, retrying: %s"
+                          % (start, end, str(e)), ndsio.NDSWarning)
+
+
+def _fetch_chunks(channels, start, end, chunksize, nretry=2, prefetch=1,
+                  **kwargs):
+    """Fetch data from NDS in consecutive chunks
+
+    Requests for up to ``prefetch`` chunks ahead of the one being consumed
+    are kept running in background threads, so that the transfer of the
+    following chunks overlaps with the processing of the current one.
+    Output from the NDS client in those threads is not redirected.
+
+    See :meth:`TimeSeries.fetch_chunks` for details of the arguments.
+
+    Returns
+    -------
+    iterator
+        a generator yielding, for each chunk, a list of data for each
+        channel
+    """
+    from collections import deque
+    from multiprocessing.pool import ThreadPool
+    start = int(floor(isinstance(start, Time) and start.gps or start))
+    end = int(ceil(isinstance(end, Time) and end.gps or end))
+    chunksize = int(chunksize)
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive number of seconds")
+    prefetch = int(prefetch)
+    if prefetch < 1:
+        raise ValueError("prefetch must be a positive number of chunks")
+    blocks = deque((t, min(t + chunksize, end)) for t in
+                   range(start, end, chunksize))
+    if not blocks:
+        return
+    # a single open connection cannot serve concurrent requests
+    if kwargs.get('connection') is not None:
+        nproc = 1
+    else:
+        nproc = min(prefetch, len(blocks))
+    # requests run in background threads, alongside the caller, so must
+    # not redirect sys.stdout
+    kwargs['outputcontext'] = _NoOutputContext()
+    pool = ThreadPool(processes=nproc)
+    try:
+        def request(block):
+            return pool.apply_async(_fetch_retry, (channels,) + block,
+                                    dict(nretry=nretry, **kwargs))
+        pending = deque()
+        while blocks or pending:
+            # keep the current chunk plus ``prefetch`` more in flight
+            while blocks and len(pending) <= prefetch:
+                pending.append(request(blocks.popleft()))
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+
+
+def _fetch_chunked(channels, start, end, chunksize, nretry=2, **kwargs):
+    """Fetch data from NDS in consecutive chunks, copying each into a
+    single, preallocated, output for each channel
+
+    Returns
+    -------
+    data : `list`
+        a list of data for each channel, in the order given
+    """
+    start = int(floor(isinstance(start, Time) and start.gps or start))
+    end = int(ceil(isinstance(end, Time) and end.gps or end))
+    out = None
+    for chunk in _fetch_chunks(channels, start, end, chunksize,
+                               nretry=nretry, **kwargs):
+        if out is None:
+            out = []
+            for ts in chunk:
+                size = int(ceil((end - ts.x0.value) * ts.sample_rate.value
+                                - 1e-6))
+                new = numpy.zeros((size,) + ts.shape[1:],
+                                  dtype=ts.dtype).view(ts.__class__)
+                new._metadata = ts._metadata.copy()
+                out.append(new)
+        for new, ts in zip(out, chunk):
+            offset = int(round((ts.x0.value - new.x0.value) /
+                               new.dx.value))
+            n = min(ts.shape[0], new.shape[0] - offset)
+            new.data[offset:offset+n] = ts.data[:n]
+    return out
+
+
+def _fetch_nds(channels, start, end, host=None, port=None, verbose=False,
+               connection=None, ndschanneltype=None, entryclass=TimeSeries,
+               race=False, outputcontext=None):
+    """Fetch data for a list of channels from NDS in a single request
+
+    Unless a host or connection is given, the known servers are tried
+    in order of their recorded response times. If ``race`` is `True`,
+    all servers are probed at once, see :func:`_fetch_race`.
+
+    Output from the NDS client is redirected by ``outputcontext``, if
+    given, otherwise it is discarded unless ``verbose`` is `True`.
+
+    See :meth:`TimeSeriesDict.fetch` for details of the arguments.
+
+    Returns
+    -------
+    data : `list`
+        a list of ``entryclass`` objects, one for each channel, in the
+        order given
+    """
+    # import module and type-cast arguments
+    from ..io import nds as ndsio
+    import nds2
+    start = int(floor(isinstance(start, Time) and start.gps or start))
+    end = int(ceil(isinstance(end, Time) and end.gps or end))
+    # set context
+    if outputcontext is None and verbose:
+        outputcontext = ndsio.NDSOutputContext()
+    elif outputcontext is None:
+        outputcontext = _NullOutputContext()
+    # get type for each channel, an explicit ndschanneltype takes
+    # precedence over the type of each Channel
+    default = (nds2.channel.CHANNEL_TYPE_RAW |
+               nds2.channel.CHANNEL_TYPE_RDS |
+               nds2.channel.CHANNEL_TYPE_STREND |
+               nds2.channel.CHANNEL_TYPE_MTREND)
+    ctypes = [ndschanneltype or (isinstance(c, Channel) and c.type) or
+              default for c in channels]
+    names = list(map(str, channels))
+
+    # local channel catalogue, not used with a user-supplied connection
+    if connection is None:
+        catalogue = ndsio.ChannelCatalogue.from_env()
+    else:
+        catalogue = None
+    pool = ndsio.CONNECTION_POOL
+    # user-defined host or open connection
+    if connection or host:
+        hostlist = [(host, port)]
+    # logical host resolution order, fastest first
+    else:
+        hostlist = pool.rank(ndsio.host_resolution_order(
+            Channel(names[0]).ifo))
+        # try first those hosts known to hold the channels
+        if catalogue is not None:
+            known = catalogue.hosts(names[0], ctype=ctypes[0])
+            hostlist.sort(key=lambda hp: hp not in known)
+        if race and len(hostlist) > 1:
+            return _fetch_race(hostlist, names, ctypes, start, end,
+                               verbose=verbose, outputcontext=outputcontext,
+                               catalogue=catalogue, entryclass=entryclass)
+
+    # loop hosts, stopping on first success
+    for host,port in hostlist:
+        # take an open connection from the pool if needed
+        if connection:
+            _conn = connection
+            with outputcontext:
+                found = _resolve_channels(connection, names, ctypes,
+                                          host=host, port=port,
+                                          connection=connection)
+        else:
+            _conn, found = _probe(host, port, names, ctypes,
+                                  outputcontext=outputcontext,
+                                  catalogue=catalogue, verbose=verbose)
+        failed = False
+        try:
+            out = _fetch_buffers(_conn, found, start, end, verbose=verbose,
+                                 outputcontext=outputcontext,
+                                 entryclass=entryclass)
+        except RuntimeError as e:
+            failed = True
+            # if error and user supplied their own server, raise
+            if connection:
+                raise
+            # otherwise warn and move on
+            if verbose:
+                warnings.warn(str(e), ndsio.NDSWarning)
+            out = None
+        except:
+            failed = True
+            raise
+        finally:
+            # a connection whose request failed may be left mid-transfer
+            if not connection:
+                pool.release(host, port, _conn, discard=failed)
+        if out is not None:
+            return out
+    raise RuntimeError("Cannot find relevant data on any known server")
+
+
+class _NoOutputContext(object):
+    """Context that leaves output untouched
+
+    Redirecting `sys.stdout` is not safe when more than one thread is
+    talking to NDS at once.
+    """
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+class _Cancelled(Exception):
+    """Raised by a request to NDS that is no longer required
+    """
+    pass
+
+
+class _NullOutputContext(object):
+    """Context that redirects output to `os.devnull`
+
+    The null device is opened on entry, and closed again on exit.
+    """
+    def __enter__(self):
+        from ..io.nds import NDSOutputContext
+        self._devnull = open(os.devnull, 'w')
+        self._context = NDSOutputContext(self._devnull, self._devnull)
+        self._context.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self._context.__exit__(exc_type, exc_value, traceback)
+        finally:
+            self._devnull.close()
+
+
+def _fetch_race(hostlist, names, ctypes, start, end, verbose=False,
+                outputcontext=None, catalogue=None, entryclass=TimeSeries):
+    """Fetch data for a list of channels from the first NDS server to
+    respond
+
+    All servers are probed at once, each in its own thread, by opening
+    a connection and resolving the channels. Data are fetched from the
+    first server to confirm all of the channels, falling back to the
+    next to respond if that server cannot serve the requested span.
+    Probes still running while data are fetched from a server are
+    cancelled before they resolve any channels, and those still running
+    once the data have been retrieved have their connections closed as
+    they complete.
+
+    Returns
+    -------
+    data : `list`
+        a list of ``entryclass`` objects, one for each channel, in the
+        order given
+    """
+    from ..io import nds as ndsio
+    import threading
+    try:
+        from Queue import Queue
+    except ImportError:
+        from queue import Queue
+    pool = ndsio.CONNECTION_POOL
+    results = Queue()
+    quiet = _NoOutputContext()
+    cancel = threading.Event()
+
+    def probe(host, port):
+        try:
+            conn, found = _probe(host, port, names, ctypes,
+                                 outputcontext=quiet, catalogue=catalogue,
+                                 cancel=cancel)
+        except Exception as e:
+            results.put((host, port, None, e))
+        else:
+            results.put((host, port, conn, found))
+
+    def abandon(n):
+        for i in range(n):
+            host, port, conn, _ = results.get()
+            if conn is not None:
+                pool.release(host, port, conn, discard=True)
+
+    for host, port in hostlist:
+        thread = threading.Thread(target=probe, args=(host, port))
+        thread.daemon = True
+        thread.start()
+
+    pending = len(hostlist)
+    try:
+        while pending:
+            host, port, conn, found = results.get()
+            pending -= 1
+            if conn is None:
+                if verbose and not isinstance(found, _Cancelled):
+                    warnings.warn("Failed to query %s:%s: %s"
+                                  % (host, port, str(found)),
+                                  ndsio.NDSWarning)
+                continue
+            if verbose:
+                print("Using %s:%s" % (host, port))
+            # stop the other probes while this server is tried
+            cancel.set()
+            failed = False
+            try:
+                out = _fetch_buffers(conn, found, start, end,
+                                     verbose=verbose,
+                                     outputcontext=outputcontext,
+                                     entryclass=entryclass)
+            except RuntimeError as e:
+                failed = True
+                if verbose:
+                    warnings.warn(str(e), ndsio.NDSWarning)
+                out = None
+            except:
+                failed = True
+                raise
+            finally:
+                pool.release(host, port, conn, discard=failed)
+            if out is not None:
+                return out
+            # fall back to those probes not yet cancelled
+            cancel.clear()
+    finally:
+        cancel.set()
+        if pending:
+            thread = threading.Thread(target=abandon, args=(pending,))
+            thread.daemon = True
+            thread.start()
+    raise RuntimeError("Cannot find relevant data on any known server")
+
+
+def _probe(host, port, names, ctypes, outputcontext=None, catalogue=None,
+           verbose=False, cancel=None):
+    """Open a connection to an NDS server, and resolve a list of
+    channels against it
+
+    The time taken is recorded in the
+    :data:`~gwpy.io.nds.CONNECTION_POOL`, to rank the server for later
+    requests. If the ``cancel`` `threading.Event` is set once the
+    connection is open, the connection is closed, and `_Cancelled`
+    raised, before any channels are resolved.
+
+    Returns
+    -------
+    connection : :class:`nds2.connection`
+        the open connection, which must be returned to the pool
+    found : `list`
+        the matching name on the server for each channel, or `None` for
+        those channels with no match
+    """
+    from ..io import nds as ndsio
+    pool = ndsio.CONNECTION_POOL
+    t0 = time.time()
+    try:
+        conn = pool.acquire(host, port, outputcontext=outputcontext,
+                            verbose=verbose)
+    except:
+        pool.record_latency(host, port, None)
+        raise
+    if cancel is not None and cancel.is_set():
+        pool.release(host, port, conn, discard=True)
+        raise _Cancelled("Request to %s:%s cancelled" % (host, port))
+    try:
+        with outputcontext:
+            found = _resolve_channels(conn, names, ctypes, host=host,
+                                      port=port, catalogue=catalogue)
+    except:
+        pool.release(host, port, conn, discard=True)
+        pool.record_latency(host, port, None)
+        raise
+    pool.record_latency(host, port, time.time() - t0)
+    return conn, found
+
+
+def _resolve_channels(conn, names, ctypes, host=None, port=None,
+                      connection=None, catalogue=None):
+    """Resolve a list of channel names against an NDS server
+
+    Channel names are resolved against the given
+    :class:`~gwpy.io.nds.ChannelCatalogue`, if given, so that the
+    catalogue's time-to-live applies, otherwise against the server
+    directly, re-using earlier results.
+
+    Returns
+    -------
+    found : `list`
+        the matching name on the server for each channel, or `None` for
+        those channels with no match
+    """
+    from ..io import nds as ndsio
+    pool = ndsio.CONNECTION_POOL
+    if catalogue is not None:
+        catalogue.refresh(host, port, conn)
+        return [catalogue.resolve(name, host, port, ctype=ctype,
+                                  strict=bool(connection)) for
+                (name, ctype) in zip(names, ctypes)]
+    found = []
+    for name, ctype in zip(names, ctypes):
+        key = (host, port, name, ctype)
+        try:
+            found.append(pool.channels[key])
+        except KeyError:
+            match = _find_channel(conn, name, ctype, strict=bool(connection))
+            if match is not None and not connection:
+                pool.channels[key] = match
+            found.append(match)
+    return found
+
+
+def _fetch_buffers(conn, found, start, end, verbose=False,
+                   outputcontext=None, entryclass=TimeSeries):
+    """Fetch data for a list of resolved channels over an open NDS
+    connection
+
+    Returns
+    -------
+    data : `list`
+        a list of ``entryclass`` objects, one for each channel, in the
+        order given, or `None` if the channels could not be found on this
+        server
+
+    Raises
+    ------
+    RuntimeError
+        if the request to the server failed, in which case the connection
+        should not be reused
+    """
+    from ..io import nds as ndsio
+    with outputcontext:
+        if None in found:
+            # if no channels and user didn't supply their own server
+            # warn and move one
+            if verbose:
+                warnings.warn("No matching channels found",
+                              ndsio.NDSWarning)
+            return None
+        if (any(name.endswith('m-trend') for name in found) and
+                (start % 60 or end % 60)):
+            warnings.warn("Requested channel is minute trend, but "
+                          "start and stop GPS times are not modulo "
+                          "60-seconds (from GPS epoch). Times will be "
+                          "expanded outwards to compensate")
+            if start % 60:
+                start = start // 60 * 60
+            if end % 60:
+                end = end // 60 * 60 + 60
+        # fetch data
+        if verbose:
+            print("Downloading data...")
+        buffers = conn.fetch(start, end, found)
+    # cast as TimeSeries and return
+    out = []
+    for buffer_ in buffers:
+        epoch = Time(buffer_.gps_seconds, buffer_.gps_nanoseconds,
+                     format='gps')
+        channel = Channel.from_nds2(buffer_.channel)
+        out.append(entryclass(buffer_.data, epoch=epoch, channel=channel))
+    return out
+
+
+def _find_channel(connection, name, ctype, strict=False):
+    """Resolve the name of a channel against an NDS server
+
+    Returns
+    -------
+    name : `str`
+        the name of the matching channel on the server, or `None` if
+        no match was found and ``strict`` is `False`
+
+    Raises
+    ------
+    ValueError
+        if ``strict`` is `True` and more than one partial match was found
+    """
+    if connection.find_channels(name, ctype):
+        return name
+    channels = connection.find_channels('*%s*' % name, ctype)
+    # if no channels and user didn't supply their own server, move on
+    if len(channels) == 0 and not strict:
+        return None
+    elif len(channels) == 0:
+        return name
+    # if one channel, find
+    elif len(channels) == 1:
+        return channels[0].name
+    # if more than one channel and user did supply their own server, barf
+    elif strict:
+        raise ValueError("No channel '%s' found on server. However, %d "
+                         "others were found, please restrict your search "
+                         "and try again:\n    %s"
+                         % (name, len(channels),
+                            "\n    ".join(map(str, channels))))
+    return name
+
+
+# -----------------------------------------------------------------------------
+# parallel frame reading
+
+def _parse_cache(source):
+    """Return the given source as a `~glue.lal.Cache`, if possible
+
+    Returns
+    -------
+    cache : :class:`~glue.lal.Cache`
+        the cache of files described by the source, or `None` if the
+        source is not a cache
+    """
+    from glue.lal import (Cache, CacheEntry)
+    if isinstance(source, Cache):
+        return source
+    elif isinstance(source, (list, tuple)) and all(
+            isinstance(e, CacheEntry) for e in source):
+        return Cache(source)
+    elif (isinstance(source, str) and
+            source.endswith(('.lcf', '.cache'))):
+        with open(source, 'r') as f:
+            return Cache.fromfile(f)
+    return None
+
+
+def _read_frame_segment(args):
+    """Read data for a list of channels from a single frame file
+
+    This function is executed in a worker process, and so returns only
+    simple, picklable, types.
+
+    Returns
+    -------
+    data : `list`
+        list of ``(data, epoch, dt, name, unit)`` tuples, one for each
+        channel
+    """
+    from lalframe import frread
+    from lal import UnitToString
+    path, channels, start, duration, datatype = args
+    lalts = frread.read_timeseries(path, channels, start=start,
+                                   duration=duration, datatype=datatype)
+    return [(numpy.array(ts.data.data), float(ts.epoch), ts.deltaT,
+             ts.name, UnitToString(ts.sampleUnits)) for ts in lalts]
+
+
+def _read_parallel(cache, channels, start=None, end=None, datatype=None,
+                   nproc=1, pad=None, verbose=False, entryclass=TimeSeries):
+    """Read data for a list of channels from a cache of frame files,
+    sharing the files between multiple processes
+
+    The requested span is split at the boundaries of the files in the
+    cache, with each piece read in a separate process, then all pieces
+    for each channel copied into a single, preallocated, array.
+
+    Parameters
+    ----------
+    pad : `float`, optional, default: `None`
+        value with which to fill any part of ``[start, end)`` not covered
+        by the cache, including before the first file and after the last;
+        if `None`, any such gap raises a `ValueError`
+
+    See :meth:`TimeSeriesDict.read` for details of the other arguments.
+
+    Returns
+    -------
+    data : `list`
+        a list of ``entryclass`` objects, one for each channel, in the
+        order given, each spanning ``[start, end)``
+
+    Raises
+    ------
+    ValueError
+        if ``pad`` is `None` and the cache does not cover the whole of
+        ``[start, end)``, including a gap before the first file
+    """
+    from multiprocessing import Pool
+    if isinstance(start, Time):
+        start = start.gps
+    if isinstance(end, Time):
+        end = end.gps
+    entries = sorted(cache, key=lambda e: e.segment[0])
+    if start is None:
+        start = entries[0].segment[0]
+    if end is None:
+        end = max(e.segment[1] for e in entries)
+    # split the span into non-overlapping pieces, one per file
+    tasks = []
+    covered = start
+    for entry in entries:
+        seg0 = max(entry.segment[0], covered)
+        seg1 = min(entry.segment[1], end)
+        if seg1 <= seg0:
+            continue
+        # covered starts at the requested start, so this also catches a
+        # gap before the first file
+        if seg0 > covered and pad is None:
+            raise ValueError("Cannot read data over gap in cache "
+                             "[%s, %s)" % (covered, seg0))
+        tasks.append((entry.path, list(channels), float(seg0),
+                      float(seg1 - seg0), datatype))
+        covered = seg1
+    if not tasks:
+        raise ValueError("No files in cache overlap the requested span")
+    if covered < end and pad is None:
+        raise ValueError("Cannot read data over gap in cache [%s, %s)"
+                         % (covered, end))
+    if verbose:
+        print("Reading %d files with %d processes"
+              % (len(tasks), min(nproc, len(tasks))))
+    pool = Pool(processes=min(nproc, len(tasks)))
+    try:
+        pieces = pool.map(_read_frame_segment, tasks)
+    finally:
+        pool.close()
+        pool.join()
+    # stitch the pieces for each channel into a single array
+    out = []
+    for i in range(len(channels)):
+        series = []
+        for piece in pieces:
+            data, epoch, dt, name, unit = piece[i]
+            channel = Channel(name, 1/dt, unit=unit, dtype=data.dtype)
+            series.append(entryclass(data, channel=channel, epoch=epoch,
+                                     unit=unit))
+        if pad is None:
+            out.append(TimeSeriesList._join(series))
+        else:
+            out.append(TimeSeriesList._join(series, pad=pad, start=start,
+                                            end=end))
+    return out
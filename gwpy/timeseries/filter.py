@@ -0,0 +1,220 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Stateful digital filters in second-order-section format
+
+The `Filter` records the second-order sections of a digital IIR filter,
+and the filter state following the last sample it processed, so that
+long data can be filtered in consecutive chunks with output identical to
+filtering all of the data in a single pass.
+"""
+
+import numpy
+from scipy import signal
+
+from astropy.units import Quantity
+
+from .. import version
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+__version__ = version.version
+
+__all__ = ['Filter']
+
+# cache of filter designs, keyed by (btype, order, frequencies, sample_rate)
+_DESIGN_CACHE = {}
+
+
+def _to_float(x):
+    if isinstance(x, Quantity):
+        return float(x.value)
+    return float(x)
+
+
+def butter(btype, order, frequency, sample_rate):
+    """Design a digital Butterworth filter in second-order sections
+
+    Designs are cached, so repeated calls with the same arguments are
+    free.
+
+    Parameters
+    ----------
+    btype : `str`
+        type of filter, one of 'lowpass', 'highpass', 'bandpass',
+        'bandstop'
+    order : `int`
+        order of the filter
+    frequency : `float`, `tuple`
+        corner frequency, or ``(low, high)`` pair of corner frequencies,
+        in Hertz
+    sample_rate : `float`
+        sample rate of the data to be filtered, in Hertz
+
+    Returns
+    -------
+    sos : `numpy.ndarray`
+        ``(nsections, 6)`` array of second-order sections
+    """
+    if isinstance(frequency, (tuple, list)):
+        frequency = tuple(map(_to_float, frequency))
+    else:
+        frequency = _to_float(frequency)
+    sample_rate = _to_float(sample_rate)
+    key = (btype, int(order), frequency, sample_rate)
+    try:
+        return _DESIGN_CACHE[key]
+    except KeyError:
+        nyquist = sample_rate / 2.
+        wn = numpy.asarray(frequency) / nyquist
+        z, p, k = signal.butter(int(order), wn, btype=btype, output='zpk')
+        sos = signal.zpk2sos(z, p, k)
+        sos.flags.writeable = False
+        _DESIGN_CACHE[key] = sos
+        return sos
+
+
+class Filter(object):
+    """A digital IIR filter in second-order sections, with state
+
+    Parameters
+    ----------
+    sos : `numpy.ndarray`
+        ``(nsections, 6)`` array of second-order sections, see
+        :func:`scipy.signal.sosfilt` for details
+
+    Attributes
+    ----------
+    sos
+    zi
+
+    Methods
+    -------
+    butter
+    from_zpk
+    process
+    filtfilt
+    reset
+    """
+    def __init__(self, sos):
+        """Create a new `Filter`
+        """
+        # take a writeable copy, cached designs are read-only
+        self.sos = numpy.array(sos, dtype=float, ndmin=2)
+        if self.sos.ndim != 2 or self.sos.shape[1] != 6:
+            raise ValueError("Second-order sections must have shape "
+                             "(nsections, 6)")
+        self.reset()
+
+    @classmethod
+    def butter(cls, btype, order, frequency, sample_rate):
+        """Create a new Butterworth `Filter`
+
+        Parameters
+        ----------
+        btype : `str`
+            type of filter, one of 'lowpass', 'highpass', 'bandpass',
+            'bandstop'
+        order : `int`
+            order of the filter
+        frequency : `float`, `tuple`
+            corner frequency, or ``(low, high)`` pair of corner frequencies,
+            in Hertz
+        sample_rate : `float`
+            sample rate of the data to be filtered, in Hertz
+
+        Returns
+        -------
+        filter : `Filter`
+            a new `Filter` with zero initial state
+        """
+        return cls(butter(btype, order, frequency, sample_rate))
+
+    @classmethod
+    def from_zpk(cls, zeros, poles, gain):
+        """Create a new `Filter` from digital zeros, poles, and gain
+
+        Returns
+        -------
+        filter : `Filter`
+            a new `Filter` with zero initial state
+        """
+        return cls(signal.zpk2sos(numpy.asarray(zeros), numpy.asarray(poles),
+                                  gain))
+
+    def __add__(self, other):
+        """Cascade this `Filter` with another, into a single `Filter`
+        """
+        if not isinstance(other, Filter):
+            return NotImplemented
+        return Filter(numpy.vstack((self.sos, other.sos)))
+
+    def reset(self):
+        """Reset the state of this `Filter` to zero
+        """
+        self.zi = None
+
+    def process(self, data, axis=0):
+        """Filter the next chunk of data
+
+        The state of the filter following the last sample is recorded,
+        and used as the initial state for the next call.
+
+        Parameters
+        ----------
+        data : `numpy.ndarray`
+            input data, directly following those passed in the previous
+            call
+        axis : `int`, optional, default: 0
+            axis along which to filter
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            filtered data
+        """
+        data = numpy.asarray(data)
+        if self.zi is None:
+            shape = list(data.shape)
+            shape[axis] = 2
+            self.zi = numpy.zeros([self.sos.shape[0]] + shape,
+                                  dtype=numpy.result_type(data, self.sos))
+        out, self.zi = signal.sosfilt(self.sos, data, axis=axis, zi=self.zi)
+        return out
+    __call__ = process
+
+    def filtfilt(self, data, axis=0, **kwargs):
+        """Filter the given data forwards and backwards, for zero phase
+
+        This method does not use, or update, the state of the filter.
+
+        Parameters
+        ----------
+        data : `numpy.ndarray`
+            input data
+        axis : `int`, optional, default: 0
+            axis along which to filter
+        **kwargs
+            other keyword arguments to pass to :func:`scipy.signal.sosfiltfilt`
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            filtered data
+        """
+        return signal.sosfiltfilt(self.sos, data, axis=axis, **kwargs)
+
+    def __repr__(self):
+        return '<%s(%d sections)>' % (type(self).__name__, self.sos.shape[0])
@@ -0,0 +1,631 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Lazy, block-wise processing of `TimeSeries` data
+
+A `Pipeline` records a chain of operations on a `TimeSeries`, without
+computing anything. When a result is requested, the input is read in
+blocks, each of which is passed through every operation in turn, with
+filter states, resampler histories, and partial FFT segments carried
+from one block to the next, so that the result is identical to applying
+the same operations to the full `TimeSeries`, while the memory used
+scales with the block size, rather than the length of the data.
+"""
+
+from __future__ import division
+
+import copy
+import numbers
+import warnings
+
+import numpy
+
+from astropy import units
+
+from .. import version
+from ..data.resample import (Resampler, rational_ratio)
+from ..time import Time
+from ..window import get_window
+from .core import _sample_index
+from .filter import Filter
+
+__author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
+__version__ = version.version
+
+__all__ = ['Pipeline']
+
+#: default number of input samples in a single block
+DEFAULT_BLOCK_SIZE = 2 ** 20
+
+
+# -----------------------------------------------------------------------------
+# pipeline stages
+
+class _Stage(object):
+    """A single operation in a `Pipeline`
+
+    Stages are shared by every `Pipeline` derived from the one to which
+    they were added, so are never modified. Each execution calls `start`
+    for a new copy of the stage, which carries any state between calls to
+    `process`, until `flush` returns any output held back at the end of
+    the input.
+    """
+    def start(self):
+        return self
+
+    def process(self, data):
+        raise NotImplementedError()
+
+    def flush(self):
+        return None
+
+
+class _FilterStage(_Stage):
+    def __init__(self, filt):
+        self.filt = filt
+
+    def start(self):
+        # copy the filter so that its initial state is used, but not
+        # updated, by each execution
+        new = copy.copy(self)
+        new.filt = Filter(self.filt.sos)
+        if self.filt.zi is not None:
+            new.filt.zi = self.filt.zi.copy()
+        return new
+
+    def process(self, data):
+        return self.filt.process(data, axis=0)
+
+
+class _ResampleStage(_Stage):
+    def __init__(self, up, down, window, dtype):
+        self.resampler = Resampler(up, down, window=window)
+        self.dtype = dtype
+
+    def start(self):
+        # share the filter design, but not the input history
+        new = copy.copy(self)
+        new.resampler = copy.copy(self.resampler)
+        new.resampler.reset()
+        new._dtype = None
+        return new
+
+    def process(self, data):
+        if self._dtype is None:
+            self._dtype = self.dtype or data.dtype
+        return self.resampler.process(data).astype(self._dtype, copy=False)
+
+    def flush(self):
+        out = self.resampler.flush()
+        if self._dtype is not None:
+            out = out.astype(self._dtype, copy=False)
+        return out
+
+
+class _CropStage(_Stage):
+    def __init__(self, idx0, idx1):
+        self.idx0 = idx0
+        self.idx1 = idx1
+
+    def start(self):
+        new = copy.copy(self)
+        new._position = 0
+        return new
+
+    @property
+    def done(self):
+        """`True` once all of the output of this stage has been returned
+        """
+        return self._position >= self.idx1
+
+    def process(self, data):
+        first = self._position
+        self._position += data.shape[0]
+        a = min(max(0, self.idx0 - first), data.shape[0])
+        b = min(max(a, self.idx1 - first), data.shape[0])
+        return data[a:b]
+
+
+class _ElementwiseStage(_Stage):
+    def __init__(self, ufunc, value, reflected=False):
+        self.ufunc = ufunc
+        self.value = value
+        self.reflected = reflected
+
+    def process(self, data):
+        if self.reflected:
+            return self.ufunc(self.value, data)
+        return self.ufunc(data, self.value)
+
+
+# -----------------------------------------------------------------------------
+# pipeline
+
+class Pipeline(object):
+    """Lazy, block-wise, processing plan for a `TimeSeries`
+
+    A `Pipeline` is normally created via :meth:`TimeSeries.lazy`. Each
+    operation returns a new `Pipeline` with that operation appended to
+    the plan; nothing is computed until :meth:`compute`, :meth:`blocks`,
+    :meth:`psd`, or :meth:`spectrogram` is called.
+
+    Parameters
+    ----------
+    timeseries : `TimeSeries`
+        input data, which may be backed by a memory-mapped file
+    blocksize : `int`, optional, default: 1048576
+        number of input samples in a single block
+
+    Methods
+    -------
+    filter
+    highpass
+    lowpass
+    bandpass
+    resample
+    crop
+    compute
+    blocks
+    psd
+    asd
+    spectrogram
+
+    Notes
+    -----
+    Only causal operations can be computed block by block, so zero-phase
+    (``filtfilt``) and LAL filtering are not supported. The `psd` and
+    `spectrogram` methods match those of `TimeSeries` with the ``numpy``
+    backend.
+
+    Examples
+    --------
+    >>> specgram = (data.lazy(blocksize=2**20).highpass(10)
+    ...                 .resample(256).spectrogram(4, fftlength=2))
+    """
+    def __init__(self, timeseries, blocksize=DEFAULT_BLOCK_SIZE):
+        """Create a new `Pipeline`
+        """
+        self.source = timeseries
+        self.blocksize = int(blocksize)
+        if self.blocksize <= 0:
+            raise ValueError("blocksize must be a positive number of "
+                             "samples")
+        self._stages = []
+        self._x0 = timeseries.x0.value
+        self._dx = timeseries.dx.value
+        self._size = timeseries.shape[0]
+
+    def _append(self, stage, x0=None, dx=None, size=None):
+        """Return a copy of this `Pipeline` with the given stage appended
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new._stages = self._stages + [stage]
+        if x0 is not None:
+            new._x0 = x0
+        if dx is not None:
+            new._dx = dx
+        if size is not None:
+            new._size = size
+        return new
+
+    @property
+    def sample_rate(self):
+        """Sample rate of the output of this `Pipeline`
+        """
+        return units.Quantity(1 / self._dx, units.Hertz)
+
+    @property
+    def span(self):
+        """GPS ``[start, end)`` span of the output of this `Pipeline`
+        """
+        from ..segments import Segment
+        return Segment(self._x0, self._x0 + self._size * self._dx)
+
+    def __len__(self):
+        return self._size
+
+    # -------------------------------------------
+    # operations
+
+    def filter(self, filt, filtfilt=False):
+        """Apply the given digital filter
+
+        See :meth:`TimeSeries.filter` for details of the arguments. The
+        state of a given `Filter` is used as the initial state for each
+        execution of the plan, but is not updated.
+        """
+        if filtfilt:
+            raise ValueError("Cannot apply zero-phase (filtfilt) filter "
+                             "block by block")
+        if not isinstance(filt, Filter):
+            if isinstance(filt, tuple) and len(filt) == 3:
+                filt = Filter.from_zpk(*filt)
+            else:
+                filt = Filter(filt)
+        return self._append(_FilterStage(filt))
+
+    def _check_method(self, method, filtfilt):
+        if method.lower() != 'scipy':
+            raise NotImplementedError("Filter method '%s' cannot be applied "
+                                      "block by block, please choose "
+                                      "'scipy'" % method)
+        if filtfilt:
+            raise ValueError("Cannot apply zero-phase (filtfilt) filter "
+                             "block by block")
+
+    def highpass(self, frequency, amplitude=0.9, order=8, method='scipy',
+                 filtfilt=False):
+        """Apply a Butterworth high-pass filter
+
+        See :meth:`TimeSeries.highpass` for details of the arguments.
+        """
+        self._check_method(method, filtfilt)
+        return self.filter(Filter.butter('highpass', order, frequency,
+                                         1 / self._dx))
+
+    def lowpass(self, frequency, amplitude=0.9, order=4, method='scipy',
+                filtfilt=False):
+        """Apply a Butterworth low-pass filter
+
+        See :meth:`TimeSeries.lowpass` for details of the arguments.
+        """
+        self._check_method(method, filtfilt)
+        return self.filter(Filter.butter('lowpass', order, frequency,
+                                         1 / self._dx))
+
+    def bandpass(self, flow, fhigh, amplitude=0.9, order=6, method='scipy',
+                 filtfilt=False):
+        """Apply cascaded Butterworth high- and low-pass filters
+
+        See :meth:`TimeSeries.bandpass` for details of the arguments.
+        """
+        self._check_method(method, filtfilt)
+        rate = 1 / self._dx
+        return self.filter(Filter.butter('highpass', order, flow, rate) +
+                           Filter.butter('lowpass', order, fhigh, rate))
+
+    def resample(self, rate, window=None, dtype=None, doDecimate=False):
+        """Resample to a new rate
+
+        See :meth:`TimeSeries.resample` for details of the arguments.
+        """
+        if doDecimate:
+            raise ValueError("Cannot decimate block by block, please use "
+                             "the default polyphase resampling")
+        if isinstance(rate, units.Quantity):
+            rate = rate.value
+        up, down = rational_ratio(rate, 1 / self._dx)
+        stage = _ResampleStage(up, down, window or ('kaiser', 5.0), dtype)
+        return self._append(stage, dx=1 / float(rate),
+                            size=-(-self._size * stage.resampler.up //
+                                   stage.resampler.down))
+
+    def crop(self, gpsstart, gpsend):
+        """Crop to the given GPS ``[start, end)`` `Segment`
+
+        See :meth:`TimeSeries.crop` for details of the arguments.
+        """
+        if isinstance(gpsstart, Time):
+            gpsstart = gpsstart.gps
+        if isinstance(gpsend, Time):
+            gpsend = gpsend.gps
+        span = self.span
+        if gpsstart < span[0]:
+            warnings.warn('TimeSeries.crop given GPS start earlier than '
+                          'start time of the input TimeSeries. Crop will '
+                          'begin when the TimeSeries actually starts.')
+            gpsstart = span[0]
+        if gpsend > span[1]:
+            warnings.warn('TimeSeries.crop given GPS end later than '
+                          'end time of the input TimeSeries. Crop will '
+                          'end when the TimeSeries actually ends.')
+            gpsend = span[1]
+        idx0 = _sample_index(gpsstart, self._x0, self._dx)
+        idx1 = max(idx0, _sample_index(gpsend, self._x0, self._dx))
+        return self._append(_CropStage(idx0, idx1),
+                            x0=self._x0 + idx0 * self._dx,
+                            size=idx1 - idx0)
+
+    def _elementwise(self, ufunc, value, reflected=False):
+        if not isinstance(value, numbers.Number):
+            return NotImplemented
+        return self._append(_ElementwiseStage(ufunc, value,
+                                              reflected=reflected))
+
+    def __add__(self, other):
+        return self._elementwise(numpy.add, other)
+
+    def __radd__(self, other):
+        return self._elementwise(numpy.add, other, reflected=True)
+
+    def __sub__(self, other):
+        return self._elementwise(numpy.subtract, other)
+
+    def __rsub__(self, other):
+        return self._elementwise(numpy.subtract, other, reflected=True)
+
+    def __mul__(self, other):
+        return self._elementwise(numpy.multiply, other)
+
+    def __rmul__(self, other):
+        return self._elementwise(numpy.multiply, other, reflected=True)
+
+    def __truediv__(self, other):
+        return self._elementwise(numpy.true_divide, other)
+
+    def __rtruediv__(self, other):
+        return self._elementwise(numpy.true_divide, other, reflected=True)
+
+    def __div__(self, other):
+        return self._elementwise(numpy.divide, other)
+
+    def __rdiv__(self, other):
+        return self._elementwise(numpy.divide, other, reflected=True)
+
+    def __neg__(self):
+        return self._append(_ElementwiseStage(numpy.multiply, -1))
+
+    # -------------------------------------------
+    # execution
+
+    def _run(self):
+        """Execute this `Pipeline`, yielding each block of output data
+        """
+        data = self.source.view(numpy.ndarray)
+        # crops preceded only by element-wise operations select the input
+        # directly, so that nothing outside of them is read
+        stages = list(self._stages)
+        while stages and isinstance(stages[0], (_CropStage,
+                                                _ElementwiseStage)):
+            crops = [i for i, stage in enumerate(stages) if
+                     isinstance(stage, _CropStage)]
+            if not crops or not all(isinstance(stage, _ElementwiseStage)
+                                    for stage in stages[:crops[0]]):
+                break
+            crop = stages.pop(crops[0])
+            data = data[crop.idx0:crop.idx1]
+
+        # each execution holds its own state, so that pipelines sharing
+        # stages can be executed at the same time
+        stages = [stage.start() for stage in stages]
+        crops = [i for i, stage in enumerate(stages) if
+                 isinstance(stage, _CropStage)]
+
+        def finished():
+            # index of the last crop to have returned all of its output,
+            # after which no more input is needed by any stage after it
+            for i in reversed(crops):
+                if stages[i].done:
+                    return i
+            return -1
+
+        def push(data, first):
+            for stage in stages[first:]:
+                if not data.shape[0]:
+                    break
+                data = stage.process(data)
+            return data
+
+        for i in range(0, data.shape[0], self.blocksize):
+            if finished() >= 0:
+                break
+            out = push(data[i:i+self.blocksize], 0)
+            if out.shape[0]:
+                yield out
+        last = finished()
+        for i, stage in enumerate(stages[last+1:], last + 1):
+            tail = stage.flush()
+            if tail is not None and tail.shape[0]:
+                out = push(tail, i + 1)
+                if out.shape[0]:
+                    yield out
+
+    def _wrap(self, data, x0):
+        """Wrap output data as a new `TimeSeries`
+        """
+        new = data.view(self.source.__class__)
+        new._metadata = self.source._metadata.copy()
+        new.x0 = x0
+        new.dx = self._dx
+        return new
+
+    def blocks(self):
+        """Execute this `Pipeline`, yielding the output block by block
+
+        Returns
+        -------
+        iterator
+            a generator yielding a new `TimeSeries` for each block of
+            output, in order
+        """
+        position = 0
+        for data in self._run():
+            yield self._wrap(data, self._x0 + position * self._dx)
+            position += data.shape[0]
+
+    def compute(self):
+        """Execute this `Pipeline`, returning the full output
+
+        Returns
+        -------
+        TimeSeries
+            a new `TimeSeries` containing the output of every operation
+        """
+        out = None
+        position = 0
+        for data in self._run():
+            if out is None:
+                out = numpy.empty((self._size,) + data.shape[1:],
+                                  dtype=data.dtype)
+            out[position:position+data.shape[0]] = data
+            position += data.shape[0]
+        if out is None:
+            out = numpy.empty(0, dtype=self.source.dtype)
+        return self._wrap(out[:position], self._x0)
+
+    def _columns(self, stride):
+        """Execute this `Pipeline`, yielding output data in whole multiples
+        of the given number of samples
+
+        Returns
+        -------
+        iterator
+            a generator yielding ``(position, data)`` for each group of
+            complete columns, where ``position`` is the index of the first
+            sample of ``data`` in the full output
+        """
+        position = 0
+        held = None
+        for data in self._run():
+            if held is not None and held.shape[0]:
+                data = numpy.concatenate((held, data))
+            ncol = data.shape[0] // stride
+            if ncol:
+                yield position, data[:ncol*stride]
+                position += ncol * stride
+            held = data[ncol*stride:]
+
+    def psd(self, fftlength=None, fftstride=None, method='welch',
+            window=None):
+        """Calculate the power spectral density of the output of this
+        `Pipeline`
+
+        See :meth:`TimeSeries.psd` for details of the arguments. The
+        periodograms of all FFT segments are accumulated block by block,
+        for mean averages only the running sum is kept.
+
+        Returns
+        -------
+        psd : :class:`~gwpy.spectrum.core.Spectrum`
+            the PSD, as calculated by :meth:`TimeSeries.psd` with the
+            ``numpy`` backend
+        """
+        from ..spectrum.core import Spectrum
+        from ..spectrum.psd import (_parse_method, _get_window_data,
+                                    _segment_view, _periodograms, _average,
+                                    _MAX_BATCH_SIZE)
+        sampling = 1 / self._dx
+        if fftlength is None:
+            fftlength = self._size * self._dx
+        if fftstride is None:
+            fftstride = fftlength
+        segmentlength = int(fftlength * sampling)
+        overlap = int(fftstride * sampling)
+        if window is not None:
+            window = get_window(window, segmentlength)
+        method = _parse_method(method)
+        if method == 'bartlett':
+            overlap = segmentlength
+        window = _get_window_data(window, segmentlength)
+        nfreqs = segmentlength // 2 + 1
+        nblock = max(1, _MAX_BATCH_SIZE // segmentlength)
+        mean = method in ['welch', 'bartlett']
+        total = numpy.zeros(nfreqs)
+        power = []
+        nsegs = 0
+        held = None
+        for data in self._run():
+            if held is not None and held.shape[0]:
+                data = numpy.concatenate((held, data))
+            segments = _segment_view(data, segmentlength, overlap)
+            for i in range(0, segments.shape[0], nblock):
+                block = _periodograms(segments[i:i+nblock], window, sampling)
+                if mean:
+                    total += block.sum(axis=0)
+                else:
+                    power.append(block)
+            nsegs += segments.shape[0]
+            held = data[segments.shape[0]*overlap:]
+        if not nsegs:
+            raise ValueError("Cannot calculate PSD with FFT length longer "
+                             "than the input data")
+        if mean:
+            average = total / nsegs
+        else:
+            average = _average(numpy.concatenate(power), method, axis=0)
+        source = self.source
+        spec = Spectrum(average, name=source.name,
+                        epoch=Time(self._x0, format='gps'),
+                        channel=source.channel, f0=0,
+                        df=sampling / segmentlength)
+        if source.unit:
+            spec.unit = source.unit ** 2 / units.Hertz
+        else:
+            spec.unit = 1 / units.Hertz
+        return spec
+
+    def asd(self, fftlength=None, fftstride=None, method='welch',
+            window=None):
+        """Calculate the amplitude spectral density of the output of this
+        `Pipeline`
+
+        See :meth:`Pipeline.psd` for details.
+        """
+        asd = self.psd(fftlength, fftstride=fftstride, method=method,
+                       window=window)
+        asd **= 1/2.
+        return asd
+
+    def spectrogram(self, stride, fftlength=None, fftstride=None,
+                    method='welch', window=None):
+        """Calculate the average power spectrogram of the output of this
+        `Pipeline`
+
+        See :meth:`TimeSeries.spectrogram` for details of the arguments.
+        Each block of complete columns is processed as it becomes
+        available, and copied into the output.
+
+        Returns
+        -------
+        spectrogram : :class:`~gwpy.spectrogram.core.Spectrogram`
+            time-frequency power spectrogram, identical to that calculated
+            by :meth:`TimeSeries.spectrogram`
+        """
+        from ..spectrum import psd
+        if fftlength is None:
+            fftlength = stride
+        if fftstride is None:
+            fftstride = fftlength
+        sampling = 1 / self._dx
+        stride = int(round(stride * sampling))
+        fftlength = int(round(fftlength * sampling))
+        fftstride = int(round(fftstride * sampling))
+        nsteps = self._size // stride
+        out = None
+        for position, data in self._columns(stride):
+            part = psd.spectrogram(self._wrap(data, self._x0 +
+                                              position * self._dx),
+                                   method, stride, fftlength, fftstride,
+                                   window=window)
+            if out is None:
+                out = numpy.zeros((nsteps,) + part.shape[1:],
+                                  dtype=part.dtype).view(part.__class__)
+                out._metadata = part._metadata.copy()
+                out.epoch = self._x0
+            i = position // stride
+            out.data[i:i+part.shape[0]] = part.data
+        if out is None:
+            out = psd.spectrogram(self._wrap(numpy.zeros(0), self._x0),
+                                  method, stride, fftlength, fftstride,
+                                  window=window)
+        return out
+
+    def __repr__(self):
+        return ('<%s(%s, %d operations, blocksize=%d)>'
+                % (type(self).__name__, self.source.name, len(self._stages),
+                   self.blocksize))
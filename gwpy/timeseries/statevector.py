@@ -42,7 +42,7 @@ from ..segments import *
 from ..version import version as __version__
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 
-__all__ = ['StateTimeSeries', 'StateVector', 'BitMask']
+__all__ = ['StateTimeSeries', 'StateVector', 'BitMask', 'StateVectorDict']
 
 
 class StateTimeSeries(TimeSeries):
@@ -125,32 +125,25 @@ class StateTimeSeries(TimeSeries):
             defines the `valid` segments, while the contiguouse `True`
             sets defined each of the `active` segments
         """
-        active = SegmentList()
         start = self.x0.value
         dt = self.dx.value
-        bitstream = iter(self.data)
-        i = 0
-        while True:
-            try:
-                if bitstream.next():
-                    # found start of True block; find the end
-                    j = i + 1
-                    try:
-                        while bitstream.next():
-                            j += 1
-                    except StopIteration:
-                        pass
-                    finally:  # make sure StopIteration doesn't kill final segment
-                        if j - i >= minlen:
-                           active.append(Segment(start + i * dt,
-                                                 start + j * dt))
-                    i = j  # advance to end of block
-                i += 1
-            except StopIteration:
-                break
+        # find the rising and falling edges of each block of True values
+        padded = numpy.zeros(self.size + 2, dtype=numpy.int8)
+        padded[1:-1] = numpy.asarray(self.data, dtype=bool)
+        edges = numpy.diff(padded)
+        starts = numpy.flatnonzero(edges == 1)
+        ends = numpy.flatnonzero(edges == -1)
+        # remove blocks shorter than the minimum length
+        keep = (ends - starts) >= minlen
+        starts = start + starts[keep] * dt
+        ends = start + ends[keep] * dt
         if dtype is not float:
-            active = active.__class__([Segment(dtype(s[0]), dtype(s[1])) for
-                                       s in active])
+            active = SegmentList([Segment(dtype(s), dtype(e)) for
+                                  s, e in izip(starts, ends)])
+        else:
+            active = SegmentList([Segment(s, e) for
+                                  s, e in izip(starts.tolist(),
+                                               ends.tolist())])
         valid = SegmentList([self.span])
         out = DataQualityFlag(name=name or self.name, active=active,
                               valid=valid, comment=comment or self.name)
@@ -331,7 +324,7 @@ class StateVector(TimeSeries):
         """The list of bit names for this `StateVector`.
         """
         try:
-            return self.metadata['bitmask']
+            return self._metadata['bitmask']
         except:
             self.bitmask = BitMask()
             return self.bitmask
@@ -340,7 +333,7 @@ class StateVector(TimeSeries):
     def bitmask(self, mask):
         if not isinstance(mask, BitMask):
             mask = BitMask(mask, channel=self.channel, epoch=self.epoch)
-        self.metadata['bitmask'] = mask
+        self._mutable_metadata()['bitmask'] = mask
 
     @property
     def boolean(self):
@@ -352,12 +345,11 @@ class StateVector(TimeSeries):
         except AttributeError:
             nbits = len(self.bitmask)
             boolean = numpy.zeros((self.size, nbits), dtype=bool)
-            for i,d in enumerate(self.data):
-                boolean[i,:] = [(False, True)[int(d)>>j & 1] for
-                                j in xrange(nbits)]
+            for j in range(nbits):
+                boolean[:, j] = self._unpack(j)
             self._boolean = ArrayTimeSeries(boolean, name=self.name,
                                             epoch=self.epoch,
-                                            sample_rate=self.sample_rate, 
+                                            sample_rate=self.sample_rate,
                                             y0=0, dy=1)
             return self.boolean
 
@@ -369,17 +361,64 @@ class StateVector(TimeSeries):
         try:
             return self._bits
         except AttributeError:
-            self._bits = [StateTimeSeries(
-                              self.boolean.data[:,i], name=bit,
-                              epoch=self.x0.value, channel=self.channel,
-                              sample_rate=self.sample_rate) for
-                          i,bit in enumerate(self.bitmask)]
+            self._bits = [self.get_bit(i) for i in range(len(self.bitmask))]
             return self.bits
 
     # -------------------------------------------
     # StateVector methods
 
-    def to_dqflags(self, minlen=1, dtype=float, round=False):
+    def _unpack(self, index):
+        """Unpack a single bit of this `StateVector` as a boolean array
+
+        The data are cast to `numpy.uint64` once, with the result cached
+        for subsequent calls.
+        """
+        try:
+            data = self._words
+        except AttributeError:
+            data = self._words = numpy.asarray(self.data).astype(
+                numpy.uint64, copy=False)
+        return (numpy.right_shift(data, numpy.uint64(index)) &
+                numpy.uint64(1)).astype(bool)
+
+    def get_bit(self, bit):
+        """Return the `StateTimeSeries` for a single bit of this
+        `StateVector`.
+
+        Only the requested bit is unpacked from the data, the result is
+        cached for subsequent calls.
+
+        Parameters
+        ----------
+        bit : `int`, `str`
+            index, or name, of the bit in the `StateVector.bitmask`
+
+        Returns
+        -------
+        state : `StateTimeSeries`
+            the boolean state of the requested bit at each time point
+        """
+        if isinstance(bit, (int, numpy.integer)):
+            index = int(bit)
+        else:
+            index = self.bitmask.index(bit)
+        try:
+            cache = self._bitcache
+        except AttributeError:
+            cache = self._bitcache = {}
+        try:
+            return cache[index]
+        except KeyError:
+            try:
+                data = self._boolean.data[:, index]
+            except AttributeError:
+                data = self._unpack(index)
+            cache[index] = StateTimeSeries(
+                data, name=self.bitmask[index], epoch=self.x0.value,
+                channel=self.channel, sample_rate=self.sample_rate)
+            return cache[index]
+
+    def to_dqflags(self, minlen=1, dtype=float, round=False, bits=None):
         """Convert this `StateVector` into a `SegmentListDict`.
 
         The `StateTimeSeries` for each bit is converted into a `SegmentList`
@@ -391,6 +430,10 @@ class StateVector(TimeSeries):
            minimum number of consecutive `True` values to identify as a
            `Segment`. This is useful to ignore single bit flips,
            for example.
+        bits : `list`, optional
+            list of bits (index or name) to convert, default: all bits
+            in the `StateVector.bitmask`, only the requested bits are
+            unpacked from the data
 
         Returns
         -------
@@ -404,10 +447,15 @@ class StateVector(TimeSeries):
             for details on the segment representation method for
             `StateVector` bits
         """
-        return [self.bits[i].to_dqflag(
-                    name=bit, minlen=minlen, round=round, dtype=dtype, 
-                    comment=self.bitmask.description[bit])
-                for i,bit in enumerate(self.bitmask)]
+        if bits is None:
+            bits = range(len(self.bitmask))
+        out = []
+        for bit in bits:
+            state = self.get_bit(bit)
+            out.append(state.to_dqflag(
+                name=state.name, minlen=minlen, round=round, dtype=dtype,
+                comment=self.bitmask.description.get(state.name)))
+        return out
 
     @classmethod
     def read(cls, source, channel, bitmask=[], start=None, end=None,
@@ -448,7 +496,7 @@ class StateVector(TimeSeries):
 
     @classmethod
     def fetch(cls, channel, start, end, bitmask=[], host=None,
-              port=None, verbose=False):
+              port=None, verbose=False, chunksize=None):
         """Fetch data from NDS into a `StateVector`.
 
         Parameters
@@ -467,6 +515,9 @@ class StateVector(TimeSeries):
             port number for NDS server query, must be given with `host`
         verbose : `bool`, optional
             print verbose output about NDS progress
+        chunksize : `int`, optional
+            number of seconds of data in a single request, by default
+            the full span is requested at once
 
         Returns
         -------
@@ -475,7 +526,8 @@ class StateVector(TimeSeries):
         """
         new = super(StateVector, cls).fetch(channel, start, end,
                                             host=host, port=port,
-                                            verbose=verbose)
+                                            verbose=verbose,
+                                            chunksize=chunksize)
         new.bitmask = bitmask
         return new
 
@@ -486,3 +538,92 @@ class StateVector(TimeSeries):
                                   "TimeSeries, cannot be used with the "
                                   "StateTimeSeries because LAL has no "
                                   "BooleanTimeSeries structure")
+
+
+class StateVectorDict(TimeSeriesDict):
+    """Ordered key-value mapping of named `StateVector` containing data
+    for many channels over the same time interval.
+
+    See Also
+    --------
+    :class:`~gwpy.timeseries.core.TimeSeriesDict`
+        for details of the multi-channel `read` and `fetch` methods
+    """
+    EntryClass = StateVector
+
+    @classmethod
+    def read(cls, source, channels, bitmasks={}, start=None, end=None,
+             datatype=numpy.uint64, verbose=False):
+        """Read data for multiple channels into a `StateVectorDict` from
+        files on disk.
+
+        Parameters
+        ----------
+        source : `str`, :class:`glue.lal.Cache`, :lalsuite:`LALCache`
+            source for data, see :meth:`TimeSeriesDict.read`
+        channels : `list`
+            list of channels (names or objects) to read
+        bitmasks : `dict`, optional
+            (channel, `BitMask`) `dict` of bit definitions for each
+            channel
+        start : :class:`~gwpy.time.Time`, `float`, optional
+            start GPS time of desired data
+        end : :class:`~gwpy.time.Time`, `float`, optional
+            end GPS time of desired data
+        datatype : `type`, `numpy.dtype`, `str`, optional
+            identifier for desired output data type, default: `uint64`
+        verbose : `bool`, optional
+            print verbose output
+
+        Returns
+        -------
+        StateVectorDict
+            a new `StateVectorDict` containing data for each channel
+        """
+        new = super(StateVectorDict, cls).read(source, channels, start=start,
+                                               end=end, datatype=datatype,
+                                               verbose=verbose)
+        for channel, state in new.iteritems():
+            state.bitmask = bitmasks.get(channel, [])
+        return new
+
+    @classmethod
+    def fetch(cls, channels, start, end, bitmasks={}, host=None, port=None,
+              verbose=False, connection=None, ndschanneltype=None):
+        """Fetch data for multiple channels from NDS into a
+        `StateVectorDict`.
+
+        Parameters
+        ----------
+        channels : `list`
+            list of channels (names or objects) to fetch
+        start : `~gwpy.time.Time`, or float
+            GPS start time of data span
+        end : `~gwpy.time.Time`, or float
+            GPS end time of data span
+        bitmasks : `dict`, optional
+            (channel, `BitMask`) `dict` of bit definitions for each
+            channel
+        host : `str`, optional
+            URL of NDS server to use, defaults to observatory site host
+        port : `int`, optional
+            port number for NDS server query, must be given with `host`
+        verbose : `bool`, optional
+            print verbose output about NDS progress
+        connection : :class:`~gwpy.io.nds.NDS2Connection`
+            open NDS connection to use
+        ndschanneltype : `int`
+            NDS2 channel type integer
+
+        Returns
+        -------
+        StateVectorDict
+            a new `StateVectorDict` containing data for each channel
+        """
+        new = super(StateVectorDict, cls).fetch(
+                  channels, start, end, host=host, port=port,
+                  verbose=verbose, connection=connection,
+                  ndschanneltype=ndschanneltype)
+        for channel, state in new.iteritems():
+            state.bitmask = bitmasks.get(channel, [])
+        return new
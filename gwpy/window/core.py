@@ -18,6 +18,8 @@
 """Core library for Window class
 """
 
+import zlib
+
 import numpy
 
 from scipy import signal
@@ -93,13 +95,13 @@ class Window(Series):
 
     def __getattr__(self, attr):
         if attr in self._metadata_slots:
-            return self.metadata[attr]
+            return self._metadata[attr]
         else:
             return self.__getattribute__(attr)
 
     def __setattr__(self, attr, value):
         if attr in self._metadata_slots:
-            self.metadata[attr] = value
+            self._mutable_metadata()[attr] = value
         else:
             super(Window, self).__setattr__(attr, value)
 
@@ -117,19 +119,49 @@ class Window(Series):
         """Convert an XLAL Window into GWpy `Window` format
         """
 
-    def to_lal(self, dtype='real8'):
+    def to_lal(self, dtype='real8', copy=False):
         """Convert this `Window` into an XLAL format
+
+        Parameters
+        ----------
+        dtype : `str`, optional, default: ``'real8'``
+            LAL type of the output window, one of ``'real4'`` or
+            ``'real8'``
+        copy : `bool`, optional, default: `False`
+            always create a new XLAL Window, otherwise the XLAL Window
+            created by the last call to this method with the same
+            ``dtype`` is returned, as long as the data of this `Window`
+            have not changed since
+
+        Returns
+        -------
+        window : :lalsuite:`XLALREAL8Window`
+            a LAL window with the same data as this `Window`
         """
         from lal import lal
-        if dtype.lower() == 'real4':
+        try:
+            cache = self.__dict__['_lal']
+        except KeyError:
+            cache = self.__dict__['_lal'] = {}
+        key = dtype.lower()
+        # the cached window is only valid for the same data, which may
+        # have been modified in place, so check the buffer and contents
+        data = numpy.ascontiguousarray(self.data)
+        state = (data.__array_interface__['data'][0], data.shape,
+                 zlib.crc32(data))
+        if not copy and key in cache and cache[key][0] == state:
+            return cache[key][1]
+        # data are copied only once, into the LAL sequence
+        if key == 'real4':
             seq = lal.CreateREAL4Sequence(int(self.size))
-            seq.data = numpy.array(self, dtype=seq.data.dtype, copy=True)
-            return lal.CreateREAL4WindowFromSequence(seq)
+            seq.data = self.data
+            lalwindow = lal.CreateREAL4WindowFromSequence(seq)
         else:
             seq = lal.CreateREAL8Sequence(int(self.size))
-            seq.data = numpy.array(self, dtype=seq.data.dtype, copy=True)
+            seq.data = self.data
             lalwindow = lal.CreateREAL8WindowFromSequence(seq)
-            return lalwindow
+        cache[key] = (state, lalwindow)
+        return lalwindow
 
 
 class SimpleWindow(Window):
@@ -0,0 +1,73 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Regression tests for the copy-on-write `Array` metadata
+"""
+
+import unittest
+
+import numpy
+from astropy.units import Quantity
+
+from gwpy.timeseries import TimeSeries
+
+
+class ArrayMetadataTestCase(unittest.TestCase):
+    """Test the sharing of metadata between an `Array` and its views
+    """
+    def create(self):
+        return TimeSeries(numpy.arange(10.), epoch=0, sample_rate=1,
+                          name='X')
+
+    def test_view_shares_until_modified(self):
+        ts = self.create()
+        view = ts[2:]
+        view.name = 'Y'
+        self.assertEqual(ts.name, 'X')
+        self.assertEqual(view.name, 'Y')
+        self.assertEqual(view.x0, Quantity(2, 's'))
+        self.assertEqual(ts.x0, Quantity(0, 's'))
+
+    def test_new_array_shares_record(self):
+        ts = self.create()
+        self.assertFalse(ts._metadata._exposed)
+        # views and ufunc results share the record until modified, a
+        # slice with a new start time takes its own
+        self.assertIs(ts[:5]._metadata, ts._metadata)
+        self.assertIs((ts + 1)._metadata, ts._metadata)
+        self.assertIs(ts.view(TimeSeries)._metadata, ts._metadata)
+        self.assertIsNot(ts[2:]._metadata, ts._metadata)
+
+    def test_exposed_record_not_shared(self):
+        ts = self.create()
+        meta = ts.metadata
+        result = ts + 1
+        view = ts.view(TimeSeries)
+        meta['name'] = 'Z'
+        self.assertEqual(ts.name, 'Z')
+        self.assertEqual(result.name, 'X')
+        self.assertEqual(view.name, 'X')
+
+    def test_quantity_axis_converted(self):
+        ts = self.create()
+        ts.metadata['dx'] = Quantity(10, 'ms')
+        self.assertEqual(ts.dx, Quantity(10, 'ms'))
+        self.assertEqual(ts.dx.unit, ts.xunit)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Regression tests for chunked HDF5 input/output
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+from numpy.testing import assert_array_equal
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+from gwpy.timeseries import TimeSeries
+from gwpy.spectrogram import Spectrogram
+
+
+@unittest.skipIf(h5py is None, "h5py is not available")
+class HDF5TestCase(unittest.TestCase):
+    """Test writing, appending, and partially reading HDF5 datasets
+    """
+    def setUp(self):
+        from gwpy.io.hdf5 import (timeseries, spectrogram)
+        self.io = timeseries
+        self.spectrogram_io = spectrogram
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'test.hdf5')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_write_does_not_hand_out_metadata(self):
+        ts = TimeSeries(numpy.arange(16.), epoch=0, sample_rate=4, name='X')
+        view = ts[4:]
+        meta = view._metadata
+        self.io.write_timeseries(view, self.path)
+        self.assertIs(view._metadata, meta)
+        self.assertFalse(meta._exposed)
+
+    def test_read_does_not_hand_out_metadata(self):
+        ts = TimeSeries(numpy.arange(16.), epoch=0, sample_rate=4, name='X')
+        self.io.write_timeseries(ts, self.path)
+        new = self.io.read_timeseries(self.path)
+        self.assertFalse(new._metadata._exposed)
+        self.assertIs(new[:4]._metadata, new._metadata)
+
+    def test_read_rejects_frame_options(self):
+        ts = TimeSeries(numpy.arange(16.), epoch=0, sample_rate=4, name='X')
+        self.io.write_timeseries(ts, self.path)
+        self.assertRaises(ValueError, TimeSeries.read, self.path, 'X',
+                          nproc=2)
+        self.assertRaises(ValueError, TimeSeries.read, self.path, 'X',
+                          pad=0.)
+
+    def test_timeseries_append_and_crop(self):
+        data = numpy.arange(32.)
+        first = TimeSeries(data[:16], epoch=0, sample_rate=4, name='X',
+                           unit='m')
+        second = TimeSeries(data[16:], epoch=4, sample_rate=4, name='X',
+                            unit='m')
+        self.io.write_timeseries(first, self.path)
+        self.io.write_timeseries(second, self.path, append=True)
+        full = self.io.read_timeseries(self.path)
+        assert_array_equal(full.data, data)
+        self.assertEqual(full.name, 'X')
+        self.assertEqual(full.unit, first.unit)
+        self.assertEqual(full.x0.value, 0)
+        self.assertEqual(full.dx.value, 0.25)
+        part = self.io.read_timeseries(self.path, start=2, end=5)
+        assert_array_equal(part.data, data[8:20])
+        self.assertEqual(part.x0.value, 2)
+        # data that are not contiguous cannot be appended
+        gap = TimeSeries(data[:4], epoch=10, sample_rate=4, name='X')
+        self.assertRaises(ValueError, self.io.write_timeseries, gap,
+                          self.path, append=True)
+
+    def test_spectrogram_partial_read(self):
+        data = numpy.arange(80.).reshape((10, 8))
+        specgram = Spectrogram(data, epoch=100, dt=2, f0=0, df=0.5,
+                               name='X')
+        self.spectrogram_io.write_spectrogram(specgram, self.path)
+        part = self.spectrogram_io.read_spectrogram(
+            self.path, start=104, end=110, fmin=1, fmax=3)
+        assert_array_equal(part.data, data[2:5, 2:6])
+        self.assertEqual(part.x0.value, 104)
+        self.assertEqual(part.y0.value, 1)
+        self.assertEqual(part.dy.value, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
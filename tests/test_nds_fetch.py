@@ -0,0 +1,186 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Regression tests for fetching data from NDS over pooled connections
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+# stand-in for the nds2 client, used if the real client is not available
+try:
+    import nds2
+except ImportError:
+    nds2 = types.ModuleType('nds2')
+
+    class channel(object):
+        (CHANNEL_TYPE_RAW, CHANNEL_TYPE_ONLINE, CHANNEL_TYPE_RDS,
+         CHANNEL_TYPE_STREND, CHANNEL_TYPE_MTREND, CHANNEL_TYPE_STATIC,
+         CHANNEL_TYPE_TEST_POINT) = [2 ** i for i in range(7)]
+
+    nds2.channel = channel
+    nds2.channel_channel_type_to_string = str
+    nds2.connection = None
+    sys.modules['nds2'] = nds2
+
+from gwpy.io import nds as ndsio
+from gwpy.timeseries import core
+
+HOST = 'nds.example.com'
+PORT = 31200
+
+
+class FailingConnection(object):
+    """Stand-in `nds2.connection` whose data requests always fail
+    """
+    opened = []
+
+    def __init__(self, host, port):
+        self.closed = False
+        self.opened.append(self)
+
+    def get_protocol(self):
+        return 2
+
+    def find_channels(self, name, ctype=None):
+        return [name]
+
+    def fetch(self, start, end, channels):
+        raise RuntimeError("Connection reset by peer")
+
+    def close(self):
+        self.closed = True
+
+
+class PooledFetchTestCase(unittest.TestCase):
+    """Test the handling of pooled connections by NDS fetches
+    """
+    def setUp(self):
+        self._connection = nds2.connection
+        nds2.connection = FailingConnection
+        FailingConnection.opened = []
+        ndsio.CONNECTION_POOL.clear()
+
+    def tearDown(self):
+        nds2.connection = self._connection
+        ndsio.CONNECTION_POOL.clear()
+
+    def test_failed_fetch_discards_connection(self):
+        for i in range(2):
+            self.assertRaises(RuntimeError, core._fetch_nds,
+                              ['X1:TEST-CHANNEL'], 0, 10, host=HOST,
+                              port=PORT)
+        first, second = FailingConnection.opened
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        self.assertTrue(second.closed)
+
+
+class DroppedConnection(FailingConnection):
+    """Stand-in `nds2.connection` dropped by the server once idle
+    """
+    def find_channels(self, name, ctype=None):
+        raise RuntimeError("Connection reset by peer")
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    """Test the reuse of connections by an `NDSConnectionPool`
+    """
+    def setUp(self):
+        self._connection = nds2.connection
+        nds2.connection = DroppedConnection
+        DroppedConnection.opened = []
+
+    def tearDown(self):
+        nds2.connection = self._connection
+
+    def test_dropped_connection_not_reused(self):
+        pool = ndsio.NDSConnectionPool()
+        first = pool.acquire(HOST, PORT)
+        pool.release(HOST, PORT, first)
+        second = pool.acquire(HOST, PORT)
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        pool.release(HOST, PORT, second, discard=True)
+
+    def test_channels_bounded(self):
+        pool = ndsio.NDSConnectionPool(maxchannels=2)
+        for name in ('A', 'B', 'C'):
+            pool.channels[(HOST, PORT, name, None)] = name
+        self.assertEqual([key[2] for key in pool.channels], ['B', 'C'])
+
+
+class ListedChannel(object):
+    """Stand-in `nds2.channel`
+    """
+    channel_type = 1
+    sample_rate = 256.
+    signal_units = 'm'
+
+    def __init__(self, name):
+        self.name = name
+
+
+class ListingConnection(object):
+    """Stand-in `nds2.connection` listing a configurable set of channels
+    """
+    def __init__(self, names):
+        self.names = names
+
+    def find_channels(self, pattern):
+        return list(map(ListedChannel, self.names))
+
+
+class CatalogueTestCase(unittest.TestCase):
+    """Test channel resolution against a local `ChannelCatalogue`
+    """
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.catalogue = ndsio.ChannelCatalogue(
+            os.path.join(self.tmpdir, 'channels.sqlite'), ttl=-1)
+        ndsio.CONNECTION_POOL.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        ndsio.CONNECTION_POOL.clear()
+
+    def test_channel(self):
+        self.catalogue.update(HOST, PORT, ListingConnection(['X1:TEST']))
+        channel = self.catalogue.channel('X1:TEST')
+        self.assertEqual(channel.sample_rate.value, 256.)
+        self.assertIsNone(self.catalogue.channel('X1:MISSING'))
+
+    def test_resolve_follows_refresh(self):
+        # resolutions must not outlive the catalogue entries they used
+        conn = ListingConnection(['X1:TEST'])
+        found = core._resolve_channels(conn, ['X1:TEST'], [None],
+                                       host=HOST, port=PORT,
+                                       catalogue=self.catalogue)
+        self.assertEqual(found, ['X1:TEST'])
+        conn.names = []
+        found = core._resolve_channels(conn, ['X1:TEST'], [None],
+                                       host=HOST, port=PORT,
+                                       catalogue=self.catalogue)
+        self.assertEqual(found, [None])
+
+
+if __name__ == '__main__':
+    unittest.main()
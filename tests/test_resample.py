@@ -0,0 +1,40 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Regression tests for the polyphase rational resampler
+"""
+
+import unittest
+
+from gwpy.data.resample import rational_ratio
+
+
+class RationalRatioTestCase(unittest.TestCase):
+    """Test the conversion of sample rates into a rational ratio
+    """
+    def test_exact(self):
+        self.assertEqual(rational_ratio(256, 1024), (1, 4))
+        self.assertEqual(rational_ratio(0.25, 16), (1, 64))
+        self.assertEqual(rational_ratio(1/3., 1), (1, 3))
+
+    def test_inexact(self):
+        # the closest fraction would resample to a different rate
+        self.assertRaises(ValueError, rational_ratio, 1000.5, 1024.3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# Copyright (C) Duncan Macleod (2013)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Regression tests for lazy, block-wise `TimeSeries` pipelines
+"""
+
+import unittest
+
+import numpy
+from numpy.testing import assert_allclose
+
+from gwpy.timeseries import TimeSeries
+
+# block sizes that do not divide the data, or the FFT segments, evenly
+BLOCK_SIZES = [1000, 3333, 4097]
+
+
+class PipelineTestCase(unittest.TestCase):
+    """Test that a `Pipeline` matches the eager `TimeSeries` methods
+    """
+    def create(self):
+        data = numpy.random.RandomState(0).randn(16 * 1024)
+        return TimeSeries(data, epoch=0, sample_rate=1024, name='X')
+
+    def test_compute(self):
+        ts = self.create()
+        eager = ts.highpass(10).resample(256)
+        for blocksize in BLOCK_SIZES:
+            lazy = ts.lazy(blocksize=blocksize).highpass(10).resample(256)
+            out = lazy.compute()
+            assert_allclose(out.data, eager.data, atol=1e-12)
+            self.assertEqual(out.x0, eager.x0)
+            self.assertEqual(out.dx, eager.dx)
+
+    def test_psd(self):
+        ts = self.create()
+        eager = ts.highpass(10).psd(2, 1, backend='numpy')
+        for blocksize in BLOCK_SIZES:
+            lazy = ts.lazy(blocksize=blocksize).highpass(10).psd(2, 1)
+            assert_allclose(lazy.data, eager.data, rtol=1e-10)
+            self.assertEqual(lazy.df, eager.df)
+
+    def test_spectrogram(self):
+        ts = self.create()
+        eager = ts.highpass(10).spectrogram(4, fftlength=2)
+        for blocksize in BLOCK_SIZES:
+            lazy = (ts.lazy(blocksize=blocksize).highpass(10)
+                      .spectrogram(4, fftlength=2))
+            assert_allclose(lazy.data, eager.data, rtol=1e-10)
+            self.assertEqual(lazy.epoch, eager.epoch)
+
+    def test_crop(self):
+        ts = self.create()
+        after = ts.highpass(10).crop(2, 5)
+        before = ts.crop(2, 5).highpass(10)
+        for blocksize in BLOCK_SIZES:
+            lazy = ts.lazy(blocksize=blocksize)
+            out = lazy.highpass(10).crop(2, 5).compute()
+            assert_allclose(out.data, after.data, atol=1e-12)
+            self.assertEqual(out.x0, after.x0)
+            out = lazy.crop(2, 5).highpass(10).compute()
+            assert_allclose(out.data, before.data, atol=1e-12)
+            self.assertEqual(out.x0, before.x0)
+
+    def test_shared_stages(self):
+        # pipelines derived from one another, executed at the same time,
+        # must not share filter or resampler state
+        ts = self.create()
+        highpass = ts.lazy(blocksize=1000).highpass(10)
+        resampled = highpass.resample(256)
+        first, second = [], []
+        for a, b in zip(highpass.blocks(), resampled.blocks()):
+            first.append(a.data)
+            second.append(b.data)
+        for a, b in zip(highpass.blocks(), highpass.blocks()):
+            assert_allclose(a.data, b.data)
+        eager = ts.highpass(10)
+        n = sum(map(len, first))
+        assert_allclose(numpy.concatenate(first), eager.data[:n],
+                        atol=1e-12)
+        n = sum(map(len, second))
+        assert_allclose(numpy.concatenate(second),
+                        eager.resample(256).data[:n], atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()